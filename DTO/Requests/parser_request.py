@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import List, Optional
+
+from pydantic import BaseModel, model_validator
 
 
 class ParserRequest(BaseModel):
@@ -9,6 +11,48 @@ class ParserRequest(BaseModel):
 
 class ParseProjectRequest(BaseModel):
 	"""Request model for parsing an entire project"""
+	project_path: Optional[str] = None  # folder, .zip or prebuilt .analysis.jsonl artifact
+	project_id: Optional[str] = None  # folder_id of an uploaded project, instead of project_path
+	# When set, files are ranked by relevance to the transcript and cut to the token budget
+	transcript: Optional[str] = None
+	token_budget: Optional[int] = None
+	# Without the summary only stats and a preview page come back; generation can then refer to project_id
+	include_summary: bool = True
+	page: int = 1
+	page_size: int = 0  # files per preview page, 0 for no preview
+
+	@model_validator(mode="after")
+	def check_project(self):
+		if self.project_path is None and self.project_id is None:
+			raise ValueError("project_path or project_id is required")
+		return self
+
+
+class SymbolSearchRequest(BaseModel):
+	"""Request model for searching symbols in a parsed project"""
 	project_path: str
+	query: str
+	field: Optional[str] = None  # class, extends, method, property, type or path
+	mode: str = "prefix"  # exact, prefix or fuzzy
+	limit: int = 50
+
+
+class DependencyRequest(BaseModel):
+	"""Request model for the dependency neighborhood of files and symbols"""
+	project_path: Optional[str] = None
+	project_id: Optional[str] = None
+	# Seeds: the files and classes the transcript mentions, plus the files and symbols listed
+	transcript: Optional[str] = None
+	files: List[str] = []
+	symbols: List[str] = []
+	hops: Optional[int] = None
+	direction: str = "both"  # out (dependencies), in (dependents, i.e. impact) or both
+	limit: int = 200
+
+	@model_validator(mode="after")
+	def check_project(self):
+		if self.project_path is None and self.project_id is None:
+			raise ValueError("project_path or project_id is required")
+		return self
 
 
@@ -1,5 +1,19 @@
-from pydantic import BaseModel
+from typing import Optional
+
+from pydantic import BaseModel, model_validator
 
 class TodoListRequest(BaseModel):
-	parsed_project: str
+	# Either the project summary itself, or the id (folder_id) of a project parsed on the server
+	parsed_project: Optional[str] = None
+	project_id: Optional[str] = None
 	transcript: str
+	# Skip the response cache lookup (the fresh result is still cached)
+	bypass_cache: bool = False
+	# Split long transcripts and extract tasks per chunk in parallel; None decides from the transcript length
+	map_reduce: Optional[bool] = None
+
+	@model_validator(mode="after")
+	def check_project(self):
+		if self.parsed_project is None and self.project_id is None:
+			raise ValueError("parsed_project or project_id is required")
+		return self
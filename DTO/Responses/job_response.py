@@ -0,0 +1,16 @@
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+
+class JobResponse(BaseModel):
+	"""Status of a background job"""
+	id: str
+	kind: str
+	status: str
+	progress: float
+	message: Optional[str] = None
+	partial: Optional[Any] = None
+	error: Optional[str] = None
+	created_at: float
+	finished_at: Optional[float] = None
@@ -2,8 +2,10 @@ import json
 
 
 class OpenAiResponse:
-	def __init__(self, response):
-		_response_json = json.loads(response.choices[0].message.content)
+	def __init__(self, response=None, content: str = None):
+		# content is the raw JSON message, e.g. from the response cache
+		self.content = content if content is not None else response.choices[0].message.content
+		_response_json = json.loads(self.content)
 		self.context = _response_json["contexte"]
 		self.technical_todo = _response_json["technical_todolist"]
 		self.clarifications = _response_json["clarifications_requises"]
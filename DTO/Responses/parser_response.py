@@ -1,37 +1,20 @@
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel
+from pydantic import AliasChoices, BaseModel, Field
 
 
 class MethodInfo(BaseModel):
 	"""Information about a class method"""
 	name: Optional[str]
-	return_type: Optional[str] = None
-	
-	class Config:
-		populate_by_name = True
-		
-	def __init__(self, **data):
-		# Handle 'return' field mapping to 'return_type'
-		if 'return' in data:
-			data['return_type'] = data.pop('return')
-		super().__init__(**data)
+	# Extracted symbols call it 'return'; the alias only applies to input, responses keep 'return_type'
+	return_type: Optional[str] = Field(default=None, validation_alias=AliasChoices("return_type", "return"))
 
 
 class ClassInfo(BaseModel):
 	"""Information about a class"""
-	class_name: Optional[str] = None
+	class_name: Optional[str] = Field(default=None, validation_alias=AliasChoices("class_name", "class"))
 	extends: Optional[str] = None
 	properties: List[str] = []
 	methods: List[MethodInfo] = []
-	
-	class Config:
-		populate_by_name = True
-		
-	def __init__(self, **data):
-		# Handle 'class' field mapping to 'class_name'
-		if 'class' in data:
-			data['class_name'] = data.pop('class')
-		super().__init__(**data)
 
 
 class ParserResponse(BaseModel):
@@ -40,8 +23,41 @@ class ParserResponse(BaseModel):
 	classes: List[ClassInfo]
 
 
+class SymbolMatch(BaseModel):
+	"""A symbol found by a search"""
+	field: str
+	name: str
+	file: str
+	class_name: Optional[str] = None
+	kind: str
+
+
+class SymbolSearchResponse(BaseModel):
+	"""Response model for symbol search"""
+	results: List[SymbolMatch]
+
+
 class ParsedProjectResponse(BaseModel):
 	"""Response model for parsed project"""
-	parsed_project: str
+	parsed_project: Optional[str] = None
+	scan_stats: Optional[Dict[str, Any]] = None
+	project_id: Optional[str] = None
+	file_count: int = 0
+	files_with_symbols: int = 0
+	# Formatted sections of the requested page of files, in summary order
+	preview: List[str] = []
+	page: int = 1
+	pages: int = 0
+
+
+class DependencyNode(BaseModel):
+	"""A file of a dependency neighborhood and its distance in hops from the seeds"""
+	file: str
+	distance: int
 
 
+class DependencyResponse(BaseModel):
+	"""Response model for a dependency neighborhood"""
+	seeds: List[str]
+	nodes: List[DependencyNode]
+	edges: List[List[str]]  # [from, to]: from uses to
@@ -0,0 +1,165 @@
+import argparse
+import gc
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.synthetic_project import generate_project
+from services.parser_service import ParserService, EXCLUDED, file_language
+from utils.project_scanner import ProjectScanner
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+# A phase slower than the baseline by more than this fraction is reported as a regression
+REGRESSION_THRESHOLD = 0.10
+
+
+def peak_rss_mb() -> float:
+	# ru_maxrss is in KiB on Linux and bytes on macOS
+	rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def current_rss_mb():
+	"""Resident set size right now (Linux only), to see what a parsed project keeps once parsing is over"""
+	try:
+		with open("/proc/self/statm") as f:
+			pages = int(f.read().split()[1])
+	except (OSError, IndexError, ValueError):
+		return None
+	return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def run_once(root: str, workers: int, lean: bool) -> dict:
+	"""Time scanning, parsing, extraction and formatting of the project separately"""
+	timings = {}
+
+	started = time.perf_counter()
+	files = list(ProjectScanner(EXCLUDED, file_language).scan(root))
+	timings["scan"] = time.perf_counter() - started
+
+	gc.collect()
+	rss_before = current_rss_mb()
+	service = ParserService(workers=workers, lean=lean)
+	started = time.perf_counter()
+	service.set_ast(root, files=files)
+	timings["parse"] = time.perf_counter() - started
+	gc.collect()
+	rss_after = current_rss_mb()
+	retained = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+
+	# With workers, symbols were extracted during parsing and this only collects them
+	started = time.perf_counter()
+	symbols = service.extract_all_symbol_dicts()
+	timings["extract"] = time.perf_counter() - started
+
+	started = time.perf_counter()
+	summary = service.format_symbols(symbols)
+	timings["format"] = time.perf_counter() - started
+
+	timings["total"] = sum(timings.values())
+	return {"timings": timings, "files": len(files), "summary_chars": len(summary), "retained_mb": retained}
+
+
+def run(config: dict, repeat: int, workers: int, lean: bool = False) -> dict:
+	with tempfile.TemporaryDirectory() as root:
+		written = generate_project(root, **config)
+		runs = [run_once(root, workers, lean) for _ in range(repeat)]
+
+	# Best of the runs: the least disturbed by the rest of the machine
+	timings = {phase: min(r["timings"][phase] for r in runs) for phase in runs[0]["timings"]}
+	megabytes = written["bytes"] / (1024 * 1024)
+	return {
+		"config": config,
+		"workers": workers,
+		"lean": lean,
+		"files": runs[0]["files"],
+		"megabytes": round(megabytes, 3),
+		"timings": {phase: round(seconds, 4) for phase, seconds in timings.items()},
+		"files_per_second": round(runs[0]["files"] / timings["total"], 1),
+		"megabytes_per_second": round(megabytes / timings["total"], 3),
+		"peak_rss_mb": round(peak_rss_mb(), 1),
+		# Memory the parsed project still holds after parsing (first run, before later runs reuse freed pages)
+		"steady_rss_mb": round(runs[0]["retained_mb"], 1) if runs[0]["retained_mb"] is not None else None,
+	}
+
+
+def compare(result: dict, baseline: dict, threshold: float) -> list:
+	"""Print the delta of each phase against the baseline and return the phases that regressed"""
+	if any(baseline.get(key) != result[key] for key in ("config", "workers", "lean")):
+		print("Baseline was recorded with other settings, deltas are not comparable")
+	regressions = []
+	print(f"{'phase':<10}{'baseline (s)':>14}{'current (s)':>14}{'delta':>10}")
+	for phase, seconds in result["timings"].items():
+		before = baseline["timings"].get(phase)
+		if not before:
+			continue
+		delta = (seconds - before) / before
+		flag = ""
+		if delta > threshold:
+			regressions.append(phase)
+			flag = "  <- regression"
+		print(f"{phase:<10}{before:>14.4f}{seconds:>14.4f}{delta:>+10.1%}{flag}")
+	for key in ("files_per_second", "megabytes_per_second", "peak_rss_mb", "steady_rss_mb"):
+		print(f"{key}: {baseline.get(key)} -> {result[key]}")
+	return regressions
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Benchmark ParserService on a generated Laravel/React-style project")
+	parser.add_argument("--files", type=int, default=500, help="Parsable files to generate")
+	parser.add_argument("--methods", type=int, default=6, help="Methods per class (file size)")
+	parser.add_argument("--body-lines", type=int, default=4, help="Lines per method body (file size)")
+	parser.add_argument("--depth", type=int, default=3, help="Maximum module nesting")
+	parser.add_argument("--excluded-files", type=int, default=200, help="Files generated in excluded folders")
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--workers", type=int, default=1, help="ParserService workers (default: 1, so phases stay separate)")
+	parser.add_argument("--lean", action="store_true", help="Benchmark ParserService in lean mode (no trees or sources kept)")
+	parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark, the best one is kept")
+	parser.add_argument("--baseline", type=str, default=str(BASELINE_PATH), help="Baseline JSON to compare against")
+	parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+	parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="Allowed slowdown per phase (default: 0.10)")
+	parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 when a phase regressed")
+	parser.add_argument("-o", "--output", type=str, help="Also write the result as JSON to this path")
+	args = parser.parse_args()
+
+	config = {
+		"files": args.files,
+		"methods": args.methods,
+		"body_lines": args.body_lines,
+		"depth": args.depth,
+		"excluded_files": args.excluded_files,
+		"seed": args.seed,
+	}
+	result = run(config, max(1, args.repeat), args.workers, args.lean)
+	print(json.dumps(result, indent=2))
+
+	if args.output:
+		with open(args.output, "w") as f:
+			json.dump(result, f, indent=2)
+
+	if args.save_baseline:
+		with open(args.baseline, "w") as f:
+			json.dump(result, f, indent=2)
+			f.write("\n")
+		print(f"Baseline saved to {args.baseline}")
+		return
+
+	if os.path.exists(args.baseline):
+		with open(args.baseline) as f:
+			regressions = compare(result, json.load(f), args.threshold)
+		if regressions and args.fail_on_regression:
+			sys.exit(1)
+	else:
+		print(f"No baseline at {args.baseline}; record one with --save-baseline")
+
+
+if __name__ == "__main__":
+	main()
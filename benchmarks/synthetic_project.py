@@ -0,0 +1,125 @@
+import os
+import random
+from typing import Dict
+
+# Directories the parser skips; the generator fills them to exercise pruning
+EXCLUDED_BULK_DIRS = ("vendor/laravel/framework/src", "node_modules/react/cjs", "storage/framework/views", "public/build/assets")
+
+_DOMAINS = ("Invoice", "Customer", "Order", "Payment", "Product", "Shipment", "User", "Report", "Subscription", "Coupon")
+_VERBS = ("get", "set", "find", "create", "update", "delete", "sync", "export", "validate", "notify")
+_PHP_TYPES = ("int", "string", "bool", "array", "?User", "Collection", "void")
+_TS_TYPES = ("number", "string", "boolean", "User[]", "Promise<void>", "Record<string, number>")
+
+
+def _php_class(rng: random.Random, namespace: str, name: str, methods: int, body_lines: int) -> str:
+	lines = [
+		"<?php",
+		f"namespace {namespace};",
+		"",
+		"use Illuminate\\Support\\Collection;",
+		"use App\\Models\\User;",
+		"",
+		f"class {name} extends {rng.choice(('Controller', 'Model', 'BaseService'))}",
+		"{",
+	]
+	for p in range(rng.randint(1, 4)):
+		lines.append(f"\tprotected {rng.choice(_PHP_TYPES[:-1])} ${rng.choice(_VERBS)}{p};")
+	for m in range(methods):
+		method = f"{rng.choice(_VERBS)}{rng.choice(_DOMAINS)}{m}"
+		lines.append(f"\tpublic function {method}(int $id, string $label = 'é'): {rng.choice(_PHP_TYPES)}")
+		lines.append("\t{")
+		for b in range(body_lines):
+			lines.append(f"\t\t$value{b} = $this->{rng.choice(_VERBS)}0 + {rng.randint(0, 999)} * strlen($label);")
+		lines.append("\t}")
+	lines.append("}")
+	return "\n".join(lines) + "\n"
+
+
+def _tsx_component(rng: random.Random, name: str, methods: int, body_lines: int) -> str:
+	lines = [
+		"import React from 'react';",
+		"",
+		f"export interface {name}Props {{",
+		f"\tid: {rng.choice(_TS_TYPES)};",
+		"\tlabel?: string;",
+		f"\tonChange(value: number): {rng.choice(_TS_TYPES)};",
+		"}",
+		"",
+		f"export class {name} extends React.Component<{name}Props> {{",
+		f"\tcount: number = {rng.randint(0, 9)};",
+	]
+	for m in range(methods):
+		lines.append(f"\t{rng.choice(_VERBS)}{m}(value: number): {rng.choice(_TS_TYPES)} {{")
+		for b in range(body_lines):
+			lines.append(f"\t\tconst v{b} = value * {rng.randint(1, 99)} + this.count;")
+		lines.append("\t\treturn undefined as any;")
+		lines.append("\t}")
+	lines.append("\trender() { return <div>{this.props.label}</div>; }")
+	lines.append("}")
+	lines.append(f"export const use{name} = () => {rng.randint(0, 9)};")
+	return "\n".join(lines) + "\n"
+
+
+def _ts_module(rng: random.Random, name: str, methods: int, body_lines: int) -> str:
+	lines = [f"export function {name[0].lower() + name[1:]}(id: number): string {{", "\treturn String(id);", "}"]
+	for m in range(methods):
+		lines.append(f"export const {rng.choice(_VERBS)}{name}{m} = async (id: number): Promise<void> => {{")
+		for b in range(body_lines):
+			lines.append(f"\tawait fetch(`/api/{name.lower()}/${{id}}/{b}`);")
+		lines.append("};")
+	return "\n".join(lines) + "\n"
+
+
+def generate_project(root: str, files: int = 500, methods: int = 6, body_lines: int = 4, depth: int = 3,
+		excluded_files: int = 200, seed: int = 0) -> Dict[str, int]:
+	"""Write a deterministic Laravel/React-style tree under root and return what was written.
+
+	files is the number of parsable files (about half PHP, half TS/TSX), methods and body_lines set their size,
+	depth how deeply modules nest, excluded_files how much bulk goes to vendor/node_modules-like folders.
+	Blade views are added alongside, since they are excluded by extension.
+	"""
+	rng = random.Random(seed)
+	written = {"files": 0, "bytes": 0, "excluded_files": 0}
+
+	def write(rel_path: str, content: str, counted: bool = True):
+		path = os.path.join(root, rel_path)
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+		data = content.encode("utf8")
+		with open(path, "wb") as f:
+			f.write(data)
+		if counted:
+			written["files"] += 1
+			written["bytes"] += len(data)
+		else:
+			written["excluded_files"] += 1
+
+	def module_dir(base: str, i: int) -> str:
+		parts = [base] + [f"{_DOMAINS[(i // (3 ** d)) % len(_DOMAINS)]}{d}" for d in range(rng.randint(1, max(1, depth)))]
+		return "/".join(parts)
+
+	for i in range(files):
+		domain = _DOMAINS[i % len(_DOMAINS)]
+		kind = i % 4
+		if kind in (0, 1):
+			base = "app/Http/Controllers" if kind == 0 else "app/Services"
+			folder = module_dir(base, i)
+			name = f"{domain}{'Controller' if kind == 0 else 'Service'}{i}"
+			namespace = folder.replace("app/", "App/", 1).replace("/", "\\")
+			write(f"{folder}/{name}.php", _php_class(rng, namespace, name, methods, body_lines))
+		elif kind == 2:
+			name = f"{domain}Panel{i}"
+			write(f"{module_dir('resources/js/components', i)}/{name}.tsx", _tsx_component(rng, name, methods, body_lines))
+		else:
+			name = f"{domain}Api{i}"
+			write(f"{module_dir('resources/js/api', i)}/{name}.ts", _ts_module(rng, name, methods, body_lines))
+		if i % 10 == 0:
+			write(f"resources/views/{domain.lower()}{i}.blade.php", f"<div>{{{{ ${domain.lower()} }}}}</div>\n", counted=False)
+
+	for i in range(excluded_files):
+		folder = EXCLUDED_BULK_DIRS[i % len(EXCLUDED_BULK_DIRS)]
+		if i % 2:
+			write(f"{folder}/Vendor{i}.php", _php_class(rng, "Vendor", f"Vendor{i}", methods, body_lines), counted=False)
+		else:
+			write(f"{folder}/chunk{i}.js", f"export function chunk{i}() {{ return {i}; }}\n", counted=False)
+
+	return written
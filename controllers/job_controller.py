@@ -0,0 +1,58 @@
+from fastapi.concurrency import run_in_threadpool
+
+from DTO.Requests.parser_request import ParseProjectRequest
+from DTO.Requests.todo_list_request import TodoListRequest
+from DTO.Responses.job_response import JobResponse
+from controllers.open_ai_controller import OpenAiController
+from controllers.parser_controller import ParserController
+from services.job_service import jobs, Job, FINISHED_STATES, SUCCEEDED
+
+
+class JobController:
+	"""Controller for submitting parse/generate work as background jobs"""
+
+	def __init__(self):
+		self.jobs = jobs
+
+	def submit_parse(self, request: ParseProjectRequest) -> JobResponse:
+		async def run(job: Job):
+			job.update(progress=0.1, message="Analyse du projet")
+			response = await run_in_threadpool(ParserController().parse_project, request)
+			job.update(message="Analyse terminée")
+			return response.model_dump()
+
+		return JobResponse(**self.jobs.submit("parse", run).to_dict())
+
+	def submit_generate(self, request: TodoListRequest) -> JobResponse:
+		async def run(job: Job):
+			partial = {"context": "", "technical_todolist": "", "clarifications": ""}
+			job.update(progress=0.05, message="Génération de la todo", partial=partial)
+			async for event in OpenAiController().transcript_to_technical_todo_events(request):
+				if event["event"] == "delta":
+					partial[event["field"]] += event["text"]
+				elif event["event"] == "done":
+					partial[event["field"]] = event["value"]
+					# Three sections fill in one after the other
+					job.update(progress=job.progress + 0.3)
+				elif event["event"] == "error":
+					raise RuntimeError(event["detail"])
+				elif event["event"] == "complete":
+					return {k: v for k, v in event.items() if k != "event"}
+			raise RuntimeError("error occured while generating the todolist")
+
+		return JobResponse(**self.jobs.submit("generate", run).to_dict())
+
+	def status(self, job_id: str) -> JobResponse:
+		return JobResponse(**self.jobs.get(job_id).to_dict())
+
+	def result(self, job_id: str):
+		"""Return the job's result; ValueError while it is still running or if it did not succeed"""
+		job = self.jobs.get(job_id)
+		if job.status not in FINISHED_STATES:
+			raise ValueError(f"Job {job_id} is still {job.status}")
+		if job.status != SUCCEEDED:
+			raise ValueError(f"Job {job_id} {job.status}: {job.error or ''}".strip())
+		return job.result
+
+	def cancel(self, job_id: str) -> JobResponse:
+		return JobResponse(**self.jobs.cancel(job_id).to_dict())
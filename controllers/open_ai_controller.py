@@ -1,10 +1,58 @@
+import json
+from typing import AsyncIterator
+
+from fastapi.concurrency import run_in_threadpool
+
 from DTO.Requests.todo_list_request import TodoListRequest
 from DTO.Responses.open_ai_response import OpenAiResponse
+from controllers.parser_controller import ParserController
 from services.openai_service import OpenAiService
+from utils.partial_json import JsonFieldStreamer
+
+# Schema keys mapped to the names the API returns
+RESPONSE_FIELDS = {
+	"contexte": "context",
+	"technical_todolist": "technical_todolist",
+	"clarifications_requises": "clarifications",
+}
+
 
 class OpenAiController:
 	def __init__(self):
 		self.service = OpenAiService()
 
-	def transcript_to_technical_todo(self, request: TodoListRequest) -> OpenAiResponse:
-		return self.service.transcript_to_technical_todo(request)
+	async def _with_project_summary(self, request: TodoListRequest) -> TodoListRequest:
+		"""Fill parsed_project from the server-side project when the request only carries its project_id"""
+		if request.parsed_project is not None:
+			return request
+		# The session may have to be parsed again if it was evicted, so keep it off the event loop
+		summary = await run_in_threadpool(ParserController().project_summary, request.project_id, request.transcript)
+		return request.model_copy(update={"parsed_project": summary})
+
+	async def transcript_to_technical_todo(self, request: TodoListRequest) -> OpenAiResponse:
+		request = await self._with_project_summary(request)
+		return await self.service.transcript_to_technical_todo(request)
+
+	async def transcript_to_technical_todo_events(self, request: TodoListRequest) -> AsyncIterator[dict]:
+		"""Yield field deltas as the completion streams in, then the full result (or an error event)"""
+		streamer = JsonFieldStreamer()
+		try:
+			request = await self._with_project_summary(request)
+			async for content in self.service.stream_transcript_to_technical_todo(request):
+				for event, key, value in streamer.feed(content):
+					if key not in RESPONSE_FIELDS:
+						continue
+					payload = {"event": event, "field": RESPONSE_FIELDS[key]}
+					payload["text" if event == "delta" else "value"] = value
+					yield payload
+			result = {name: streamer.values.get(key) for key, name in RESPONSE_FIELDS.items()}
+			if not result["context"] or not result["technical_todolist"]:
+				raise ValueError("error occured while generating the todolist")
+			yield {"event": "complete", **result}
+		except Exception as e:
+			yield {"event": "error", "detail": str(e)}
+
+	async def stream_transcript_to_technical_todo(self, request: TodoListRequest) -> AsyncIterator[str]:
+		"""Yield the generation events as NDJSON lines"""
+		async for event in self.transcript_to_technical_todo_events(request):
+			yield json.dumps(event) + "\n"
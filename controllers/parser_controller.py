@@ -1,35 +1,103 @@
-from DTO.Requests.parser_request import ParserRequest, ParseProjectRequest
-from DTO.Responses.parser_response import ParserResponse, ParsedProjectResponse
+from DTO.Requests.parser_request import ParserRequest, ParseProjectRequest, SymbolSearchRequest, DependencyRequest
+from DTO.Responses.parser_response import ParserResponse, ParsedProjectResponse, SymbolMatch, SymbolSearchResponse, DependencyNode, DependencyResponse
 from services.parser_service import ParserService
+from services.project_session_service import project_sessions, project_path_for
+from services.upload_store_service import get_upload_store
 
 
 class ParserController:
 	"""Controller for handling parser operations"""
 
 	def __init__(self):
-		self.service = ParserService()
+		self.sessions = project_sessions
 
 	def extract_symbols(self, request: ParserRequest) -> ParserResponse:
 		"""Extract symbols from a parsed project file"""
-		# First, parse the project
-		self.service.set_ast(request.project_path)
-		
-		# Then extract symbols from the requested file
-		symbols = self.service.extract_symbols(request.file_path)
+		# Reuse the project parsed by a previous request when there is one
+		with self._use(request.project_path) as service:
+			symbols = service.extract_symbols(request.file_path)
 		
 		return ParserResponse(
 			file=symbols["file"],
 			classes=symbols["classes"]
 		)
 	
+	def search_symbols(self, request: SymbolSearchRequest) -> SymbolSearchResponse:
+		"""Search symbol names, parents, members, types and paths of a parsed project"""
+		with self._use(request.project_path) as service:
+			results = service.symbol_index().search(request.query, request.field, request.mode, request.limit)
+			return SymbolSearchResponse(results=[
+				SymbolMatch(field=r["field"], name=r["name"], file=r["file"], class_name=r["class"], kind=r["kind"])
+				for r in results
+			])
+
 	def parse_project(self, request: ParseProjectRequest) -> ParsedProjectResponse:
-		"""Parse entire project and return all symbols as a formatted string"""
-		# Parse the project
-		self.service.set_ast(request.project_path)
+		"""Parse entire project and return all symbols as a formatted string, or only stats and a preview page"""
+		# Parse the project, or only the files changed since the last request
+		with self._use(self._project_path(request)) as service:
+			return self._parsed_project(request, service)
+
+	def _parsed_project(self, request: ParseProjectRequest, service: ParserService) -> ParsedProjectResponse:
+		"""Response of parse_project, built while the session is locked"""
+		all_symbols = service.extract_all_symbol_dicts()
+		
+		# Extract all symbols and format for OpenAI, ranked against the transcript when one is given
+		parsed_content = None
+		if request.include_summary:
+			if request.transcript or request.token_budget:
+				parsed_content = service.project_summary().build(request.transcript, request.token_budget)
+			else:
+				parsed_content = service.format_symbols(all_symbols)
 		
-		# Extract all symbols and format for OpenAI
-		parsed_content = self.service.extract_all_symbols()
+		files = [f for f in all_symbols if f.get("classes", [])]
+		preview = []
+		pages = 0
+		if request.page_size > 0:
+			pages = (len(files) + request.page_size - 1) // request.page_size
+			start = (max(1, request.page) - 1) * request.page_size
+			preview = [ParserService.format_file_symbols(f) for f in files[start:start + request.page_size]]
 		
-		return ParsedProjectResponse(parsed_project=parsed_content)
+		scan_stats = service.scan_stats.to_dict() if service.scan_stats else None
+		return ParsedProjectResponse(
+			parsed_project=parsed_content,
+			scan_stats=scan_stats,
+			project_id=request.project_id,
+			file_count=service.file_count(),
+			files_with_symbols=len(files),
+			preview=preview,
+			page=max(1, request.page),
+			pages=pages,
+		)
+
+	def project_summary(self, project_id: str, transcript: str = None, token_budget: int = None) -> str:
+		"""Summary of a project kept on the server, ranked against the transcript, for prompts referring to it by id"""
+		get_upload_store().touch(project_id)
+		with self._use(project_path_for(project_id)) as service:
+			return service.project_summary().build(transcript, token_budget)
+
+	def dependency_neighborhood(self, request: DependencyRequest) -> DependencyResponse:
+		"""Files within k hops of the files and symbols a transcript (or the request) names, with their edges"""
+		with self._use(self._project_path(request)) as service:
+			graph = service.dependency_graph()
+			seeds = set(graph.seeds(request.transcript)) if request.transcript else set()
+			seeds.update(f for f in request.files if f in graph)
+			seeds.update(graph.files_named(request.symbols))
+			nodes = graph.neighborhood(sorted(seeds), request.hops, request.direction, request.limit)
+			return DependencyResponse(
+				seeds=sorted(seeds),
+				nodes=[DependencyNode(file=f, distance=d) for f, d in nodes.items()],
+				edges=[list(edge) for edge in graph.edges(nodes)],
+			)
 
+	def _use(self, project_path: str):
+		"""Parsed project, locked for the block; files edited since the last request are re-parsed, uploads in the store never change"""
+		return self.sessions.use(project_path, refresh=not get_upload_store().contains(project_path))
 
+	@staticmethod
+	def _project_path(request) -> str:
+		"""Path of the request's project, given as a path or as the id of an uploaded project"""
+		if request.project_path is not None:
+			return request.project_path
+		project_path = project_path_for(request.project_id)
+		get_upload_store().touch(request.project_id)
+		return project_path
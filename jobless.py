@@ -1,52 +1,117 @@
 import argparse
+import asyncio
+import json
+import os
+import time
 from datetime import datetime
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Load .env before importing modules that read their settings at import time
+load_dotenv()
 
 from DTO.Requests.todo_list_request import TodoListRequest
 from controllers.open_ai_controller import OpenAiController
+from services.parser_service import ParserService, EXTRACTOR_VERSION
+from services.project_summary_service import ProjectSummaryService
+from services.symbol_cache_service import SymbolCacheService
+from utils.transcript_reader import TRANSCRIPT_EXTENSIONS, read_transcript_file
 
-from docx import Document
-from dotenv import load_dotenv
 
-load_dotenv()
+def build_summary(project_path: str, analysis_path: str = None) -> ProjectSummaryService:
+	"""Parse the project once; the summary is then ranked per transcript"""
+	# Only symbols are needed here, so trees and sources are not kept around
+	service = ParserService(cache=SymbolCacheService(EXTRACTOR_VERSION), lean=True)
+	service.set_ast(project_path)
+	if analysis_path:
+		service.write_artifact(analysis_path)
+	return service.project_summary()
+
+
+def write_outputs(folder_path: str, response):
+	if not os.path.exists(folder_path):
+		os.makedirs(folder_path)
+	with open(os.path.join(folder_path, "context.md"), "w") as f:
+		f.write(response.context)
+	with open(os.path.join(folder_path, "todo.md"), "w") as f:
+		f.write(response.technical_todo)
+	with open(os.path.join(folder_path, "clarifications.md"), "w") as f:
+		f.write(response.clarifications if response.clarifications else "Aucune clarification requise.")
+
+
+async def run_batch(transcript_dir: str, summary: ProjectSummaryService, folder_path: str, concurrency: int):
+	"""Generate a todo per transcript in the directory, at most `concurrency` at a time, and write a report"""
+	transcripts = sorted(
+		p for p in Path(transcript_dir).iterdir()
+		if p.is_file() and p.suffix.lower() in TRANSCRIPT_EXTENSIONS and not p.name.startswith("~$")
+	)
+	controller = OpenAiController()
+	limit = asyncio.Semaphore(concurrency)
+
+	async def generate(path: Path) -> dict:
+		async with limit:
+			started = time.perf_counter()
+			report = {"transcript": path.name, "output": os.path.join(folder_path, path.stem)}
+			try:
+				# Reading and ranking are blocking work; keep them off the loop so other generations keep streaming
+				transcript = await asyncio.to_thread(read_transcript_file, str(path))
+				parsed_project = await asyncio.to_thread(summary.build, transcript)
+				request = TodoListRequest(parsed_project=parsed_project, transcript=transcript)
+				response = await controller.transcript_to_technical_todo(request)
+				write_outputs(report["output"], response)
+				report["status"] = "ok"
+			except Exception as e:
+				report["status"] = "error"
+				report["error"] = str(e)
+			report["seconds"] = round(time.perf_counter() - started, 2)
+			print(f"[{report['status']}] {path.name} ({report['seconds']}s)")
+			return report
 
+	reports = await asyncio.gather(*(generate(p) for p in transcripts))
 
-def read_docx(path: str) -> str:
-	doc = Document(path)
-	return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
+	os.makedirs(folder_path, exist_ok=True)
+	with open(os.path.join(folder_path, "report.json"), "w") as f:
+		json.dump(reports, f, indent=2, ensure_ascii=False)
+	with open(os.path.join(folder_path, "report.md"), "w") as f:
+		ok = sum(1 for r in reports if r["status"] == "ok")
+		f.write(f"# Rapport de génération\n\n{ok}/{len(reports)} transcripts traités.\n\n")
+		f.write("| Transcript | Statut | Durée (s) | Détail |\n|---|---|---|---|\n")
+		for r in reports:
+			f.write(f"| {r['transcript']} | {r['status']} | {r['seconds']} | {r.get('error', r['output'])} |\n")
+	return reports
 
 
 def main():
 	parser = argparse.ArgumentParser(description="My Python CLI tool")
 
-	parser.add_argument("transcript_path", help="Path to transcript")
-	parser.add_argument("project_path", nargs="?", default=".", help="Path to project (default: current directory)")
+	parser.add_argument("transcript_path", help="Path to transcript (or to a folder of transcripts with --batch)")
+	parser.add_argument("project_path", nargs="?", default=".", help="Path to project, .zip or prebuilt .analysis.jsonl artifact (default: current directory)")
 	parser.add_argument("-o", "--output", type=str, help="Path to the output folder")
+	parser.add_argument("-b", "--batch", action="store_true", help="Process every .docx/.txt/.vtt/.srt transcript in transcript_path")
+	parser.add_argument("--write-analysis", type=str, help="Also save the project analysis as an artifact reusable in place of project_path")
+	parser.add_argument("-c", "--concurrency", type=int, default=4, help="Generations running at once in batch mode (default: 4)")
 	# parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose output")
 
 	args = parser.parse_args()
 
-	transcript = read_docx(args.transcript_path)
-	controller = OpenAiController()
-
-	request = TodoListRequest(parsed_project=args.project_path, transcript=transcript)
-	response = controller.transcript_to_technical_todo(request)
 	date = datetime.now().strftime("%Y-%d-%m %H:%M:%S")
-	context = response.context
-	technical_todo = response.technical_todo
-	clarifications = response.clarifications
-
 	# Create a folder of format name-date, inside this folder create a todo.md file and a clarifications.md file
 	folder_name = "output/" + f"{date.replace(' ', '_').replace(':', '-')}"
 	folder_path = args.output if args.output else folder_name
-	import os
-	if not os.path.exists(folder_path):
-		os.makedirs(folder_path)
-	with open(os.path.join(folder_path, "context.md"), "w") as f:
-		f.write(context)
-	with open(os.path.join(folder_path, "todo.md"), "w") as f:
-		f.write(technical_todo)
-	with open(os.path.join(folder_path, "clarifications.md"), "w") as f:
-		f.write(clarifications if clarifications else "Aucune clarification requise.")
+
+	summary = build_summary(args.project_path, args.write_analysis)
+
+	if args.batch:
+		asyncio.run(run_batch(args.transcript_path, summary, folder_path, max(1, args.concurrency)))
+		return
+
+	transcript = read_transcript_file(args.transcript_path)
+	controller = OpenAiController()
+
+	request = TodoListRequest(parsed_project=summary.build(transcript), transcript=transcript)
+	response = asyncio.run(controller.transcript_to_technical_todo(request))
+	write_outputs(folder_path, response)
 
 
 if __name__ == "__main__":
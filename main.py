@@ -1,23 +1,58 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
 from dotenv import load_dotenv
-from fastapi import FastAPI
+
+# Load .env before importing modules that read their settings at import time
+load_dotenv()
+
+from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 from routes.api import router
+from services.metrics_service import metrics, start_request_timings, server_timing_header
+from services.openai_service import close_client
+from services.upload_store_service import get_upload_store
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Keep the upload store within its quota and age limits
+    gc_task = asyncio.create_task(get_upload_store().run_gc())
+    yield
+    gc_task.cancel()
+    # Release the pooled OpenAI connections
+    await close_client()
 
-load_dotenv()
 
 app = FastAPI(
     title="Reunion to Code API",
     description="Transform meeting transcripts into actionable technical todos",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+@app.middleware("http")
+async def add_server_timing(request: Request, call_next):
+    # Stages timed while handling the request; for streamed responses only those done before the first byte
+    timings = start_request_timings()
+    started = time.perf_counter()
+    response = await call_next(request)
+    response.headers["Server-Timing"] = server_timing_header(timings, time.perf_counter() - started)
+    return response
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 # Include API routes
 app.include_router(router)
 
+# Prometheus scrape endpoint
+@app.get("/metrics", response_class=PlainTextResponse)
+async def read_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # Root route - serve the web UI
 @app.get("/")
 async def read_root():
@@ -0,0 +1,58 @@
+import sys
+from typing import Any, Dict, Optional
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+	# Type names, parents and method names repeat across a project; interning keeps one copy of each
+	return sys.intern(value) if value is not None else None
+
+
+class ClassRecord:
+	"""Compact form of one extracted class, interface or function; methods are (name, return type) tuples"""
+	__slots__ = ("name", "kind", "extends", "properties", "methods")
+
+	def __init__(self, name: str, kind: str, extends: Optional[str], properties: tuple, methods: tuple):
+		self.name = name
+		self.kind = kind
+		self.extends = extends
+		self.properties = properties
+		self.methods = methods
+
+	@classmethod
+	def from_dict(cls, data: Dict[str, Any]) -> "ClassRecord":
+		return cls(
+			_intern(data.get("class")),
+			_intern(data.get("type", "class")),
+			_intern(data.get("extends")),
+			tuple(_intern(p) for p in data.get("properties", ())),
+			tuple((_intern(m.get("name")), _intern(m.get("return"))) for m in data.get("methods", ())),
+		)
+
+	def to_dict(self) -> Dict[str, Any]:
+		methods = [{"name": name, "return": return_type} for name, return_type in self.methods]
+		if self.kind == "function":
+			return {"class": self.name, "methods": methods, "type": self.kind}
+		return {"class": self.name, "extends": self.extends, "properties": list(self.properties), "methods": methods, "type": self.kind}
+
+
+class FileSymbols:
+	"""Compact form of a file's symbols and dependencies, as kept by ParserService in lean mode"""
+	__slots__ = ("file", "classes", "namespace", "imports")
+
+	def __init__(self, file: str, classes: tuple, namespace: Optional[str] = None, imports: tuple = ()):
+		self.file = file
+		self.classes = classes
+		self.namespace = namespace
+		self.imports = imports
+
+	@classmethod
+	def from_dict(cls, data: Dict[str, Any]) -> "FileSymbols":
+		return cls(
+			data["file"],
+			tuple(ClassRecord.from_dict(c) for c in data.get("classes", ())),
+			_intern(data.get("namespace")),
+			tuple(_intern(i) for i in data.get("imports", ())),
+		)
+
+	def to_dict(self) -> Dict[str, Any]:
+		return {"file": self.file, "classes": [c.to_dict() for c in self.classes], "namespace": self.namespace, "imports": list(self.imports)}
@@ -1,4 +1,6 @@
 from DTO.Requests.todo_list_request import TodoListRequest
+from services.metrics_service import metrics
+from services.project_summary_service import truncate_summary, PROJECT_SUMMARY_TOKEN_BUDGET
 
 
 class Prompt:
@@ -16,12 +18,10 @@ class Prompt:
 
 	@staticmethod
 	def transcript_to_technical_todo_prompt(Request: TodoListRequest):
-		ast_text = Request.parsed_project
-		# MAX_LEN = 120_000
-		# if len(ast_text) > MAX_LEN:
-		# 	ast_text = ast_text[:MAX_LEN] + "\n...\n[AST TRONQUÉ POUR LA BRIÈVETÉ]"
+		with metrics.span("prompt"):
+			ast_text = truncate_summary(Request.parsed_project, PROJECT_SUMMARY_TOKEN_BUDGET)
 
-		return f"""
+			prompt = f"""
 Tu es un **lead dev full-stack** chargé de dériver une **to-do technique détaillée** à partir d'un transcript de réunion **en respectant la structure réelle du projet** et **le stack détecté dans l'AST** (ex. Laravel/PHP, React/Vite, etc.).
 
 # Objectif
@@ -71,3 +71,23 @@ Cette section doit être vide si tout est clair. Cette section doit etre uniquem
 # Sortie attendue
 Une **liste actionnable** et **priorisée** de tâches techniques, groupées par domaine (Backend/Frontend/DB/Tests/Infra), s’appuyant sur la **structure réelle** du projet ci-dessus. Respecte le format JSON demandé.
 """
+		return prompt
+
+	@staticmethod
+	def transcript_chunk_to_tasks_prompt(parsed_project: str, chunk: str, index: int, total: int):
+		return f"""
+Tu es un **lead dev full-stack**. Voici la **partie {index}/{total}** d'un long transcript de réunion. Les autres parties sont traitées séparément puis fusionnées.
+
+# Contexte — Structure du projet (extrait)
+<{parsed_project}>
+
+# Transcript — partie {index}/{total}
+<{chunk}>
+
+# Ce que tu dois produire
+- **resume** : 3 à 6 phrases résumant les décisions et sujets de cette partie (non technique).
+- **taches** : chaque action technique candidate évoquée dans cette partie, avec un **titre** impératif court, des **details** (contexte, contraintes, critères mentionnés) et les **fichiers** du projet concernés s'ils sont identifiables (chemins réels de la structure ci-dessus, sinon liste vide).
+- **questions** : les points ambigus ou bloquants soulevés dans cette partie.
+- N'invente rien qui ne soit pas dans cette partie du transcript.
+"""
+
@@ -1,16 +1,20 @@
-import os
-import zipfile
 from http.client import responses
 
 from fastapi import APIRouter, File, UploadFile, HTTPException
-from docx import Document
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
 from DTO.Requests.output_request import OutputRequest
 from DTO.Requests.todo_list_request import TodoListRequest
-from DTO.Requests.parser_request import ParserRequest, ParseProjectRequest
+from DTO.Requests.parser_request import ParserRequest, ParseProjectRequest, SymbolSearchRequest, DependencyRequest
 from controllers.build_output_controller import BuildOutputController
 from controllers.open_ai_controller import OpenAiController
+from controllers.job_controller import JobController
 from controllers.parser_controller import ParserController
+from services.metrics_service import metrics
+from services.project_import_service import ProjectImportService
+from services.project_session_service import ProjectNotFoundError, project_path_for
+from utils.transcript_reader import read_transcript
 
 router = APIRouter(prefix="/api", tags=["api"])
 
@@ -21,37 +25,19 @@ def read_root():
 @router.post("/import-transcript/{folder_id}")
 async def import_transcript(folder_id: str, file: UploadFile = File(...)):
 	try:
-		folder_path = os.path.join("/tmp", folder_id)
-		os.makedirs(folder_path, exist_ok=True)
+		project_path_for(folder_id)
 		
-		file_path = os.path.join(folder_path, file.filename)
-		content = await file.read()
-
-		with open(file_path, "wb") as f:
-			f.write(content)
-		
-		text_content = ""
-		filename_lower = file.filename.lower()
-		
-		if filename_lower.endswith('.txt'):
-			try:
-				text_content = content.decode('utf-8')
-			except UnicodeDecodeError:
-				text_content = content.decode('latin-1')
-		elif filename_lower.endswith('.docx'):
-			doc = Document(file_path)
-			paragraphs = [paragraph.text for paragraph in doc.paragraphs]
-			non_empty_paragraphs = [p for p in paragraphs if p.strip()]
-			text_content = '\n'.join(non_empty_paragraphs)
-			if len(text_content) == 0:
-				print("WARNING: No text extracted from docx file!")
-		else:
-			raise HTTPException(status_code=400, detail="Only .txt and .docx files are supported")
+		# Read straight from the spooled upload: no copy on disk, and .docx is streamed rather than loaded whole
+		text_content = await run_in_threadpool(read_transcript, file.file, file.filename)
+		if len(text_content) == 0:
+			print("WARNING: No text extracted from transcript file!")
 		
 		return {"name": file.filename, "content": text_content}
 
 	except HTTPException:
 		raise
+	except ValueError as e:
+		raise HTTPException(status_code=400, detail=str(e))
 	except Exception as e:
 		import traceback
 		traceback.print_exc()
@@ -59,26 +45,30 @@ async def import_transcript(folder_id: str, file: UploadFile = File(...)):
 
 
 @router.post("/import-project/{folder_id}")
-async def import_zip(folder_id: str, file: UploadFile = File(...)):
+async def import_zip(folder_id: str, file: UploadFile = File(...), extract: bool = False):
 	try:
 		if not file.filename.lower().endswith(".zip"):
 			raise HTTPException(status_code=400, detail="Only .zip files are allowed")
 
-		folder_path = os.path.join("/tmp", folder_id)
-		os.makedirs(folder_path, exist_ok=True)
+		project_path_for(folder_id)
 
-		zip_path = os.path.join(folder_path, file.filename)
-		with open(zip_path, "wb") as f:
-			content = await file.read()
-			f.write(content)
+		import_service = ProjectImportService()
+		with metrics.span("import_zip"):
+			# Archives are stored by content hash: importing the same zip again reuses its copy and its parse
+			digest = await import_service.save_upload(file)
 
-		with zipfile.ZipFile(zip_path, "r") as zip_ref:
-			zip_ref.extractall(folder_path)
+			if extract:
+				# Only source files are extracted, and they are parsed as they come out of the archive
+				service = await run_in_threadpool(import_service.extract_and_parse, digest, folder_id)
+			else:
+				service = await run_in_threadpool(import_service.parse_archive, digest, folder_id)
 
-		return {"name": file.filename}
+		return {"name": file.filename, "files": service.file_count()}
 
 	except HTTPException:
 		raise
+	except ValueError as e:
+		raise HTTPException(status_code=400, detail=str(e))
 	except Exception as e:
 		raise HTTPException(status_code=500, detail=str(e))
 
@@ -86,7 +76,7 @@ async def import_zip(folder_id: str, file: UploadFile = File(...)):
 async def generate_todolist(todo_list_request: TodoListRequest):
 	try:
 		controller = OpenAiController()
-		response = controller.transcript_to_technical_todo(todo_list_request)
+		response = await controller.transcript_to_technical_todo(todo_list_request)
 		if not response.context or not response.technical_todo:
 			raise HTTPException(status_code=500, detail="error occured while generating the todolist")
 		
@@ -94,12 +84,23 @@ async def generate_todolist(todo_list_request: TodoListRequest):
 	
 	except HTTPException:
 		raise
+	except ProjectNotFoundError as e:
+		raise HTTPException(status_code=400, detail=str(e))
 	except Exception as e:
 		print(f"Error generating todolist: {str(e)}")
 		import traceback
 		traceback.print_exc()
 		raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/generate-todolist/stream")
+async def generate_todolist_stream(todo_list_request: TodoListRequest):
+	"""Stream the todolist as NDJSON events while the completion is generated"""
+	controller = OpenAiController()
+	return StreamingResponse(
+		controller.stream_transcript_to_technical_todo(todo_list_request),
+		media_type="application/x-ndjson"
+	)
+
 @router.post("/build-output")
 async def build_output(output_request: OutputRequest):
 	controller = BuildOutputController()
@@ -114,7 +115,7 @@ async def extract_symbols(parser_request: ParserRequest):
 	"""Extract symbols (classes, methods, properties) from a project file"""
 	controller = ParserController()
 	try:
-		response = controller.extract_symbols(parser_request)
+		response = await run_in_threadpool(controller.extract_symbols, parser_request)
 		return response
 	except ValueError as e:
 		raise HTTPException(status_code=400, detail=str(e))
@@ -126,9 +127,64 @@ async def parse_project(parse_request: ParseProjectRequest):
 	"""Parse entire project and return all symbols as a formatted string for OpenAI"""
 	controller = ParserController()
 	try:
-		response = controller.parse_project(parse_request)
+		response = await run_in_threadpool(controller.parse_project, parse_request)
 		return response
 	except ValueError as e:
 		raise HTTPException(status_code=400, detail=str(e))
 	except Exception as e:
 		raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/search-symbols")
+async def search_symbols(search_request: SymbolSearchRequest):
+	"""Search classes, parents, methods, property types and paths of a parsed project"""
+	controller = ParserController()
+	try:
+		return await run_in_threadpool(controller.search_symbols, search_request)
+	except ValueError as e:
+		raise HTTPException(status_code=400, detail=str(e))
+	except Exception as e:
+		raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/dependencies")
+async def dependencies(dependency_request: DependencyRequest):
+	"""Files around those the transcript (or the request) names, with their use/import edges"""
+	controller = ParserController()
+	try:
+		return await run_in_threadpool(controller.dependency_neighborhood, dependency_request)
+	except ValueError as e:
+		raise HTTPException(status_code=400, detail=str(e))
+	except Exception as e:
+		raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/jobs/parse")
+async def submit_parse_job(parse_request: ParseProjectRequest):
+	"""Parse a project in the background; poll /jobs/{job_id} for progress"""
+	return JobController().submit_parse(parse_request)
+
+@router.post("/jobs/generate")
+async def submit_generate_job(todo_list_request: TodoListRequest):
+	"""Generate the todolist in the background; partial sections show up in the job status"""
+	return JobController().submit_generate(todo_list_request)
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+	try:
+		return JobController().status(job_id)
+	except KeyError as e:
+		raise HTTPException(status_code=404, detail=str(e.args[0]))
+
+@router.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+	try:
+		return JobController().result(job_id)
+	except KeyError as e:
+		raise HTTPException(status_code=404, detail=str(e.args[0]))
+	except ValueError as e:
+		raise HTTPException(status_code=409, detail=str(e))
+
+@router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+	try:
+		return JobController().cancel(job_id)
+	except KeyError as e:
+		raise HTTPException(status_code=404, detail=str(e.args[0]))
@@ -0,0 +1,106 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+ARTIFACT_FORMAT = "transcript-to-todolist-analysis"
+ARTIFACT_VERSION = 2
+ARTIFACT_SUFFIX = ".analysis.jsonl"
+
+
+def is_artifact(path: Path) -> bool:
+	"""True if path is an analysis artifact (checked on the header, not only the suffix)"""
+	if not path.is_file():
+		return False
+	try:
+		with open(path, "rb") as f:
+			return f.read(64).startswith(b'{"format":"' + ARTIFACT_FORMAT.encode())
+	except OSError:
+		return False
+
+
+def write_artifact(path: str, root: str, extractor_version: str, records: Iterable[Tuple[str, str, Dict[str, Any]]]) -> int:
+	"""Write (relative_path, content_hash, symbols) records as JSON lines behind a header holding an offset index.
+
+	The header is the first line, so readers can look up one file without parsing the others.
+	"""
+	index = {}
+	lines = []
+	offset = 0
+	for rel_posix, digest, symbols in records:
+		record = {
+			"file": rel_posix,
+			"hash": digest,
+			"classes": symbols.get("classes", []),
+			"namespace": symbols.get("namespace"),
+			"imports": symbols.get("imports", []),
+		}
+		line = json.dumps(record, separators=(",", ":")).encode("utf8") + b"\n"
+		index[rel_posix] = [offset, len(line), digest]
+		lines.append(line)
+		offset += len(line)
+
+	header = {
+		"format": ARTIFACT_FORMAT,
+		"version": ARTIFACT_VERSION,
+		"extractor_version": extractor_version,
+		"root": root,
+		"created_at": time.time(),
+		"files": index,
+	}
+	with open(path, "wb") as f:
+		f.write(json.dumps(header, separators=(",", ":")).encode("utf8") + b"\n")
+		f.writelines(lines)
+	return len(index)
+
+
+class AnalysisArtifact:
+	"""Lazy reader: loads the header index up front and each file's record on first access"""
+
+	def __init__(self, path: str, extractor_version: Optional[str] = None):
+		self.path = str(path)
+		self._file = open(self.path, "rb")
+		stat = os.fstat(self._file.fileno())
+		self.stat = (stat.st_size, stat.st_mtime_ns)
+		header = json.loads(self._file.readline())
+		if header.get("format") != ARTIFACT_FORMAT:
+			self._file.close()
+			raise ValueError(f"{path} is not a project analysis artifact")
+		if header.get("version") != ARTIFACT_VERSION:
+			self._file.close()
+			raise ValueError(f"Unsupported analysis artifact version {header.get('version')} (expected {ARTIFACT_VERSION})")
+		if extractor_version is not None and header.get("extractor_version") != extractor_version:
+			self._file.close()
+			raise ValueError(
+				f"Analysis artifact was built with extractor {header.get('extractor_version')}, "
+				f"this version uses {extractor_version}; rebuild it"
+			)
+		self.root = header.get("root")
+		self.created_at = header.get("created_at")
+		self.files = header["files"]  # {relative_path: [offset, length, content hash]}
+		self._base = self._file.tell()
+
+	def read(self, rel_posix: str) -> Dict[str, Any]:
+		offset, length, _ = self.files[rel_posix]
+		# pread leaves the shared handle's position alone, so worker threads can read records concurrently
+		record = json.loads(os.pread(self._file.fileno(), length, self._base + offset))
+		return {"file": record["file"], "classes": record["classes"], "namespace": record["namespace"], "imports": record["imports"]}
+
+	def close(self):
+		self._file.close()
+
+
+if __name__ == "__main__":
+	import argparse
+
+	from services.parser_service import ParserService
+
+	parser = argparse.ArgumentParser(description="Prebuild a project analysis artifact")
+	parser.add_argument("project_path", help="Project folder or .zip to analyse")
+	parser.add_argument("output", help=f"Artifact path (e.g. project{ARTIFACT_SUFFIX})")
+	args = parser.parse_args()
+
+	service = ParserService()
+	service.set_ast(args.project_path)
+	print(f"Wrote {service.write_artifact(args.output)} files to {args.output}")
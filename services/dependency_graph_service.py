@@ -0,0 +1,300 @@
+import os
+import posixpath
+import re
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from services.symbol_index_service import split_terms
+
+# How many hops around the files a transcript mentions count as its context
+DEPENDENCY_HOPS = int(os.environ.get("DEPENDENCY_HOPS", 2))
+
+# A name that is a word of more than this share of the file names (Controller in every XController) seeds nothing
+DEPENDENCY_SEED_MAX_SHARE = float(os.environ.get("DEPENDENCY_SEED_MAX_SHARE", 0.05))
+# ... unless it is a word of this few files at most, so small projects keep all their names
+_SEED_MIN_GENERIC_FILES = 3
+
+# Module specifier prefixes that point inside the project, e.g. Laravel's Vite alias "@/" for resources/js
+JS_IMPORT_ALIASES = {"@/": "resources/js/", "~/": "resources/js/"}
+
+_MODULE_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+_WORD_RE = re.compile(r"[A-Za-z_$][A-Za-z0-9_$]*")
+# Names shorter than this, or generic file stems, would match half of any transcript
+_MIN_NAME_LENGTH = 4
+_GENERIC_STEMS = {"index", "main", "app", "types", "utils", "helpers"}
+
+
+def _module_key(path: str) -> str:
+	"""Key a JS/TS module is imported by: its path without extension ("./user" finds user.ts)"""
+	for extension in _MODULE_EXTENSIONS:
+		if path.endswith(extension):
+			return "path:" + path[:-len(extension)]
+	return "path:" + path
+
+
+def _provided_keys(file_data: Dict[str, Any]) -> List[str]:
+	path = file_data["file"]
+	if path.endswith(".php"):
+		namespace = file_data.get("namespace")
+		keys = ["path:" + path]
+		for cls in file_data.get("classes", []):
+			if cls.get("type") != "function":
+				# PHP class names are case-insensitive
+				keys.append("php:" + (f"{namespace}\\{cls['class']}" if namespace else cls["class"]).lower())
+		return keys
+	keys = [_module_key(path)]
+	directory, name = posixpath.split(path)
+	if name.startswith("index."):
+		keys.append("path:" + directory)
+	return keys
+
+
+def _required_keys(file_data: Dict[str, Any]) -> List[str]:
+	path = file_data["file"]
+	directory = posixpath.dirname(path)
+	keys = []
+	for spec in file_data.get("imports", []):
+		if spec.startswith("."):
+			target = posixpath.normpath(posixpath.join(directory, spec))
+			if not target.startswith("../"):
+				keys.append("path:" + target if path.endswith(".php") else _module_key(target))
+		elif path.endswith(".php"):
+			keys.append("php:" + spec.lower())
+		else:
+			alias = next((a for a in JS_IMPORT_ALIASES if spec.startswith(a)), None)
+			if alias is not None:
+				keys.append(_module_key(JS_IMPORT_ALIASES[alias] + spec[len(alias):]))
+			# Anything else is a package, outside the project
+	return keys
+
+
+def _names(file_data: Dict[str, Any]) -> Set[str]:
+	"""Lowercased names a transcript may use for the file: its classes and its file name"""
+	names = {cls["class"].lower() for cls in file_data.get("classes", []) if cls.get("class")}
+	stem = posixpath.basename(file_data["file"]).split(".", 1)[0].lower()
+	if stem not in _GENERIC_STEMS:
+		names.add(stem)
+	return {name for name in names if len(name) >= _MIN_NAME_LENGTH}
+
+
+def _name_terms(file_data: Dict[str, Any]) -> Set[str]:
+	"""Words of the file's class and file names, whole and split on camelCase ("invoicecontroller", "invoice", "controller")"""
+	terms = set(split_terms(posixpath.basename(file_data["file"]).split(".", 1)[0]))
+	for cls in file_data.get("classes", []):
+		terms.update(split_terms(cls.get("class")))
+	return terms
+
+
+def _remove(values: array, value: int):
+	i = bisect_left(values, value)
+	if i < len(values) and values[i] == value:
+		del values[i]
+
+
+class DependencyGraph:
+	"""File-level dependency graph built from extracted symbols: a -> b when a uses, extends or imports b.
+
+	Each file keeps its sorted outgoing and incoming node ids in compact arrays; update() and remove()
+	patch only the files whose edges change.
+	"""
+
+	def __init__(self, all_symbols: Iterable[Dict[str, Any]] = ()):
+		self._paths: List[Optional[str]] = []  # node id -> path, None once removed
+		self._ids: Dict[str, int] = {}
+		self._free: List[int] = []
+		self._out: List[array] = []
+		self._in: List[array] = []
+		self._requires: List[Tuple[str, ...]] = []
+		self._provides: List[Tuple[str, ...]] = []
+		self._node_names: List[Tuple[str, ...]] = []
+		self._node_terms: List[Tuple[str, ...]] = []
+		self._providers = defaultdict(list)  # {key: [node ids]}
+		self._requirers = defaultdict(set)  # {key: {node ids}}, resolved or not, to re-resolve when providers change
+		self._by_name = defaultdict(set)  # {lowercased name: {node ids}}
+		self._term_files = Counter()  # {name word: number of files whose names hold it}
+		nodes = [self._attach(file_data) for file_data in all_symbols]
+		for node in nodes:
+			self._resolve(node)
+
+	def __len__(self) -> int:
+		return len(self._ids)
+
+	def __contains__(self, path: str) -> bool:
+		return path in self._ids
+
+	def edge_count(self) -> int:
+		return sum(len(targets) for targets in self._out)
+
+	def update(self, file_data: Dict[str, Any]):
+		"""Add or replace a file; files whose imports it now satisfies (or no longer does) are re-resolved"""
+		touched = self._detach(file_data["file"])
+		node = self._attach(file_data)
+		touched.add(node)
+		touched.update(n for key in self._provides[node] for n in self._requirers.get(key, ()))
+		for n in touched:
+			self._resolve(n)
+
+	def remove(self, path: str):
+		touched = self._detach(path)
+		for n in touched:
+			self._resolve(n)
+
+	def dependencies(self, path: str) -> List[str]:
+		"""Files the given file uses"""
+		return [self._paths[n] for n in self._out[self._ids[path]]]
+
+	def dependents(self, path: str) -> List[str]:
+		"""Files using the given file, i.e. those impacted when it changes"""
+		return [self._paths[n] for n in self._in[self._ids[path]]]
+
+	def files_named(self, names: Iterable[str]) -> List[str]:
+		"""Files declaring a class, or named, after one of the names (case-insensitive)"""
+		nodes = set()
+		for name in names:
+			nodes.update(self._by_name.get(name.lower(), ()))
+		return sorted(self._paths[n] for n in nodes)
+
+	def seeds(self, text: str) -> List[str]:
+		"""Files whose classes or file names the text mentions, also as split words ("invoice controller").
+
+		Generic names, words of many other file names (the base Controller of every XController), are left out.
+		"""
+		words = [w.lower() for w in _WORD_RE.findall(text or "")]
+		mentions = set()
+		i = 0
+		while i < len(words):
+			# Longest match first, so "invoice controller" does not also name every Controller
+			for size in (3, 2, 1):
+				name = "".join(words[i:i + size])
+				if name in self._by_name:
+					mentions.add(name)
+					i += size
+					break
+			else:
+				i += 1
+		generic = max(_SEED_MIN_GENERIC_FILES, DEPENDENCY_SEED_MAX_SHARE * len(self._ids))
+		return self.files_named(name for name in mentions if self._term_files[name] <= generic)
+
+	def neighborhood(self, seeds: Iterable[str], hops: int = None, direction: str = "both", limit: int = None) -> Dict[str, int]:
+		"""{path: distance} of the files within hops of the seed paths, closest first.
+
+		direction is "out" (what the seeds depend on), "in" (what depends on them) or "both".
+		"""
+		hops = hops if hops is not None else DEPENDENCY_HOPS
+		if direction not in ("out", "in", "both"):
+			raise ValueError(f"Unknown direction {direction!r}, expected 'out', 'in' or 'both'")
+		adjacency = [a for d, a in (("out", self._out), ("in", self._in)) if direction in (d, "both")]
+		distances = {}
+		frontier = []
+		for path in seeds:
+			node = self._ids.get(path)
+			if node is not None and node not in distances:
+				distances[node] = 0
+				frontier.append(node)
+		for distance in range(1, hops + 1):
+			if not frontier or (limit is not None and len(distances) >= limit):
+				break
+			next_frontier = []
+			for node in frontier:
+				for edges in adjacency:
+					for neighbor in edges[node]:
+						if neighbor not in distances:
+							distances[neighbor] = distance
+							next_frontier.append(neighbor)
+			frontier = next_frontier
+		ranked = sorted(distances.items(), key=lambda item: (item[1], self._paths[item[0]]))
+		if limit is not None:
+			ranked = ranked[:limit]
+		return {self._paths[node]: distance for node, distance in ranked}
+
+	def edges(self, paths: Iterable[str]) -> List[Tuple[str, str]]:
+		"""Edges between the given files, e.g. of a neighborhood"""
+		nodes = {self._ids[p] for p in paths if p in self._ids}
+		return [
+			(self._paths[node], self._paths[target])
+			for node in sorted(nodes, key=lambda n: self._paths[n])
+			for target in self._out[node] if target in nodes
+		]
+
+	def _attach(self, file_data: Dict[str, Any]) -> int:
+		path = file_data["file"]
+		if self._free:
+			node = self._free.pop()
+			self._paths[node] = path
+		else:
+			node = len(self._paths)
+			self._paths.append(path)
+			self._out.append(array("i"))
+			self._in.append(array("i"))
+			self._requires.append(())
+			self._provides.append(())
+			self._node_names.append(())
+			self._node_terms.append(())
+		self._ids[path] = node
+		self._provides[node] = tuple(_provided_keys(file_data))
+		self._requires[node] = tuple(dict.fromkeys(_required_keys(file_data)))
+		self._node_names[node] = tuple(_names(file_data))
+		self._node_terms[node] = tuple(_name_terms(file_data))
+		self._term_files.update(self._node_terms[node])
+		for key in self._provides[node]:
+			self._providers[key].append(node)
+		for key in self._requires[node]:
+			self._requirers[key].add(node)
+		for name in self._node_names[node]:
+			self._by_name[name].add(node)
+		return node
+
+	def _detach(self, path: str) -> Set[int]:
+		"""Drop a file's keys and edges; returns the files that resolved imports through it"""
+		node = self._ids.pop(path, None)
+		if node is None:
+			return set()
+		touched = set()
+		for key in self._provides[node]:
+			providers = self._providers[key]
+			providers.remove(node)
+			if not providers:
+				del self._providers[key]
+			touched.update(self._requirers.get(key, ()))
+		for key in self._requires[node]:
+			requirers = self._requirers[key]
+			requirers.discard(node)
+			if not requirers:
+				del self._requirers[key]
+		for name in self._node_names[node]:
+			named = self._by_name[name]
+			named.discard(node)
+			if not named:
+				del self._by_name[name]
+		self._term_files.subtract(self._node_terms[node])
+		for term in self._node_terms[node]:
+			if not self._term_files[term]:
+				del self._term_files[term]
+		for target in self._out[node]:
+			_remove(self._in[target], node)
+		for source in self._in[node]:
+			_remove(self._out[source], node)
+		self._out[node] = array("i")
+		self._in[node] = array("i")
+		self._provides[node] = self._requires[node] = self._node_names[node] = self._node_terms[node] = ()
+		self._paths[node] = None
+		self._free.append(node)
+		touched.discard(node)
+		return touched
+
+	def _resolve(self, node: int):
+		"""Recompute a file's outgoing edges from its imports and patch the incoming arrays of the targets"""
+		if self._paths[node] is None:
+			return
+		targets = sorted({t for key in self._requires[node] for t in self._providers.get(key, ()) if t != node})
+		old = self._out[node]
+		if list(old) == targets:
+			return
+		old_set, new_set = set(old), set(targets)
+		for target in old_set - new_set:
+			_remove(self._in[target], node)
+		for target in new_set - old_set:
+			insort(self._in[target], node)
+		self._out[node] = array("i", targets)
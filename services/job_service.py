@@ -0,0 +1,112 @@
+import asyncio
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict
+
+# Finished jobs are kept this long (seconds) for result retrieval
+JOB_RESULT_TTL = float(os.environ.get("JOB_RESULT_TTL", 3600))
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class Job:
+	"""A unit of background work with progress reporting"""
+
+	def __init__(self, kind: str):
+		self.id = uuid.uuid4().hex
+		self.kind = kind
+		self.status = QUEUED
+		self.progress = 0.0
+		self.message = None
+		self.partial = None  # intermediate output, e.g. todo sections streamed so far
+		self.result = None
+		self.error = None
+		self.created_at = time.time()
+		self.finished_at = None
+		self._task = None
+
+	def update(self, progress: float = None, message: str = None, partial: Any = None):
+		if progress is not None:
+			self.progress = min(1.0, max(self.progress, progress))
+		if message is not None:
+			self.message = message
+		if partial is not None:
+			self.partial = partial
+
+	def to_dict(self) -> Dict[str, Any]:
+		return {
+			"id": self.id,
+			"kind": self.kind,
+			"status": self.status,
+			"progress": round(self.progress, 3),
+			"message": self.message,
+			"partial": self.partial,
+			"error": self.error,
+			"created_at": self.created_at,
+			"finished_at": self.finished_at,
+		}
+
+
+class JobService:
+	"""In-process job registry running each job as an asyncio task on the server's event loop"""
+
+	def __init__(self):
+		self._jobs: Dict[str, Job] = {}
+
+	def submit(self, kind: str, run: Callable[[Job], Awaitable[Any]]) -> Job:
+		"""Start run(job) in the background and return the job right away"""
+		self._cleanup()
+		job = Job(kind)
+		self._jobs[job.id] = job
+		job._task = asyncio.create_task(self._run(job, run))
+		job._task.add_done_callback(lambda task: self._mark_cancelled(job, task))
+		return job
+
+	@staticmethod
+	def _mark_cancelled(job: Job, task: asyncio.Task):
+		# A task cancelled before it started never runs _run, so it would stay queued forever
+		if task.cancelled() and job.status not in FINISHED_STATES:
+			job.status = CANCELLED
+			job.finished_at = time.time()
+
+	async def _run(self, job: Job, run: Callable[[Job], Awaitable[Any]]):
+		job.status = RUNNING
+		try:
+			job.result = await run(job)
+			job.status = SUCCEEDED
+			job.progress = 1.0
+		except asyncio.CancelledError:
+			job.status = CANCELLED
+		except Exception as e:
+			print(f"Job {job.id} ({job.kind}) failed: {str(e)}")
+			job.status = FAILED
+			job.error = str(e)
+		finally:
+			job.finished_at = time.time()
+
+	def get(self, job_id: str) -> Job:
+		job = self._jobs.get(job_id)
+		if job is None:
+			raise KeyError(f"Job {job_id} not found")
+		return job
+
+	def cancel(self, job_id: str) -> Job:
+		"""Cancel a queued or running job; work already handed to a thread finishes but its result is dropped"""
+		job = self.get(job_id)
+		if job.status not in FINISHED_STATES and job._task is not None:
+			job._task.cancel()
+		return job
+
+	def _cleanup(self):
+		now = time.time()
+		for job_id in [j.id for j in self._jobs.values() if j.finished_at and now - j.finished_at > JOB_RESULT_TTL]:
+			del self._jobs[job_id]
+
+
+jobs = JobService()
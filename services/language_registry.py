@@ -0,0 +1,431 @@
+import importlib
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from tree_sitter import Language, Query, QueryCursor
+
+# Declarations reported per node type. PHP, JS and TS declarations sit within a few levels of the program, where
+# walking the few statements in Python is several times cheaper than a native query pass over the file.
+PHP_DECLARATIONS = {
+	"class_declaration": "class",
+	"interface_declaration": "interface",
+	"trait_declaration": "trait",
+	"enum_declaration": "enum",
+}
+JS_DECLARATIONS = {
+	"class_declaration": "class",
+	"function_declaration": "function",
+	"generator_function_declaration": "function",
+}
+TS_DECLARATIONS = {
+	**JS_DECLARATIONS,
+	"abstract_class_declaration": "class",
+	"interface_declaration": "interface",
+}
+# PHP statements that never hold a declaration, not worth descending into
+_PHP_LEAF_STATEMENTS = {
+	"php_tag", "text", "comment", "namespace_use_declaration", "expression_statement", "echo_statement",
+	"return_statement", "const_declaration", "name", "namespace_name",
+}
+# const/let/var bindings of these count as functions
+_JS_FUNCTION_VALUES = ("arrow_function", "function_expression")
+
+# Dependency queries: @namespace, whole @use declarations, @reference for classes named in extends/implements/trait use,
+# and @source for module specifiers or included paths
+PHP_IMPORT_QUERY = """
+(namespace_definition name: (_) @namespace)
+(namespace_use_declaration) @use
+(base_clause [(name) (qualified_name)] @reference)
+(class_interface_clause [(name) (qualified_name)] @reference)
+(declaration_list (use_declaration [(name) (qualified_name)] @reference))
+""" + "".join(
+	f"({kind} [(_ (string_content) @source) (binary_expression (_ (string_content) @source))])\n"
+	for kind in ("include_expression", "include_once_expression", "require_expression", "require_once_expression")
+)
+
+JS_IMPORT_QUERY = """
+(import_statement source: (string (string_fragment) @source))
+(export_statement source: (string (string_fragment) @source))
+(call_expression function: (identifier) @_require (#eq? @_require "require") arguments: (arguments . (string (string_fragment) @source)))
+(call_expression function: (import) arguments: (arguments . (string (string_fragment) @source)))
+"""
+
+TS_IMPORT_QUERY = JS_IMPORT_QUERY + """
+(import_require_clause source: (string (string_fragment) @source))
+"""
+
+SYMBOL_KINDS = ("class", "interface", "trait", "enum", "function")
+
+# Declarations sit at most at program > namespace/if block > body; deeper nodes (method bodies) are never searched
+SYMBOL_QUERY_DEPTH = 3
+# Imports sit one level deeper at most (e.g. const x = require() or a use inside a namespace block)
+IMPORT_QUERY_DEPTH = 4
+
+
+def _node_text(node) -> str:
+	return node.text.decode("utf8", errors="replace")
+
+
+def _text_reader(root) -> Callable[[Any], str]:
+	"""text(node) for the nodes of one tree, sliced from its source read once: cheaper than node.text per member"""
+	source = root.text
+	offset = root.start_byte  # the root starts at the first token, not at byte 0
+	if source.isascii():
+		# Byte offsets are character offsets: slice the decoded source, nothing left to decode per node
+		code = source.decode("ascii")
+
+		def text(node) -> str:
+			return code[node.start_byte - offset:node.end_byte - offset]
+	else:
+		def text(node) -> str:
+			return source[node.start_byte - offset:node.end_byte - offset].decode("utf8", errors="replace")
+	return text
+
+
+def _last_text(text: Callable[[Any], str], nodes) -> Optional[str]:
+	return text(nodes[-1]) if nodes else None
+
+
+def _annotated_type(text: Callable[[Any], str], annotation) -> Optional[str]:
+	"""The type written after ':' in a TS type_annotation (asserts/predicate annotations have none)"""
+	if annotation is None or annotation.type != "type_annotation" or not annotation.named_children:
+		return None
+	return text(annotation.named_children[0])
+
+
+def php_declarations(root) -> Iterator[Tuple[str, Any]]:
+	"""(kind, node) of a PHP file's class-likes down to SYMBOL_QUERY_DEPTH levels (namespace and if blocks, function
+	bodies) and of its functions at the top of the file or of a namespace block"""
+	stack = [(root, 0, True)]  # (node, depth, whether functions among its children are declarations)
+	while stack:
+		node, depth, holds_functions = stack.pop()
+		for child in node.children:
+			node_type = child.type
+			kind = PHP_DECLARATIONS.get(node_type)
+			if kind is not None:
+				# Class bodies hold members, never declarations
+				yield kind, child
+				continue
+			if node_type == "function_definition" and holds_functions:
+				yield "function", child
+			if depth + 1 >= SYMBOL_QUERY_DEPTH or node_type in _PHP_LEAF_STATEMENTS:
+				continue
+			if node_type == "namespace_definition":
+				body = child.child_by_field_name("body")
+				if body is not None:
+					stack.append((body, depth + 2, True))
+			else:
+				stack.append((child, depth + 1, False))
+
+
+def _js_declaration(node, kinds: Dict[str, str]) -> Iterator[Tuple[str, Any]]:
+	kind = kinds.get(node.type)
+	if kind is not None:
+		yield kind, node
+	elif node.type in ("lexical_declaration", "variable_declaration"):
+		for declarator in node.named_children:
+			if declarator.type != "variable_declarator":
+				continue
+			name = declarator.child_by_field_name("name")
+			value = declarator.child_by_field_name("value")
+			if name is not None and name.type == "identifier" and value is not None and value.type in _JS_FUNCTION_VALUES:
+				yield "function", declarator
+
+
+def js_declarations(root, kinds: Dict[str, str] = JS_DECLARATIONS) -> Iterator[Tuple[str, Any]]:
+	"""(kind, node) of the declarations at the top of a JS module, exported or not; a binding to a function is a function"""
+	for node in root.children:
+		if node.type != "export_statement":
+			yield from _js_declaration(node, kinds)
+			continue
+		for child in node.named_children:
+			if child.type == "class":
+				# export default class Name {}
+				yield "class", child
+			else:
+				yield from _js_declaration(child, kinds)
+
+
+def ts_declarations(root) -> Iterator[Tuple[str, Any]]:
+	return js_declarations(root, TS_DECLARATIONS)
+
+
+def php_members(declaration, symbol: Dict[str, Any], text: Callable[[Any], str]):
+	"""Parent, properties (constructor promotions included) and methods of a PHP class, interface, trait or enum"""
+	for child in declaration.children:
+		if child.type == "base_clause":
+			# The last parent wins, e.g. for interfaces extending several
+			symbol["extends"] = _last_text(text, [c for c in child.named_children if c.type in ("name", "qualified_name")]) or symbol["extends"]
+	body = declaration.child_by_field_name("body")
+	if body is None:
+		return
+	# Enum bodies hold cases and methods, only class-like bodies have properties
+	has_properties = body.type == "declaration_list"
+	for member in body.named_children:
+		if member.type == "method_declaration":
+			name = text(member.child_by_field_name("name"))
+			if has_properties and name == "__construct":
+				for parameter in member.child_by_field_name("parameters").named_children:
+					if parameter.type == "property_promotion_parameter":
+						symbol["properties"].append(text(parameter.child_by_field_name("name")))
+			returns = member.child_by_field_name("return_type")
+			symbol["methods"].append({"name": name, "return": text(returns) if returns is not None else None})
+		elif has_properties and member.type == "property_declaration":
+			for element in member.named_children:
+				if element.type == "property_element":
+					symbol["properties"].append(text(element.child_by_field_name("name")))
+
+
+def js_members(declaration, symbol: Dict[str, Any], text: Callable[[Any], str]):
+	"""Parent, fields and methods of a JS class"""
+	for child in declaration.children:
+		if child.type == "class_heritage":
+			symbol["extends"] = _last_text(text, [c for c in child.named_children if c.type in ("identifier", "member_expression")]) or symbol["extends"]
+	body = declaration.child_by_field_name("body")
+	if body is None or body.type != "class_body":
+		return
+	for member in body.named_children:
+		if member.type == "field_definition":
+			prop = member.child_by_field_name("property")
+			if prop is not None:
+				symbol["properties"].append(text(prop))
+		elif member.type == "method_definition":
+			symbol["methods"].append({"name": text(member.child_by_field_name("name")), "return": None})
+
+
+def ts_members(declaration, symbol: Dict[str, Any], text: Callable[[Any], str]):
+	"""Parent, typed properties and methods of a TS class or interface"""
+	for child in declaration.children:
+		if child.type == "class_heritage":
+			for clause in child.named_children:
+				if clause.type == "extends_clause":
+					symbol["extends"] = _last_text(text, clause.children_by_field_name("value")) or symbol["extends"]
+		elif child.type == "extends_type_clause" and declaration.type == "interface_declaration":
+			symbol["extends"] = _last_text(text, child.children_by_field_name("type")) or symbol["extends"]
+	body = declaration.child_by_field_name("body")
+	if body is None:
+		return
+	if body.type == "class_body":
+		property_types, method_types = ("public_field_definition",), ("method_definition", "abstract_method_signature")
+	elif body.type == "interface_body":
+		property_types, method_types = ("property_signature",), ("method_signature",)
+	else:
+		return
+	for member in body.named_children:
+		if member.type in property_types:
+			prop = text(member.child_by_field_name("name"))
+			prop_type = _annotated_type(text, member.child_by_field_name("type"))
+			symbol["properties"].append(f"{prop}: {prop_type}" if prop_type else prop)
+		elif member.type in method_types:
+			symbol["methods"].append({
+				"name": text(member.child_by_field_name("name")),
+				"return": _annotated_type(text, member.child_by_field_name("return_type")),
+			})
+
+
+def _symbol(kind: str, node, name: str, members: Optional[Callable], text: Callable[[Any], str]) -> Dict[str, Any]:
+	if kind == "function":
+		return {"class": name, "methods": [], "type": kind}
+	symbol = {"class": name, "extends": None, "properties": [], "methods": [], "type": kind}
+	if members is not None:
+		members(node, symbol, text)
+	return symbol
+
+
+def declaration_symbols(root, declarations: Callable[[Any], Iterable[Tuple[str, Any]]],
+		members: Optional[Callable[[Any, Dict[str, Any], Callable], None]] = None) -> List[Dict[str, Any]]:
+	"""Symbols of the declarations a finder reports, in source order, with the members of each read from its body"""
+	text = _text_reader(root)
+	symbols = []
+	for kind, node in declarations(root):
+		name = node.child_by_field_name("name")
+		if name is not None:
+			symbols.append((node.start_byte, _symbol(kind, node, text(name), members, text)))
+	symbols.sort(key=lambda s: s[0])
+	return [symbol for _, symbol in symbols]
+
+
+def query_symbols(query: Query, root, members: Optional[Callable[[Any, Dict[str, Any], Callable], None]] = None,
+		depth: int = SYMBOL_QUERY_DEPTH) -> List[Dict[str, Any]]:
+	"""Symbols of the declarations a query captures as @class/@interface/@trait/@enum/@function with their @name"""
+	declarations = {}  # {node id: (start byte, symbol)}
+	text = _text_reader(root)
+	cursor = QueryCursor(query)
+	cursor.set_max_start_depth(depth)
+	for _, captures in cursor.matches(root):
+		kind = next(k for k in SYMBOL_KINDS if k in captures)
+		node = captures[kind][0]
+		if node.id not in declarations:
+			declarations[node.id] = (node.start_byte, _symbol(kind, node, text(captures["name"][0]), members, text))
+	return [symbol for _, symbol in sorted(declarations.values(), key=lambda d: d[0])]
+
+
+def _php_name(name: str) -> str:
+	return name.strip().lstrip("\\")
+
+
+def _php_uses(declaration) -> List[Tuple[str, str]]:
+	"""(alias, fully qualified name) of each clause of a use declaration, group uses included"""
+	prefix = ""
+	clauses = []
+	for child in declaration.named_children:
+		if child.type == "namespace_name":
+			prefix = _php_name(_node_text(child)) + "\\"
+		elif child.type == "namespace_use_clause":
+			clauses.append(child)
+		elif child.type == "namespace_use_group":
+			clauses.extend(c for c in child.named_children if c.type == "namespace_use_clause")
+	uses = []
+	for clause in clauses:
+		names = [c for c in clause.named_children if c.type in ("name", "qualified_name")]
+		if not names:
+			continue
+		alias = clause.child_by_field_name("alias")
+		full_name = prefix + _php_name(_node_text(names[0]))
+		uses.append((_node_text(alias) if alias is not None else full_name.rsplit("\\", 1)[-1], full_name))
+	return uses
+
+
+def query_imports(query: Query, root) -> Tuple[Optional[str], List[str]]:
+	"""(namespace, dependencies) of a tree: used and referenced classes as fully qualified names, module specifiers
+	as written, included files as ./relative paths"""
+	namespace = None
+	aliases = {}
+	references = []
+	imports = []
+	cursor = QueryCursor(query)
+	cursor.set_max_start_depth(IMPORT_QUERY_DEPTH)
+	for _, captures in cursor.matches(root):
+		if "namespace" in captures:
+			namespace = _php_name(_node_text(captures["namespace"][0]))
+		elif "use" in captures:
+			for alias, full_name in _php_uses(captures["use"][0]):
+				aliases[alias.lower()] = full_name
+				imports.append(full_name)
+		elif "reference" in captures:
+			references.append(_node_text(captures["reference"][0]))
+		else:
+			source = _node_text(captures["source"][0])
+			imports.append("./" + source.lstrip("/") if source.endswith(".php") else source)
+
+	# Names resolve like PHP does: fully qualified, through a use alias, or else in the file's namespace
+	for name in references:
+		if name.startswith("\\"):
+			imports.append(_php_name(name))
+			continue
+		first, _, rest = name.partition("\\")
+		if first.lower() in aliases:
+			imports.append(aliases[first.lower()] + ("\\" + rest if rest else ""))
+		else:
+			imports.append(f"{namespace}\\{name}" if namespace else name)
+	return namespace, list(dict.fromkeys(imports))
+
+
+class LanguageSpec:
+	"""A registered language: its grammar, loaded on first use, and how to extract symbols from its trees"""
+
+	def __init__(self, name: str, extensions: Iterable[str], module: str, function: str = "language",
+			symbol_query: Optional[str] = None, extractor: Optional[Callable[[Any], List[Dict[str, Any]]]] = None,
+			import_query: Optional[str] = None, members: Optional[Callable[[Any, Dict[str, Any], Callable], None]] = None,
+			symbol_depth: int = SYMBOL_QUERY_DEPTH, declarations: Optional[Callable[[Any], Iterable[Tuple[str, Any]]]] = None):
+		if symbol_query is None and extractor is None and declarations is None:
+			raise ValueError(f"Language {name} needs a symbol query, a declaration finder or an extractor")
+		self.name = name
+		self.extensions = tuple(extensions)
+		self.module = module
+		self.function = function
+		self.symbol_query = symbol_query
+		self.extractor = extractor
+		self.import_query = import_query
+		self.members = members
+		self.symbol_depth = symbol_depth
+		self.declarations = declarations
+		self._language = None
+		self._query = None
+		self._import_query = None
+		self._lock = threading.RLock()
+
+	@property
+	def language(self) -> Language:
+		"""The grammar, imported the first time a file of this language is parsed"""
+		if self._language is None:
+			with self._lock:
+				if self._language is None:
+					grammar = getattr(importlib.import_module(self.module), self.function)
+					self._language = Language(grammar())
+		return self._language
+
+	@property
+	def query(self) -> Query:
+		if self._query is None:
+			with self._lock:
+				if self._query is None:
+					self._query = Query(self.language, self.symbol_query)
+		return self._query
+
+	def extract(self, root) -> List[Dict[str, Any]]:
+		"""Symbols of a parsed tree as [{"class", "type", "extends", "properties", "methods"}]"""
+		if self.extractor is not None:
+			return self.extractor(root)
+		if self.declarations is not None:
+			return declaration_symbols(root, self.declarations, self.members)
+		return query_symbols(self.query, root, self.members, self.symbol_depth)
+
+	def imports(self, root) -> Tuple[Optional[str], List[str]]:
+		"""(namespace, dependencies) of a parsed tree; languages without an import query have none"""
+		if self.import_query is None:
+			return None, []
+		if self._import_query is None:
+			with self._lock:
+				if self._import_query is None:
+					self._import_query = Query(self.language, self.import_query)
+		return query_imports(self._import_query, root)
+
+
+class LanguageRegistry:
+	"""Maps file extensions to languages; a grammar is only imported once a project contains its files"""
+
+	def __init__(self):
+		self._specs = {}  # {name: LanguageSpec}
+		self._suffixes = {}  # {".ext": name}
+
+	def register(self, name: str, extensions: Iterable[str], module: str, function: str = "language",
+			symbol_query: Optional[str] = None, extractor: Optional[Callable] = None, import_query: Optional[str] = None,
+			members: Optional[Callable] = None, symbol_depth: int = SYMBOL_QUERY_DEPTH,
+			declarations: Optional[Callable] = None) -> LanguageSpec:
+		"""Add (or replace) a language.
+
+		module/function name the grammar package and the function returning its language pointer,
+		e.g. ("tree_sitter_python", "language"). Declarations are found by declarations(root), yielding (kind, node), or else
+		by symbol_query, matched from nodes at most symbol_depth deep; members(declaration node, symbol, text) then fills
+		in what each declaration holds. Bump EXTRACTOR_VERSION when a finder, query or member reader changes existing output.
+		"""
+		spec = LanguageSpec(name, extensions, module, function, symbol_query, extractor, import_query, members, symbol_depth, declarations)
+		self._specs[name] = spec
+		for extension in spec.extensions:
+			self._suffixes[extension] = name
+		return spec
+
+	def __contains__(self, name: str) -> bool:
+		return name in self._specs
+
+	def __getitem__(self, name: str) -> LanguageSpec:
+		return self._specs[name]
+
+	def for_suffix(self, suffix: str) -> Optional[str]:
+		return self._suffixes.get(suffix)
+
+	def loaded(self) -> List[str]:
+		"""Names of the languages whose grammar has been imported in this process"""
+		return [name for name, spec in self._specs.items() if spec._language is not None]
+
+
+languages = LanguageRegistry()
+languages.register("php", [".php"], "tree_sitter_php", "language_php",
+	declarations=php_declarations, members=php_members, import_query=PHP_IMPORT_QUERY)
+languages.register("js", [".js", ".jsx"], "tree_sitter_javascript",
+	declarations=js_declarations, members=js_members, import_query=JS_IMPORT_QUERY)
+languages.register("ts", [".ts"], "tree_sitter_typescript", "language_typescript",
+	declarations=ts_declarations, members=ts_members, import_query=TS_IMPORT_QUERY)
+languages.register("tsx", [".tsx"], "tree_sitter_typescript", "language_tsx",
+	declarations=ts_declarations, members=ts_members, import_query=TS_IMPORT_QUERY)
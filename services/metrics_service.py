@@ -0,0 +1,120 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+# Histogram buckets (seconds) for stage durations, from a cached lookup to a long completion
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+METRIC_HELP = {
+	"pipeline_stage_seconds": "Time spent per pipeline stage",
+	"upload_bytes_total": "Bytes received in project uploads",
+	"upload_store_blobs_total": "Uploaded archives, by whether the upload store already had them (new or existing)",
+	"parser_files_total": "Files handled by ParserService, by source (parsed or cache)",
+	"parser_bytes_total": "Source bytes handled by ParserService",
+	"openai_requests_total": "Completions requested, by whether the response cache served them",
+	"openai_tokens_total": "Tokens reported by the OpenAI API, by kind (prompt or completion)",
+}
+
+# Spans recorded while handling the current request, for its Server-Timing header
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+
+
+def _labels_key(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+	return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+	pairs = labels + extra
+	if not pairs:
+		return ""
+	escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+	return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+class MetricsService:
+	"""Process-wide counters and stage timings, rendered in the Prometheus text format"""
+
+	def __init__(self):
+		self._counters = {}  # {(name, labels): value}
+		self._histograms = {}  # {(name, labels): [bucket counts..., sum, count]}
+		self._lock = threading.Lock()
+
+	def count(self, name: str, value: float = 1, **labels):
+		key = (name, _labels_key(labels))
+		with self._lock:
+			self._counters[key] = self._counters.get(key, 0) + value
+
+	def observe(self, name: str, seconds: float, **labels):
+		key = (name, _labels_key(labels))
+		with self._lock:
+			histogram = self._histograms.get(key)
+			if histogram is None:
+				histogram = self._histograms[key] = [0] * len(DURATION_BUCKETS) + [0.0, 0]
+			for i, bound in enumerate(DURATION_BUCKETS):
+				if seconds <= bound:
+					histogram[i] += 1
+			histogram[-2] += seconds
+			histogram[-1] += 1
+
+	@contextmanager
+	def span(self, stage: str):
+		"""Time a pipeline stage; works around sync code and awaits alike"""
+		started = time.perf_counter()
+		try:
+			yield
+		finally:
+			seconds = time.perf_counter() - started
+			self.observe("pipeline_stage_seconds", seconds, stage=stage)
+			timings = _request_timings.get()
+			if timings is not None:
+				timings.append((stage, seconds))
+
+	def render(self) -> str:
+		with self._lock:
+			counters = sorted(self._counters.items())
+			histograms = sorted((k, list(v)) for k, v in self._histograms.items())
+
+		lines = []
+		described = set()
+
+		def describe(name: str, kind: str):
+			if name not in described:
+				described.add(name)
+				if name in METRIC_HELP:
+					lines.append(f"# HELP {name} {METRIC_HELP[name]}")
+				lines.append(f"# TYPE {name} {kind}")
+
+		for (name, labels), value in counters:
+			describe(name, "counter")
+			lines.append(f"{name}{_format_labels(labels)} {value}")
+		for (name, labels), histogram in histograms:
+			describe(name, "histogram")
+			for bound, bucket in zip(DURATION_BUCKETS, histogram):
+				lines.append(f"{name}_bucket{_format_labels(labels, (('le', str(bound)),))} {bucket}")
+			lines.append(f"{name}_bucket{_format_labels(labels, (('le', '+Inf'),))} {histogram[-1]}")
+			lines.append(f"{name}_sum{_format_labels(labels)} {histogram[-2]:.6f}")
+			lines.append(f"{name}_count{_format_labels(labels)} {histogram[-1]}")
+		return "\n".join(lines) + "\n"
+
+
+def start_request_timings() -> List[Tuple[str, float]]:
+	"""Collect the spans of the current request (and of the tasks and threads it starts)"""
+	timings = []
+	_request_timings.set(timings)
+	return timings
+
+
+def server_timing_header(timings: List[Tuple[str, float]], total: Optional[float] = None) -> str:
+	"""Server-Timing value with one entry per stage; repeated stages (e.g. map-reduce calls) are summed"""
+	stages = {}
+	for stage, seconds in timings:
+		stages[stage] = stages.get(stage, 0.0) + seconds
+	entries = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in stages.items()]
+	if total is not None:
+		entries.append(f"total;dur={total * 1000:.1f}")
+	return ", ".join(entries)
+
+
+metrics = MetricsService()
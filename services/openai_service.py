@@ -1,34 +1,234 @@
+import asyncio
+import json
 import os
-from openai import OpenAI
+from typing import AsyncIterator, List
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from DTO.Responses.open_ai_response import OpenAiResponse
 from prompts.prompts import Prompt
 from DTO.Requests.todo_list_request import TodoListRequest
+from services.metrics_service import metrics
+from services.project_summary_service import truncate_summary
+from services.symbol_index_service import split_terms
+from services.response_cache_service import ResponseCacheService, get_response_cache
 from utils.json_schemas import JsonSchema
+from utils.transcript_splitter import split_transcript
+
+OPENAI_MODEL = os.environ.get("OPENAI_MODEL", "gpt-4o-mini")
+# Completions allowed in flight per process; extra requests wait instead of piling onto the API
+OPENAI_MAX_CONCURRENCY = int(os.environ.get("OPENAI_MAX_CONCURRENCY", 16))
+OPENAI_MAX_CONNECTIONS = int(os.environ.get("OPENAI_MAX_CONNECTIONS", 32))
+OPENAI_TIMEOUT = float(os.environ.get("OPENAI_TIMEOUT", 120))
+
+# Transcripts longer than this (characters) go through map-reduce unless the request says otherwise
+MAP_REDUCE_THRESHOLD = int(os.environ.get("MAP_REDUCE_THRESHOLD", 40_000))
+MAP_REDUCE_CHUNK_CHARS = int(os.environ.get("MAP_REDUCE_CHUNK_CHARS", 12_000))
+MAP_REDUCE_CONCURRENCY = int(os.environ.get("MAP_REDUCE_CONCURRENCY", 8))
+# Each chunk only sees a short excerpt of the project summary; the final call gets all of it
+MAP_PROJECT_TOKEN_BUDGET = int(os.environ.get("MAP_PROJECT_TOKEN_BUDGET", 4_000))
+
+SYSTEM_PROMPT = "You are a helpful assistant that summarizes meeting transcripts into actionable to-do lists."
+
+_client = None
+_semaphore = None
+
+
+def get_client() -> AsyncOpenAI:
+	"""Process-wide async client sharing one pooled HTTP connection pool"""
+	global _client
+	if _client is None:
+		_client = AsyncOpenAI(
+			api_key=os.environ.get("OPENAI_API_KEY"),
+			timeout=OPENAI_TIMEOUT,
+			http_client=DefaultAsyncHttpxClient(
+				limits=httpx.Limits(
+					max_connections=OPENAI_MAX_CONNECTIONS,
+					max_keepalive_connections=OPENAI_MAX_CONNECTIONS,
+				)
+			),
+		)
+	return _client
+
+
+async def close_client():
+	global _client
+	if _client is not None:
+		await _client.close()
+		_client = None
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+	global _semaphore
+	if _semaphore is None:
+		_semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+	return _semaphore
+
+
+def _record_usage(model: str, usage):
+	if usage is None:
+		return
+	metrics.count("openai_tokens_total", usage.prompt_tokens or 0, model=model, kind="prompt")
+	metrics.count("openai_tokens_total", usage.completion_tokens or 0, model=model, kind="completion")
 
 
 class OpenAiService:
-	def __init__(self):
-		self.client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+	def __init__(self, client: AsyncOpenAI = None, cache: ResponseCacheService = None):
+		self.client = client or get_client()
+		self.cache = cache if cache is not None else get_response_cache()
+
+	async def _cached(self, key: str, bypass_cache: bool = False):
+		"""Cached content for the key; SQLite is read off the event loop"""
+		if self.cache is None or bypass_cache:
+			return None
+		return await asyncio.to_thread(self.cache.get, key)
+
+	async def _store(self, key: str, content: str):
+		if self.cache is not None:
+			await asyncio.to_thread(self.cache.put, key, content)
+
+	@staticmethod
+	def _completion_args(Request: TodoListRequest) -> dict:
+		return {
+			"model": OPENAI_MODEL,
+			"messages": [
+				{
+					"role": "system",
+					"content": SYSTEM_PROMPT
+				},
+				{
+					"role": "user", "content": Prompt.transcript_to_technical_todo_prompt(Request)
+				}
+			],
+			"response_format": {
+				"type": "json_schema",
+				"json_schema": JsonSchema.technical_todo_schema()
+			}
+		}
+
+	async def _complete(self, args: dict, bypass_cache: bool = False) -> str:
+		"""Run one completion (or serve it from the cache) and return the message content"""
+		key = ResponseCacheService.key(args)
+		cached = await self._cached(key, bypass_cache)
+		if cached is not None:
+			metrics.count("openai_requests_total", model=args["model"], cached="true")
+			return cached
+		metrics.count("openai_requests_total", model=args["model"], cached="false")
+		async with _get_semaphore():
+			with metrics.span("openai"):
+				completion = await self.client.chat.completions.create(**args)
+		_record_usage(args["model"], getattr(completion, "usage", None))
+		content = completion.choices[0].message.content
+		await self._store(key, content)
+		return content
 
-	def transcript_to_technical_todo(self, Request: TodoListRequest) -> OpenAiResponse:
+	async def transcript_to_technical_todo(self, Request: TodoListRequest) -> OpenAiResponse:
 		try:
-			return OpenAiResponse(self.client.chat.completions.create(
-				model="gpt-4o-mini",
-				messages=[
-					{
-						"role": "system",
-						"content": "You are a helpful assistant that summarizes meeting transcripts into actionable to-do lists."
-					},
-					{
-						"role": "user", "content": Prompt.transcript_to_technical_todo_prompt(Request)
-					}
-				],
-				response_format={
-					"type": "json_schema",
-					"json_schema": JsonSchema.technical_todo_schema()
-					}
-				)
-			)
+			Request = await self._condense_if_long(Request)
+			return OpenAiResponse(content=await self._complete(self._completion_args(Request), Request.bypass_cache))
 		except Exception as e:
 			print(f"OpenAI API Error: {str(e)}")
 			raise
+
+	async def stream_transcript_to_technical_todo(self, Request: TodoListRequest) -> AsyncIterator[str]:
+		"""Yield the raw JSON content of the completion as tokens arrive"""
+		try:
+			Request = await self._condense_if_long(Request)
+			args = self._completion_args(Request)
+			key = ResponseCacheService.key(args)
+			cached = await self._cached(key, Request.bypass_cache)
+			if cached is not None:
+				metrics.count("openai_requests_total", model=args["model"], cached="true")
+				yield cached
+				return
+			metrics.count("openai_requests_total", model=args["model"], cached="false")
+			parts = []
+			async with _get_semaphore():
+				with metrics.span("openai"):
+					# The last chunk then carries the token usage, with no choices
+					stream = await self.client.chat.completions.create(stream=True, stream_options={"include_usage": True}, **args)
+					async for chunk in stream:
+						if chunk.choices and chunk.choices[0].delta.content:
+							parts.append(chunk.choices[0].delta.content)
+							yield chunk.choices[0].delta.content
+						if getattr(chunk, "usage", None) is not None:
+							_record_usage(args["model"], chunk.usage)
+			await self._store(key, "".join(parts))
+		except Exception as e:
+			print(f"OpenAI API Error: {str(e)}")
+			raise
+
+	async def _condense_if_long(self, Request: TodoListRequest) -> TodoListRequest:
+		"""Map-reduce long transcripts: extract tasks per chunk concurrently, then hand the merged notes to the final prompt"""
+		use_map_reduce = Request.map_reduce
+		if use_map_reduce is None:
+			use_map_reduce = len(Request.transcript) > MAP_REDUCE_THRESHOLD
+		if not use_map_reduce:
+			return Request
+
+		chunks = split_transcript(Request.transcript, MAP_REDUCE_CHUNK_CHARS)
+		if len(chunks) < 2:
+			return Request
+		project_excerpt = truncate_summary(Request.parsed_project, MAP_PROJECT_TOKEN_BUDGET)
+		limit = asyncio.Semaphore(MAP_REDUCE_CONCURRENCY)
+
+		async def extract(index: int, chunk: str) -> dict:
+			async with limit:
+				content = await self._complete({
+					"model": OPENAI_MODEL,
+					"messages": [
+						{"role": "system", "content": SYSTEM_PROMPT},
+						{"role": "user", "content": Prompt.transcript_chunk_to_tasks_prompt(project_excerpt, chunk, index, len(chunks))}
+					],
+					"response_format": {
+						"type": "json_schema",
+						"json_schema": JsonSchema.chunk_tasks_schema()
+					}
+				}, Request.bypass_cache)
+			return json.loads(content)
+
+		# Chunks run concurrently, so the map step takes as long as the slowest one
+		results = await asyncio.gather(*(extract(i + 1, chunk) for i, chunk in enumerate(chunks)))
+		return Request.model_copy(update={"transcript": self._merge_chunk_results(results), "map_reduce": False})
+
+	@staticmethod
+	def _merge_chunk_results(results: List[dict]) -> str:
+		"""Render per-chunk summaries, deduplicated candidate tasks and open questions as condensed meeting notes"""
+		tasks = []  # [(terms, task)]
+		for result in results:
+			for task in result.get("taches", []):
+				terms = set(split_terms(task["titre"]))
+				duplicate = next((t for t_terms, t in tasks if _similar(terms, t_terms)), None)
+				if duplicate is None:
+					tasks.append((terms, {"titre": task["titre"], "details": [task["details"]], "fichiers": list(task["fichiers"])}))
+				else:
+					duplicate["details"].append(task["details"])
+					duplicate["fichiers"].extend(f for f in task["fichiers"] if f not in duplicate["fichiers"])
+
+		questions = []
+		for result in results:
+			for question in result.get("questions", []):
+				if question not in questions:
+					questions.append(question)
+
+		lines = ["Notes de réunion consolidées (transcript long traité par parties).", ""]
+		for index, result in enumerate(results, start=1):
+			lines.append(f"## Résumé de la partie {index}/{len(results)}")
+			lines.append(result.get("resume", ""))
+			lines.append("")
+		lines.append("## Tâches évoquées")
+		for _, task in tasks:
+			files = f" (fichiers : {', '.join(task['fichiers'])})" if task["fichiers"] else ""
+			lines.append(f"- {task['titre']}{files} — {' / '.join(d for d in task['details'] if d)}")
+		if questions:
+			lines.append("")
+			lines.append("## Questions soulevées")
+			lines.extend(f"- {q}" for q in questions)
+		return "\n".join(lines)
+
+
+def _similar(a: set, b: set) -> bool:
+	"""Titles sharing most of their terms describe the same task"""
+	if not a or not b:
+		return a == b
+	return len(a & b) / len(a | b) >= 0.7
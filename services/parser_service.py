@@ -1,15 +1,25 @@
-from pathlib import Path
-from typing import Dict, Any
-
-import tree_sitter_php as tsphp
-import tree_sitter_javascript as tsjs
-import tree_sitter_typescript as tsts
-from tree_sitter import Language, Parser
-
-PHP_LANGUAGE = Language(tsphp.language_php())
-JS_LANGUAGE = Language(tsjs.language())
-TS_LANGUAGE = Language(tsts.language_typescript())
-TSX_LANGUAGE = Language(tsts.language_tsx())
+import io
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain, islice
+from pathlib import Path, PurePosixPath
+from typing import Dict, Any, Iterable, Iterator, List, Tuple
+
+from tree_sitter import Parser
+
+from services.analysis_artifact_service import AnalysisArtifact, is_artifact, write_artifact
+from services.dependency_graph_service import DependencyGraph
+from services.language_registry import languages
+from services.metrics_service import metrics
+from models.symbol_record import FileSymbols
+from services.symbol_cache_service import SymbolCacheService, content_hash, symbol_key
+from services.symbol_index_service import SymbolIndex
+from utils.project_scanner import ExcludedDirs, ProjectScanner
+
 EXCLUDED_DIRS = [
 	'vendor',
 	'node_modules',
@@ -27,335 +37,632 @@ EXCLUDED_DIRS = [
 
 EXCLUDED_EXTENSIONS = ('.blade.php',)
 
+# Bump whenever extraction output changes so cached symbols get invalidated
+EXTRACTOR_VERSION = "3"
+
+# Parallel parsing settings, overridable per ParserService instance; parsing is serial unless workers are asked for
+PARSER_WORKERS = int(os.environ.get("PARSER_WORKERS", 1))
+PARSER_CHUNK_SIZE = int(os.environ.get("PARSER_CHUNK_SIZE", 64))
+
+# One Parser per language, created lazily in each process
+_PARSERS = {}
+_WORKER_SERVICE = None
+
+# Worker pools kept for the life of the process, one per worker count
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+EXCLUDED = ExcludedDirs(EXCLUDED_DIRS)
+
+# Lean mode keeps only compact symbol records: trees and sources are dropped once a file's symbols are extracted
+PARSER_LEAN = os.environ.get("PARSER_LEAN", "").lower() in ("1", "true", "yes")
+
+# Honor .gitignore files when walking project folders
+PARSER_RESPECT_GITIGNORE = os.environ.get("PARSER_RESPECT_GITIGNORE", "").lower() in ("1", "true", "yes")
+
+
+def file_language(name: str):
+	"""Return the language name for a file name, or None if it is excluded or not parsable"""
+	if name.endswith(EXCLUDED_EXTENSIONS):
+		return None
+	dot = name.rfind('.')
+	return languages.for_suffix(name[dot:]) if dot > 0 else None
+
+
+def source_language(rel_posix: str):
+	"""Return the language name for a project-relative path, or None if it is excluded or not parsable"""
+	if EXCLUDED.contains(rel_posix):
+		return None
+	return file_language(rel_posix.rsplit('/', 1)[-1])
+
+
+def zip_member_path(filename: str) -> str:
+	"""Normalise a zip member name the way ZipFile.extract does (no absolute or parent components)"""
+	parts = PurePosixPath(filename.replace("\\", "/")).parts
+	return "/".join(p for p in parts if p not in ("", "/", ".", ".."))
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[list]:
+	iterator = iter(items)
+	while True:
+		chunk = list(islice(iterator, size))
+		if not chunk:
+			return
+		yield chunk
+
+
+def _get_parser(lang_name: str) -> Parser:
+	parser = _PARSERS.get(lang_name)
+	if parser is None:
+		parser = Parser(languages[lang_name].language)
+		_PARSERS[lang_name] = parser
+	return parser
+
+
+def _diff_range(old: bytes, new: bytes) -> Tuple[int, int, int]:
+	"""Return (start, old_end, new_end) of the single byte range that differs between old and new"""
+	limit = min(len(old), len(new))
+	# Binary searches keep the comparisons in C instead of a per-byte Python loop
+	lo, hi = 0, limit
+	while lo < hi:
+		mid = (lo + hi + 1) // 2
+		if old[:mid] == new[:mid]:
+			lo = mid
+		else:
+			hi = mid - 1
+	start = lo
+	lo, hi = 0, limit - start
+	while lo < hi:
+		mid = (lo + hi + 1) // 2
+		if old[len(old) - mid:] == new[len(new) - mid:]:
+			lo = mid
+		else:
+			hi = mid - 1
+	suffix = lo
+	return start, len(old) - suffix, len(new) - suffix
+
+
+def _point_at(data: bytes, offset: int) -> Tuple[int, int]:
+	row = data.count(b"\n", 0, offset)
+	column = offset - (data.rfind(b"\n", 0, offset) + 1)
+	return row, column
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+	"""Shared pool of parser processes. They start from a fresh interpreter (forkserver, or spawn where it is missing):
+	forking the server from a request thread would copy locks other threads hold at that moment."""
+	with _POOLS_LOCK:
+		pool = _POOLS.get(workers)
+		if pool is None:
+			method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+			pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+			_POOLS[workers] = pool
+		return pool
+
+
+def _drop_pool(workers: int, pool: ProcessPoolExecutor):
+	"""Forget a pool whose worker died, so the next parse starts a new one"""
+	with _POOLS_LOCK:
+		if _POOLS.get(workers) is pool:
+			del _POOLS[workers]
+	pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _parse_chunk(folder_path: str, files: List[Tuple[str, str]]) -> List[Tuple[str, Any]]:
+	"""Parse a chunk of files in a worker process and return their symbols (None on failure)"""
+	global _WORKER_SERVICE
+	if _WORKER_SERVICE is None:
+		_WORKER_SERVICE = ParserService(workers=1)
+	if _WORKER_SERVICE.folder_path != Path(folder_path):
+		_WORKER_SERVICE._open_source(folder_path)
+	results = []
+	for rel_posix, lang_name in files:
+		tree, _ = _WORKER_SERVICE._parse_file(rel_posix, lang_name)
+		try:
+			symbols = _WORKER_SERVICE._symbols_from_tree(rel_posix, tree)
+		except Exception:
+			symbols = None
+		results.append((rel_posix, symbols))
+	return results
+
 
 class ParserService:
 	"""Service for parsing project files and extracting symbols"""
 
-	def __init__(self):
-		self._parsed_folder_tree = {}  # {relative_path: tree}
+	def __init__(self, workers: int = None, chunk_size: int = None, cache: SymbolCacheService = None, respect_gitignore: bool = None, lean: bool = None):
+		self._parsed_folder_tree = {}  # {relative_path: tree}, tree is None when parsed in a worker
 		self._file_codes = {}
-		self.folder_path = None
+		self._symbols = {}  # {relative_path: symbols dict, or FileSymbols in lean mode} extracted ahead of time
+		self._file_stats = {}  # {relative_path: (size, mtime_ns)} as of the last parse
+		self.folder_path = None  # project root folder, or the archive in zip mode
+		self._zip = None
+		self._zip_members = {}  # {relative_path: ZipInfo} in zip mode
+		self._artifact = None  # AnalysisArtifact when loaded from a prebuilt analysis
+		self.workers = workers if workers is not None else PARSER_WORKERS
+		self.chunk_size = chunk_size if chunk_size is not None else PARSER_CHUNK_SIZE
+		self.cache = cache
+		self.respect_gitignore = respect_gitignore if respect_gitignore is not None else PARSER_RESPECT_GITIGNORE
+		self.lean = lean if lean is not None else PARSER_LEAN
+		self.scan_stats = None  # ScanStats of the last folder walk
+		self._symbol_index = None
+		self._dependency_graph = None
+		self._project_summary = None
+
+	def _open_source(self, project_path: str):
+		"""Point the service at a project folder or, when given a .zip file or an analysis artifact, at that file"""
+		self.folder_path = Path(project_path).resolve()
+		if self._zip is not None:
+			self._zip.close()
+			self._zip = None
+		if self._artifact is not None:
+			self._artifact.close()
+			self._artifact = None
+		self._zip_members = {}
+		if is_artifact(self.folder_path):
+			self._artifact = AnalysisArtifact(str(self.folder_path), EXTRACTOR_VERSION)
+		elif self.folder_path.is_file() and zipfile.is_zipfile(self.folder_path):
+			self._zip = zipfile.ZipFile(self.folder_path)
+			for info in self._zip.infolist():
+				rel_posix = zip_member_path(info.filename)
+				if rel_posix and not info.is_dir():
+					self._zip_members[rel_posix] = info
+
+	def _read_bytes(self, rel_posix: str) -> bytes:
+		if self._zip is not None:
+			return self._zip.read(self._zip_members[rel_posix])
+		return (self.folder_path / rel_posix).read_bytes()
+
+	def _read_code(self, rel_posix: str) -> str:
+		if self._zip is not None:
+			# Decode the way Path.read_text does
+			return io.TextIOWrapper(io.BytesIO(self._read_bytes(rel_posix))).read()
+		return (self.folder_path / rel_posix).read_text()
 
-	def _parse_file(self, file_path, language):
-		parser = Parser()
-		parser.language = language
-		code = Path(file_path).read_text()
-		tree = parser.parse(bytes(code, "utf8"))
+	def _source_stat(self, rel_posix: str) -> Tuple[str, int, int]:
+		"""Return (cache key path, size, mtime_ns); zip members use their CRC in place of an mtime"""
+		if self._zip is not None:
+			info = self._zip_members[rel_posix]
+			return f"{self.folder_path}::{rel_posix}", info.file_size, info.CRC
+		path = self.folder_path / rel_posix
+		stat = path.stat()
+		return str(path), stat.st_size, stat.st_mtime_ns
+
+	def _parse_file(self, rel_posix: str, lang_name: str):
+		code = self._read_code(rel_posix)
+		tree = _get_parser(lang_name).parse(bytes(code, "utf8"))
 		return tree, code
 
-	def set_ast(self, project_path: str) -> Dict[str, Any]:
-		"""Parse all files in folder and store ASTs internally"""
-		self.folder_path = Path(project_path).resolve()
-		res = {}
+	def _iter_source_files(self):
+		"""Yield (relative_path, language) for every parsable file in the project"""
+		if self._zip is not None:
+			for rel_posix in self._zip_members:
+				lang_name = source_language(rel_posix)
+				if lang_name is not None:
+					yield rel_posix, lang_name
+			return
+		scanner = ProjectScanner(EXCLUDED, file_language, respect_gitignore=self.respect_gitignore)
+		self.scan_stats = scanner.stats
+		for rel_posix, lang_name in scanner.scan(str(self.folder_path)):
+			yield rel_posix, lang_name
+		self.scan_stats = scanner.stats
+
+	def set_ast(self, project_path: str, workers: int = None, chunk_size: int = None, files: Iterable = None) -> Dict[str, Any]:
+		"""Parse all files in folder and store ASTs internally.
+
+		files may be an iterable of (relative_path, language) to parse instead of walking the folder;
+		it is consumed chunk by chunk, so a producer such as a zip extractor can feed it lazily.
+		"""
+		self._open_source(project_path)
 		self._file_codes = {}
-		
-		for file in self.folder_path.rglob('*'):
-			if not file.is_file():
-				continue
-			rel = file.relative_to(self.folder_path)
-			rel_posix = rel.as_posix()
-			if any(f'/{Path(d).as_posix().strip("/")}/' in f'/{rel_posix}/' for d in EXCLUDED_DIRS):
-				continue
-			if file.name.endswith(EXCLUDED_EXTENSIONS) or file.suffixes[-2:] == ['.blade', '.php']:
+		self._symbols = {}
+		self._symbol_index = None
+		self._dependency_graph = None
+		self._project_summary = None
+		if self._artifact is not None:
+			# Symbols are read from the artifact on first use, there is nothing to parse
+			self._parsed_folder_tree = dict.fromkeys(self._artifact.files)
+			self._file_stats = {}
+			return self._parsed_folder_tree
+		workers = workers if workers is not None else self.workers
+		chunk_size = max(1, chunk_size if chunk_size is not None else self.chunk_size)
+
+		res = {}
+		pending = {}
+		with metrics.span("parse"):
+			chunks = _chunked(files if files is not None else self._iter_source_files(), chunk_size)
+			first = next(chunks, [])
+			second = next(chunks, None)
+			if workers > 1 and second is not None:
+				self._parse_parallel(chain([first, second], chunks), workers, res, pending)
+			else:
+				for chunk in chain([first], [second] if second else [], chunks):
+					if self.cache is not None:
+						chunk = self._load_from_cache(chunk, res, pending)
+					for rel_posix, lang_name in chunk:
+						tree, code = self._parse_file(rel_posix, lang_name)
+						res[rel_posix] = self._keep_parsed(rel_posix, tree, code)
+
+			self._parsed_folder_tree = res
+			self._file_stats = {rel_posix: self._stat_key(rel_posix) for rel_posix in res}
+			if pending:
+				self._store_in_cache(pending)
+
+		parsed = len(res) if self.cache is None else len(pending)
+		metrics.count("parser_files_total", parsed, source="parsed")
+		metrics.count("parser_files_total", len(res) - parsed, source="cache")
+		metrics.count("parser_bytes_total", sum(size for size, _ in self._file_stats.values()))
+		return res
+
+	def _stat_key(self, rel_posix: str):
+		_, size, mtime_ns = self._source_stat(rel_posix)
+		return size, mtime_ns
+
+	def update_ast(self) -> Dict[str, List[str]]:
+		"""Re-parse only the files added, removed or modified since the last parse"""
+		if self.folder_path is None:
+			raise ValueError("No project parsed. Run set_ast first.")
+
+		if self._artifact is not None:
+			return self._update_from_artifact()
+
+		changes = {"added": [], "removed": [], "modified": []}
+		if self._zip is not None:
+			# Re-read the central directory in case the archive was replaced
+			self._open_source(str(self.folder_path))
+		current = dict(self._iter_source_files())
+
+		for rel_posix in list(self._parsed_folder_tree):
+			if rel_posix not in current:
+				self._forget_file(rel_posix)
+				changes["removed"].append(rel_posix)
+
+		pending = {}
+		for rel_posix, lang_name in current.items():
+			stat_key = self._stat_key(rel_posix)
+			previous = self._file_stats.get(rel_posix)
+			if previous == stat_key:
 				continue
-			if file.suffix == ".php":
-				lang = PHP_LANGUAGE
-			elif file.suffix == ".tsx":
-				lang = TSX_LANGUAGE
-			elif file.suffix == ".ts":
-				lang = TS_LANGUAGE
-			elif file.suffix in (".js", ".jsx"):
-				lang = JS_LANGUAGE
+			if previous is None:
+				tree, code = self._parse_file(rel_posix, lang_name)
+				changes["added"].append(rel_posix)
+			else:
+				tree, code = self._reparse_file(rel_posix, lang_name)
+				if tree is None:
+					# Only the mtime moved, the content is the same
+					self._file_stats[rel_posix] = stat_key
+					continue
+				changes["modified"].append(rel_posix)
+			self._symbols.pop(rel_posix, None)
+			self._parsed_folder_tree[rel_posix] = self._keep_parsed(rel_posix, tree, code)
+			self._file_stats[rel_posix] = stat_key
+			if self.cache is not None:
+				raw = code.encode("utf8")
+				pending[rel_posix] = (self._source_stat(rel_posix)[0], stat_key[0], stat_key[1], symbol_key(raw, lang_name))
+
+		if pending:
+			self._store_in_cache(pending)
+		if any(changes.values()):
+			self._update_indexes(changes)
+		return changes
+
+	def _update_from_artifact(self) -> Dict[str, List[str]]:
+		"""Reload the artifact if it was rebuilt and drop the symbols whose content hash changed"""
+		changes = {"added": [], "removed": [], "modified": []}
+		path = Path(self._artifact.path)
+		stat = path.stat()
+		if (stat.st_size, stat.st_mtime_ns) == self._artifact.stat:
+			return changes
+
+		old_files = self._artifact.files
+		self._open_source(str(path))
+		new_files = self._artifact.files
+		for rel_posix in old_files:
+			if rel_posix not in new_files:
+				self._forget_file(rel_posix)
+				changes["removed"].append(rel_posix)
+		for rel_posix, (_, _, digest) in new_files.items():
+			previous = old_files.get(rel_posix)
+			if previous is None:
+				changes["added"].append(rel_posix)
+			elif previous[2] != digest:
+				changes["modified"].append(rel_posix)
 			else:
 				continue
+			self._parsed_folder_tree[rel_posix] = None
+			self._symbols.pop(rel_posix, None)
+		if any(changes.values()):
+			self._update_indexes(changes)
+		return changes
 
-			tree, code = self._parse_file(file, lang)
-			res[rel_posix] = tree
+	def _update_indexes(self, changes: Dict[str, List[str]]):
+		"""Patch the symbol index, dependency graph and summary, those already built, with the files changed by an update"""
+		indexes = [index for index in (self._symbol_index, self._dependency_graph, self._project_summary) if index is not None]
+		if not indexes:
+			return
+		for rel_posix in changes["removed"]:
+			for index in indexes:
+				index.remove(rel_posix)
+		for rel_posix in changes["added"] + changes["modified"]:
+			try:
+				symbols = self.extract_symbols(rel_posix)
+			except Exception:
+				symbols = None
+			for index in indexes:
+				if symbols is None:
+					index.remove(rel_posix)
+				else:
+					index.update(symbols)
+
+	def write_artifact(self, path: str) -> int:
+		"""Save the symbols of every parsed file, with content hashes, as an analysis artifact; returns the file count"""
+		if not self._parsed_folder_tree:
+			raise ValueError("No files parsed. Run set_ast first.")
+
+		def records():
+			for rel_posix in sorted(self._parsed_folder_tree):
+				try:
+					symbols = self.extract_symbols(rel_posix)
+				except Exception:
+					continue
+				if self._artifact is not None:
+					digest = self._artifact.files[rel_posix][2]
+				else:
+					digest = content_hash(self._read_bytes(rel_posix))
+				yield rel_posix, digest, symbols
+
+		root = self._artifact.root if self._artifact is not None else str(self.folder_path)
+		return write_artifact(path, root, EXTRACTOR_VERSION, records())
+
+	def _keep_parsed(self, rel_posix: str, tree, code: str):
+		"""Store a freshly parsed file and return what to keep as its tree: the tree, or None in lean mode"""
+		if not self.lean:
 			self._file_codes[rel_posix] = code
+			return tree
+		try:
+			symbols = self._symbols_from_tree(rel_posix, tree)
+		except Exception:
+			symbols = None
+		self._remember_symbols(rel_posix, symbols)
+		self._file_codes.pop(rel_posix, None)
+		return None
 
-		self._parsed_folder_tree = res
-		return res
+	def _remember_symbols(self, rel_posix: str, symbols):
+		if self.lean and symbols is not None:
+			symbols = FileSymbols.from_dict(symbols)
+		self._symbols[rel_posix] = symbols
 
-	def extract_symbols(self, file_path: str) -> Dict[str, Any]:
-		"""Extract symbols from a parsed file using internal AST and code"""
-		if file_path not in self._parsed_folder_tree:
-			raise ValueError(f"File {file_path} not found in parsed tree. Run set_ast first.")
-		
-		tree = self._parsed_folder_tree[file_path]
-		code = self._file_codes[file_path]
-		root = tree.root_node
-		result = {"file": file_path, "classes": []}
+	def estimated_size(self) -> int:
+		"""Rough in-memory footprint in bytes: sources, their trees (a few times the source) and symbols"""
+		code_bytes = sum(len(code) for code in self._file_codes.values())
+		tree_count = sum(1 for tree in self._parsed_folder_tree.values() if tree is not None)
+		return code_bytes * 5 + tree_count * 1024 + len(self._symbols) * 512
 
-		def text(node):
-			return code[node.start_byte:node.end_byte]
+	def _forget_file(self, rel_posix: str):
+		self._parsed_folder_tree.pop(rel_posix, None)
+		self._file_codes.pop(rel_posix, None)
+		self._symbols.pop(rel_posix, None)
+		self._file_stats.pop(rel_posix, None)
 
-		# Determine file type
-		is_js_ts = file_path.endswith(('.js', '.jsx', '.ts', '.tsx'))
+	def _reparse_file(self, rel_posix: str, lang_name: str):
+		"""Re-parse a modified file, handing tree-sitter the edited old tree when we still have it"""
+		old_tree = self._parsed_folder_tree.get(rel_posix)
+		old_code = self._file_codes.get(rel_posix)
+		code = self._read_code(rel_posix)
+		if old_code is not None and code == old_code:
+			return None, code
+		new_bytes = bytes(code, "utf8")
+		if old_tree is None or old_code is None:
+			return _get_parser(lang_name).parse(new_bytes), code
 
-		if is_js_ts:
-			# JavaScript/TypeScript extraction
-			self._extract_js_ts_symbols(root, result, text)
-		else:
-			# PHP extraction
-			self._extract_php_symbols(root, result, text)
-
-		return result
-
-	def _extract_php_symbols(self, root, result, text):
-		"""Extract symbols from PHP AST"""
-		def walk_class(node):
-			info = {"class": None, "extends": None, "properties": [], "methods": []}
-			for child in node.children:
-				if child.type == "name" and info["class"] is None:
-					info["class"] = text(child)
-				elif child.type == "base_clause":
-					for c in child.children:
-						if c.type in ("name", "qualified_name"):
-							info["extends"] = text(c)
-				elif child.type == "declaration_list":
-					for member in child.children:
-						if member.type == "property_declaration":
-							for v in member.children:
-								if v.type == "property_element":
-									for vv in v.children:
-										if vv.type == "variable_name":
-											info["properties"].append(text(vv))
-						elif member.type == "method_declaration":
-							m = {"name": None, "return": None}
-							for c in member.children:
-								if c.type == "name" and m["name"] is None:
-									m["name"] = text(c)
-								elif c.type in ("named_type", "primitive_type", "qualified_name"):
-									m["return"] = text(c)
-							info["methods"].append(m)
-			return info
-
-		for child in root.children:
-			if child.type == "class_declaration":
-				result["classes"].append(walk_class(child))
-
-	def _extract_js_ts_symbols(self, root, result, text):
-		"""Extract symbols from JavaScript/TypeScript AST"""
-		def walk_node(node):
-			# Handle class declarations
-			if node.type == "class_declaration":
-				class_info = self._extract_js_class(node, text)
-				if class_info:
-					result["classes"].append(class_info)
-			
-			# Handle interface declarations
-			elif node.type == "interface_declaration":
-				interface_info = self._extract_js_interface(node, text)
-				if interface_info:
-					result["classes"].append(interface_info)
-			
-			# Handle export statements
-			elif node.type == "export_statement":
-				for child in node.children:
-					if child.type in ("class_declaration", "interface_declaration", "function_declaration", "lexical_declaration"):
-						walk_node(child)
-			
-			# Handle function declarations
-			elif node.type == "function_declaration":
-				func_info = self._extract_js_function(node, text)
-				if func_info:
-					result["classes"].append(func_info)
-			
-			# Handle lexical declarations (const/let with arrow functions)
-			elif node.type == "lexical_declaration":
-				func_info = self._extract_js_lexical_function(node, text)
-				if func_info:
-					result["classes"].append(func_info)
-
-		# Walk through all top-level nodes
-		for child in root.children:
-			walk_node(child)
-
-	def _extract_js_class(self, node, text):
-		"""Extract information from a JavaScript/TypeScript class"""
-		info = {"class": None, "extends": None, "properties": [], "methods": [], "type": "class"}
-		
-		for child in node.children:
-			if child.type == "type_identifier" or child.type == "identifier":
-				if info["class"] is None:
-					info["class"] = text(child)
-			elif child.type == "class_heritage":
-				for c in child.children:
-					if c.type == "identifier" or c.type == "type_identifier":
-						info["extends"] = text(c)
-			elif child.type == "class_body":
-				for member in child.children:
-					if member.type == "field_definition" or member.type == "public_field_definition":
-						prop_info = self._extract_property_with_type(member, text)
-						if prop_info:
-							info["properties"].append(prop_info)
-					elif member.type == "method_definition":
-						method_info = self._extract_js_method(member, text)
-						if method_info:
-							info["methods"].append(method_info)
-		
-		return info if info["class"] else None
+		old_bytes = bytes(old_code, "utf8")
+		start, old_end, new_end = _diff_range(old_bytes, new_bytes)
+		old_tree.edit(
+			start_byte=start,
+			old_end_byte=old_end,
+			new_end_byte=new_end,
+			start_point=_point_at(old_bytes, start),
+			old_end_point=_point_at(old_bytes, old_end),
+			new_end_point=_point_at(new_bytes, new_end),
+		)
+		return _get_parser(lang_name).parse(new_bytes, old_tree), code
 
-	def _extract_js_interface(self, node, text):
-		"""Extract information from a TypeScript interface"""
-		info = {"class": None, "extends": None, "properties": [], "methods": [], "type": "interface"}
-		
-		for child in node.children:
-			if child.type == "type_identifier":
-				if info["class"] is None:
-					info["class"] = text(child)
-			elif child.type == "extends_clause" or child.type == "extends_type_clause":
-				for c in child.children:
-					if c.type == "type_identifier":
-						info["extends"] = text(c)
-			elif child.type == "object_type" or child.type == "interface_body":
-				for member in child.children:
-					if member.type == "property_signature":
-						prop_info = self._extract_property_with_type(member, text)
-						if prop_info:
-							info["properties"].append(prop_info)
-					elif member.type == "method_signature":
-						method_info = self._extract_js_method(member, text)
-						if method_info:
-							info["methods"].append(method_info)
-		
-		return info if info["class"] else None
+	def _load_from_cache(self, files, res: Dict[str, Any], pending: Dict[str, tuple]):
+		"""Fill res/_symbols from the symbol cache and return the files that still need parsing"""
+		stats = {rel_posix: self._source_stat(rel_posix) for rel_posix, _ in files}
+		known = self.cache.lookup_stats(list(stats.values()))
 
-	def _extract_js_function(self, node, text):
-		"""Extract information from a function declaration"""
-		info = {"class": None, "methods": [], "type": "function"}
-		
-		for child in node.children:
-			if child.type == "identifier":
-				if info["class"] is None:
-					info["class"] = text(child)
-					break
-		
-		return info if info["class"] else None
-
-	def _extract_js_lexical_function(self, node, text):
-		"""Extract information from const/let function declarations"""
-		for child in node.children:
-			if child.type == "variable_declarator":
-				func_name = None
-				for c in child.children:
-					if c.type == "identifier":
-						func_name = text(c)
-					elif c.type in ("arrow_function", "function"):
-						if func_name:
-							return {"class": func_name, "methods": [], "type": "function"}
-		return None
+		digests = {}
+		changed_stats = set()
+		languages = dict(files)
+		for rel_posix, (path, size, mtime_ns) in stats.items():
+			digest = known.get(path)
+			if digest is None:
+				digest = symbol_key(self._read_bytes(rel_posix), languages[rel_posix])
+				changed_stats.add(rel_posix)
+			digests[rel_posix] = digest
+		cached = self.cache.get_many(list(digests.values()))
 
-	def _extract_js_method(self, node, text):
-		"""Extract method information from a class method or interface method"""
-		method_info = {"name": None, "return": None}
-		
-		for child in node.children:
-			if child.type == "property_identifier" or child.type == "identifier":
-				if method_info["name"] is None:
-					method_info["name"] = text(child)
-			elif child.type == "type_annotation":
-				for c in child.children:
-					if c.type in ("type_identifier", "predefined_type"):
-						method_info["return"] = text(c)
-		
-		return method_info if method_info["name"] else None
+		to_parse = []
+		refreshed = []
+		for rel_posix, lang_name in files:
+			path, size, mtime_ns = stats[rel_posix]
+			digest = digests[rel_posix]
+			symbols = cached.get(digest)
+			if symbols is not None:
+				res[rel_posix] = None
+				self._remember_symbols(rel_posix, {"file": rel_posix, **symbols})
+				if rel_posix in changed_stats:
+					refreshed.append((path, size, mtime_ns, digest, None))
+			else:
+				pending[rel_posix] = (path, size, mtime_ns, digest)
+				to_parse.append((rel_posix, lang_name))
+		if refreshed:
+			self.cache.put_many(refreshed)
+		return to_parse
 
-	def _get_property_name(self, node, text):
-		"""Get property name from a field or property signature"""
-		for child in node.children:
-			if child.type in ("property_identifier", "identifier"):
-				return text(child)
-		return None
+	def _store_in_cache(self, pending: Dict[str, tuple]):
+		entries = []
+		for rel_posix, (path, size, mtime_ns, digest) in pending.items():
+			try:
+				symbols = self.extract_symbols(rel_posix)
+			except Exception:
+				symbols = None
+			entries.append((path, size, mtime_ns, digest, symbols))
+		self.cache.put_many(entries)
+		self.cache.evict()
 
-	def _extract_property_with_type(self, node, text):
-		"""Extract property name and type annotation from a field or property signature"""
-		prop_name = None
-		type_annotation = None
-		
-		for child in node.children:
-			if child.type in ("property_identifier", "identifier"):
-				prop_name = text(child)
-			elif child.type == "type_annotation":
-				# Get the type from the type_annotation node
-				for c in child.children:
-					if c.type in ("type_identifier", "predefined_type", "union_type", "literal_type"):
-						type_annotation = text(c)
-						break
-		
-		if prop_name:
-			return f"{prop_name}: {type_annotation}" if type_annotation else prop_name
-		return None
+	def _parse_parallel(self, chunks: Iterable, workers: int, res: Dict[str, Any], pending: Dict[str, tuple]):
+		"""Parse chunks over a process pool as they arrive; symbols are extracted in the workers since trees can't be pickled"""
+		futures = []
+		executor = _get_pool(workers)
+		try:
+			for chunk in chunks:
+				if self.cache is not None:
+					chunk = self._load_from_cache(chunk, res, pending)
+				if chunk:
+					futures.append(executor.submit(_parse_chunk, str(self.folder_path), chunk))
+			for future in futures:
+				for rel_posix, symbols in future.result():
+					res[rel_posix] = None
+					self._remember_symbols(rel_posix, symbols)
+		except BrokenProcessPool:
+			_drop_pool(workers, executor)
+			raise
+		finally:
+			for future in futures:
+				future.cancel()
 
-	def extract_all_symbols(self) -> str:
-		"""Extract symbols from all parsed files and return as a formatted string"""
+	def file_count(self) -> int:
+		return len(self._parsed_folder_tree)
+
+	def symbol_index(self) -> SymbolIndex:
+		"""Inverted index over all extracted symbols, kept up to date by update_ast"""
+		if self._symbol_index is None:
+			self._symbol_index = SymbolIndex(self.extract_all_symbol_dicts())
+		return self._symbol_index
+
+	def dependency_graph(self) -> DependencyGraph:
+		"""File dependency graph (PHP use/extends/include, JS/TS import/require), kept up to date by update_ast"""
+		if self._dependency_graph is None:
+			self._dependency_graph = DependencyGraph(self.extract_all_symbol_dicts())
+		return self._dependency_graph
+
+	def project_summary(self):
+		"""Transcript-ranked summary of the project (a ProjectSummaryService), kept up to date by update_ast"""
+		if self._project_summary is None:
+			# Imported here since the summary formats files with ParserService
+			from services.project_summary_service import ProjectSummaryService
+			self._project_summary = ProjectSummaryService(self.extract_all_symbol_dicts(), self.dependency_graph())
+		return self._project_summary
+
+	def has_file(self, file_path: str) -> bool:
+		return file_path in self._parsed_folder_tree
+
+	def extract_symbols(self, file_path: str) -> Dict[str, Any]:
+		"""Extract symbols from a parsed file using internal AST and code"""
+		if file_path not in self._parsed_folder_tree:
+			raise ValueError(f"File {file_path} not found in parsed tree. Run set_ast first.")
+
+		if file_path in self._symbols:
+			symbols = self._symbols[file_path]
+			if symbols is None:
+				raise ValueError(f"Could not extract symbols from {file_path}")
+			return symbols.to_dict() if self.lean else symbols
+
+		if self._artifact is not None:
+			symbols = self._artifact.read(file_path)
+			self._remember_symbols(file_path, symbols)
+			return symbols
+
+		return self._symbols_from_tree(file_path, self._parsed_folder_tree[file_path])
+
+	def _symbols_from_tree(self, file_path: str, tree) -> Dict[str, Any]:
+		spec = languages[file_language(file_path.rsplit('/', 1)[-1])]
+		namespace, imports = spec.imports(tree.root_node)
+		return {"file": file_path, "classes": spec.extract(tree.root_node), "namespace": namespace, "imports": imports}
+
+	def extract_all_symbol_dicts(self) -> List[Dict[str, Any]]:
+		"""Extract symbols from all parsed files, sorted by path; files that fail are skipped"""
 		if not self._parsed_folder_tree:
 			raise ValueError("No files parsed. Run set_ast first.")
 		
 		all_symbols = []
 		
-		for file_path in sorted(self._parsed_folder_tree.keys()):
-			try:
-				symbols = self.extract_symbols(file_path)
-				all_symbols.append(symbols)
-			except Exception as e:
-				# Skip files that can't be parsed
-				continue
+		with metrics.span("extract"):
+			for file_path in sorted(self._parsed_folder_tree.keys()):
+				try:
+					symbols = self.extract_symbols(file_path)
+					all_symbols.append(symbols)
+				except Exception as e:
+					# Skip files that can't be parsed
+					continue
 		
-		return self._format_symbols_for_openai(all_symbols)
+		return all_symbols
+
+	def extract_all_symbols(self) -> str:
+		"""Extract symbols from all parsed files and return as a formatted string"""
+		return self.format_symbols(self.extract_all_symbol_dicts())
 	
-	def _format_symbols_for_openai(self, all_symbols: list) -> str:
+	def format_symbols(self, all_symbols: list) -> str:
 		"""Format extracted symbols into a readable string for OpenAI"""
 		output_lines = []
 		
 		# Filter out files with no symbols
 		files_with_symbols = [f for f in all_symbols if f.get("classes", [])]
 		
-		output_lines.append("# Project Structure Analysis\n")
-		output_lines.append(f"Total files with symbols: {len(files_with_symbols)}\n")
-		output_lines.append("=" * 80 + "\n\n")
+		output_lines.append(self.format_summary_header(len(files_with_symbols)))
 		
 		for file_data in files_with_symbols:
-			file_path = file_data.get("file", "Unknown")
-			classes = file_data.get("classes", [])
+			output_lines.append(self.format_file_symbols(file_data))
+		
+		return "".join(output_lines)
+
+	@staticmethod
+	def format_summary_header(file_count: int) -> str:
+		return "# Project Structure Analysis\n" + f"Total files with symbols: {file_count}\n" + "=" * 80 + "\n\n"
+
+	@staticmethod
+	def format_file_symbols(file_data: Dict[str, Any]) -> str:
+		"""Format one file's symbols as a Markdown section"""
+		output_lines = []
+		file_path = file_data.get("file", "Unknown")
+		classes = file_data.get("classes", [])
+		
+		output_lines.append(f"## File: {file_path}\n")
+		
+		for cls in classes:
+			class_name = cls.get("class_name") or cls.get("class", "Unknown")
+			extends = cls.get("extends")
+			properties = cls.get("properties", [])
+			methods = cls.get("methods", [])
+			symbol_type = cls.get("type", "class")
 			
-			output_lines.append(f"## File: {file_path}\n")
+			# Format header based on type
+			if symbol_type == "interface":
+				output_lines.append(f"\n### Interface: {class_name}")
+			elif symbol_type == "function":
+				output_lines.append(f"\n### Function: {class_name}")
+			else:
+				output_lines.append(f"\n### Class: {class_name}")
 			
-			for cls in classes:
-				class_name = cls.get("class_name") or cls.get("class", "Unknown")
-				extends = cls.get("extends")
-				properties = cls.get("properties", [])
-				methods = cls.get("methods", [])
-				symbol_type = cls.get("type", "class")
-				
-				# Format header based on type
-				if symbol_type == "interface":
-					output_lines.append(f"\n### Interface: {class_name}")
-				elif symbol_type == "function":
-					output_lines.append(f"\n### Function: {class_name}")
-				else:
-					output_lines.append(f"\n### Class: {class_name}")
-				
-				if extends:
-					output_lines.append(f" extends {extends}")
-				output_lines.append("\n")
-				
-				if properties:
-					output_lines.append("  **Properties:**\n")
-					for prop in properties:
-						output_lines.append(f"    - {prop}\n")
-				
-				if methods:
-					output_lines.append("  **Methods:**\n")
-					for method in methods:
-						method_name = method.get("name", "Unknown")
-						return_type = method.get("return_type") or method.get("return", "void")
-						output_lines.append(f"    - {method_name}(): {return_type}\n")
-				
-				output_lines.append("\n")
+			if extends:
+				output_lines.append(f" extends {extends}")
+			output_lines.append("\n")
 			
-			output_lines.append("-" * 80 + "\n\n")
+			if properties:
+				output_lines.append("  **Properties:**\n")
+				for prop in properties:
+					output_lines.append(f"    - {prop}\n")
+			
+			if methods:
+				output_lines.append("  **Methods:**\n")
+				for method in methods:
+					method_name = method.get("name", "Unknown")
+					return_type = method.get("return_type") or method.get("return", "void")
+					output_lines.append(f"    - {method_name}(): {return_type}\n")
+			
+			output_lines.append("\n")
 		
+		output_lines.append("-" * 80 + "\n\n")
 		return "".join(output_lines)
-
-
@@ -0,0 +1,81 @@
+import hashlib
+import os
+import shutil
+import zipfile
+
+from fastapi import UploadFile
+
+from services.metrics_service import metrics
+from services.parser_service import ParserService, source_language, zip_member_path
+from services.project_session_service import project_sessions
+from services.upload_store_service import UploadStoreService, get_upload_store, BLOB, TREE
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class ProjectImportService:
+	"""Imports uploaded project archives into the upload store, extracting and parsing only the source files"""
+
+	def __init__(self, store: UploadStoreService = None):
+		self.store = store or get_upload_store()
+
+	async def save_upload(self, file: UploadFile) -> str:
+		"""Stream an upload into the store in fixed-size chunks, hashing it on the way, and return its SHA-256"""
+		size = 0
+		digest = hashlib.sha256()
+		tmp_path = self.store.new_upload_path()
+		with metrics.span("upload"):
+			try:
+				with open(tmp_path, "wb") as f:
+					while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+						f.write(chunk)
+						digest.update(chunk)
+						size += len(chunk)
+			except BaseException:
+				if os.path.exists(tmp_path):
+					os.unlink(tmp_path)
+				raise
+			_, known = self.store.add_blob(tmp_path, digest.hexdigest())
+		metrics.count("upload_bytes_total", size)
+		metrics.count("upload_store_blobs_total", stored="existing" if known else "new")
+		return digest.hexdigest()
+
+	def extract_and_parse(self, digest: str, project_id: str) -> ParserService:
+		"""Extract the archive's source members once per content hash, parsing them as they are written"""
+		with self.store.hash_lock(digest):
+			if not self.store.has_tree(digest):
+				tree_path = self.store.tree_path(digest)
+				# Leftover of an interrupted extraction
+				shutil.rmtree(tree_path, ignore_errors=True)
+				os.makedirs(tree_path)
+				service = project_sessions.new_service()
+				sizes = []
+				with zipfile.ZipFile(self.store.blob_path(digest), "r") as zip_ref:
+					service.set_ast(tree_path, files=self._extract_sources(zip_ref, tree_path, sizes))
+				project_sessions.put(tree_path, service)
+				self.store.add_tree(digest, sum(sizes))
+		project_path = self.store.link(project_id, digest, TREE)
+		# Sessions key on the resolved path, so every project linked to this tree shares its parse
+		return project_sessions.get(project_path, refresh=False)
+
+	def parse_archive(self, digest: str, project_id: str) -> ParserService:
+		"""Parse the source members straight from the stored archive, without extracting anything"""
+		project_path = self.store.link(project_id, digest, BLOB)
+		# Already parsed if the same archive was imported before and its session is still cached
+		return project_sessions.get(project_path, refresh=False)
+
+	def _extract_sources(self, zip_ref: zipfile.ZipFile, folder_path: str, sizes: list):
+		"""Yield (relative_path, language) for each source member once it is on disk; everything else is skipped"""
+		for info in zip_ref.infolist():
+			if info.is_dir():
+				continue
+			rel_posix = zip_member_path(info.filename)
+			if not rel_posix:
+				continue
+			lang_name = source_language(rel_posix)
+			if lang_name is None:
+				continue
+			zip_ref.extract(info, folder_path)
+			sizes.append(info.file_size)
+			if os.path.isfile(os.path.join(folder_path, rel_posix)):
+				yield rel_posix, lang_name
@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from services.parser_service import ParserService, EXTRACTOR_VERSION
+from services.symbol_cache_service import SymbolCacheService
+
+PROJECT_SESSION_MAX_BYTES = int(os.environ.get("PROJECT_SESSION_MAX_BYTES", 1024 * 1024 * 1024))
+PROJECT_SESSION_TTL = float(os.environ.get("PROJECT_SESSION_TTL", 30 * 60))
+# Uploaded projects live in <PROJECTS_ROOT>/<folder_id>
+PROJECTS_ROOT = os.environ.get("PROJECTS_ROOT", "/tmp")
+
+
+class ProjectNotFoundError(ValueError):
+	"""The project id is invalid or names no project on the server"""
+
+
+def project_path_for(project_id: str) -> str:
+	"""Folder of an uploaded project; its id is the folder_id used by the upload routes"""
+	# Hidden names are reserved for the server's own folders (e.g. the upload store)
+	if not project_id or project_id.startswith(".") or "/" in project_id or "\\" in project_id:
+		raise ProjectNotFoundError(f"Invalid project id {project_id!r}")
+	return os.path.join(PROJECTS_ROOT, project_id)
+
+
+class ProjectSession:
+	"""A parsed project kept in memory between requests; lock guards the service, parses and reads alike"""
+
+	def __init__(self, project_path: str, service: ParserService):
+		self.project_path = project_path
+		self.service = service
+		self.last_used = time.monotonic()
+		self.lock = threading.Lock()
+		# Measured under the lock after each parse, so eviction never walks a service being updated
+		self.size = 0
+
+
+class ProjectSessionRegistry:
+	"""Process-wide LRU of parsed projects, bounded by an estimated memory budget and an idle TTL"""
+
+	def __init__(self, max_bytes: int = None, idle_ttl: float = None):
+		self.max_bytes = max_bytes if max_bytes is not None else PROJECT_SESSION_MAX_BYTES
+		self.idle_ttl = idle_ttl if idle_ttl is not None else PROJECT_SESSION_TTL
+		self._sessions = OrderedDict()  # {resolved project path: ProjectSession}
+		self._lock = threading.Lock()
+		self._cache = None
+
+	@staticmethod
+	def _key(project_path: str) -> str:
+		return str(Path(project_path).resolve())
+
+	def new_service(self) -> ParserService:
+		if self._cache is None:
+			self._cache = SymbolCacheService(EXTRACTOR_VERSION)
+		return ParserService(cache=self._cache)
+
+	def get(self, project_path: str, refresh: bool = True) -> ParserService:
+		"""Return the parsed project, parsing it on first use and re-parsing changed files when refresh is set.
+
+		The service is returned unlocked: read it through use() when other requests may refresh it meanwhile.
+		"""
+		with self.use(project_path, refresh) as service:
+			return service
+
+	@contextmanager
+	def use(self, project_path: str, refresh: bool = True) -> Iterator[ParserService]:
+		"""Like get(), but the service stays locked until the block ends, so no concurrent refresh patches it mid-read"""
+		key = self._key(project_path)
+		if not Path(key).exists():
+			raise ProjectNotFoundError(f"Project path {project_path} does not exist")
+
+		with self._lock:
+			self._evict_idle()
+			session = self._sessions.get(key)
+			if session is None:
+				session = ProjectSession(key, self.new_service())
+				self._sessions[key] = session
+				created = True
+			else:
+				created = False
+			self._sessions.move_to_end(key)
+			session.last_used = time.monotonic()
+
+		with session.lock:
+			if created or session.service.folder_path is None:
+				try:
+					session.service.set_ast(key)
+				except Exception:
+					self.drop(key)
+					raise
+				session.size = session.service.estimated_size()
+			elif refresh:
+				session.service.update_ast()
+				session.size = session.service.estimated_size()
+			with self._lock:
+				self._evict_over_budget(keep=key)
+			yield session.service
+
+	def put(self, project_path: str, service: ParserService):
+		"""Register a project parsed outside the registry, e.g. while its upload was being imported"""
+		key = self._key(project_path)
+		session = ProjectSession(key, service)
+		session.size = service.estimated_size()
+		with self._lock:
+			self._sessions[key] = session
+			self._sessions.move_to_end(key)
+			self._evict_over_budget(keep=key)
+
+	def drop(self, project_path: str):
+		with self._lock:
+			self._sessions.pop(self._key(project_path), None)
+
+	def _evict_idle(self):
+		now = time.monotonic()
+		for key in [k for k, s in self._sessions.items() if now - s.last_used > self.idle_ttl]:
+			del self._sessions[key]
+
+	def _evict_over_budget(self, keep: str = None):
+		total = sum(s.size for s in self._sessions.values())
+		for key in list(self._sessions):
+			if total <= self.max_bytes:
+				break
+			if key == keep:
+				continue
+			total -= self._sessions.pop(key).size
+
+
+project_sessions = ProjectSessionRegistry()
@@ -0,0 +1,126 @@
+import math
+import os
+from collections import Counter, defaultdict
+from typing import Dict, Any, List
+
+from services.dependency_graph_service import DependencyGraph
+from services.metrics_service import metrics
+from services.parser_service import ParserService
+from services.symbol_index_service import split_terms, symbol_fields
+
+PROJECT_SUMMARY_TOKEN_BUDGET = int(os.environ.get("PROJECT_SUMMARY_TOKEN_BUDGET", 30_000))
+
+# Files around those the transcript names get this share of the best relevance score on top of their own,
+# decaying per hop, so they rise without pushing out relevant files further away
+DEPENDENCY_BOOST = float(os.environ.get("DEPENDENCY_BOOST", 0.5))
+DEPENDENCY_DECAY = float(os.environ.get("DEPENDENCY_DECAY", 0.5))
+
+# Rough tokenizer ratio for code-ish English/French text
+CHARS_PER_TOKEN = 4
+
+# How much a term match counts depending on where it appears
+FIELD_WEIGHTS = {
+	"class": 3.0,
+	"method": 2.0,
+	"path": 1.5,
+	"extends": 1.0,
+	"property": 1.0,
+	"type": 1.0,
+}
+
+
+def estimate_tokens(text: str) -> int:
+	return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+class ProjectSummaryService:
+	"""Builds a token-budgeted project summary, most transcript-relevant files first.
+
+	update() and remove() patch the terms of one file, so ParserService.project_summary() keeps one up to date.
+	"""
+
+	def __init__(self, all_symbols: List[Dict[str, Any]], graph: DependencyGraph = None, hops: int = None):
+		self.files = {}  # {path: symbols} of the files declaring something
+		self.graph = graph
+		self.hops = hops
+		self._index = defaultdict(dict)  # {term: {path: weight}}
+		self._file_terms = {}  # {path: terms}, to unindex a file
+		for file_data in all_symbols:
+			self.update(file_data)
+
+	def update(self, file_data: Dict[str, Any]):
+		path = file_data["file"]
+		self.remove(path)
+		if not file_data.get("classes", []):
+			return
+		weights = Counter()
+		for field, name, _, _ in symbol_fields(file_data):
+			for term in split_terms(name):
+				weights[term] += FIELD_WEIGHTS[field]
+		for term, weight in weights.items():
+			self._index[term][path] = weight
+		self.files[path] = file_data
+		self._file_terms[path] = tuple(weights)
+
+	def remove(self, path: str):
+		self.files.pop(path, None)
+		for term in self._file_terms.pop(path, ()):
+			postings = self._index[term]
+			del postings[path]
+			if not postings:
+				del self._index[term]
+
+	def score(self, transcript: str) -> Dict[str, float]:
+		"""Relevance of each file to the transcript (tf-idf style over the inverted index)"""
+		scores = dict.fromkeys(self.files, 0.0)
+		if not self.files:
+			return scores
+		for term, count in Counter(split_terms(transcript)).items():
+			postings = self._index.get(term)
+			if not postings:
+				continue
+			idf = math.log(1 + len(self.files) / len(postings))
+			tf = 1 + math.log(count)
+			for path, weight in postings.items():
+				scores[path] += tf * idf * weight
+		return scores
+
+	def build(self, transcript: str = None, token_budget: int = None) -> str:
+		"""Format files in decreasing relevance until the token budget is spent"""
+		with metrics.span("summary"):
+			budget = token_budget if token_budget is not None else PROJECT_SUMMARY_TOKEN_BUDGET
+			scores = self.score(transcript) if transcript else {}
+			if self.graph is not None and transcript:
+				boost = DEPENDENCY_BOOST * (max(scores.values(), default=0.0) or 1.0)
+				for path, distance in self.graph.neighborhood(self.graph.seeds(transcript), self.hops).items():
+					if path in scores:
+						scores[path] += boost * DEPENDENCY_DECAY ** distance
+			# Ties (and unrelated files) keep the usual path order
+			order = sorted(sorted(self.files), key=lambda path: -scores.get(path, 0.0))
+
+			header = ParserService.format_summary_header(len(self.files))
+			used = estimate_tokens(header)
+			sections = []
+			for path in order:
+				section = ParserService.format_file_symbols(self.files[path])
+				cost = estimate_tokens(section)
+				if used + cost > budget:
+					continue
+				sections.append(section)
+				used += cost
+
+			omitted = len(self.files) - len(sections)
+			if omitted:
+				sections.append(f"[{omitted} fichiers omis : budget de tokens atteint]\n")
+			return header + "".join(sections)
+
+
+def truncate_summary(text: str, token_budget: int) -> str:
+	"""Cut an already formatted summary at a file boundary so it fits the token budget"""
+	if estimate_tokens(text) <= token_budget:
+		return text
+	limit = token_budget * CHARS_PER_TOKEN
+	cut = text.rfind("## File: ", 0, limit)
+	if cut <= 0:
+		cut = limit
+	return text[:cut] + "\n...\n[AST TRONQUÉ POUR LA BRIÈVETÉ]\n"
@@ -0,0 +1,80 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from services.symbol_cache_service import SYMBOL_CACHE_DIR
+
+RESPONSE_CACHE_DIR = os.environ.get("RESPONSE_CACHE_DIR", SYMBOL_CACHE_DIR)
+RESPONSE_CACHE_TTL = float(os.environ.get("RESPONSE_CACHE_TTL", 7 * 24 * 3600))
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+RESPONSE_CACHE_ENABLED = os.environ.get("RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+_cache = None
+
+
+class ResponseCacheService:
+	"""On-disk cache of completion contents, keyed by a hash of the full completion request"""
+
+	def __init__(self, cache_dir: str = None, ttl: float = None, max_bytes: int = None):
+		self.ttl = ttl if ttl is not None else RESPONSE_CACHE_TTL
+		self.max_bytes = max_bytes if max_bytes is not None else RESPONSE_CACHE_MAX_BYTES
+		cache_dir = cache_dir or RESPONSE_CACHE_DIR
+		os.makedirs(cache_dir, exist_ok=True)
+		self._lock = threading.Lock()
+		self._conn = sqlite3.connect(os.path.join(cache_dir, "responses.sqlite"), check_same_thread=False)
+		with self._lock, self._conn:
+			self._conn.execute("PRAGMA journal_mode=WAL")
+			self._conn.execute(
+				"CREATE TABLE IF NOT EXISTS responses "
+				"(key TEXT PRIMARY KEY, content TEXT, size INTEGER, created REAL, last_used REAL)"
+			)
+
+	@staticmethod
+	def key(completion_args: Dict[str, Any]) -> str:
+		"""Hash of model, messages (system prompt and rendered prompt) and response schema"""
+		return hashlib.sha256(json.dumps(completion_args, sort_keys=True).encode("utf8")).hexdigest()
+
+	def get(self, key: str) -> Optional[str]:
+		now = time.time()
+		with self._lock, self._conn:
+			row = self._conn.execute("SELECT content, created FROM responses WHERE key = ?", (key,)).fetchone()
+			if row is None:
+				return None
+			if now - row[1] > self.ttl:
+				self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+				return None
+			self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+		return row[0]
+
+	def put(self, key: str, content: str):
+		now = time.time()
+		with self._lock, self._conn:
+			self._conn.execute(
+				"INSERT OR REPLACE INTO responses (key, content, size, created, last_used) VALUES (?, ?, ?, ?, ?)",
+				(key, content, len(content), now, now)
+			)
+			self._evict(now)
+
+	def _evict(self, now: float):
+		"""Drop expired entries, then least recently used ones while over max_bytes"""
+		self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+		total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+		if total <= self.max_bytes:
+			return
+		for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall():
+			if total <= self.max_bytes:
+				break
+			self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+			total -= size
+
+
+def get_response_cache() -> Optional[ResponseCacheService]:
+	"""Shared cache instance, or None when RESPONSE_CACHE_ENABLED is off"""
+	global _cache
+	if _cache is None and RESPONSE_CACHE_ENABLED:
+		_cache = ResponseCacheService()
+	return _cache
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+SYMBOL_CACHE_DIR = os.environ.get("SYMBOL_CACHE_DIR", os.path.join(Path.home(), ".cache", "transcript_to_todolist"))
+SYMBOL_CACHE_MAX_BYTES = int(os.environ.get("SYMBOL_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+# Bumped when the key or row format changes, so stores written by an older layout are cleared
+CACHE_SCHEMA = 2
+
+
+def content_hash(raw: bytes) -> str:
+	return hashlib.sha256(raw).hexdigest()
+
+
+def symbol_key(raw: bytes, lang_name: str) -> str:
+	"""Cache key of a file's symbols: the same bytes give different symbols under another grammar (.js vs .ts)"""
+	return f"{lang_name}:{content_hash(raw)}"
+
+
+class SymbolCacheService:
+	"""Persistent SQLite cache of extracted symbols, keyed by file stat and by language and content hash"""
+
+	def __init__(self, version: str, cache_dir: str = None, max_bytes: int = None):
+		self.version = f"{version}/{CACHE_SCHEMA}"
+		self.max_bytes = max_bytes if max_bytes is not None else SYMBOL_CACHE_MAX_BYTES
+		cache_dir = cache_dir or SYMBOL_CACHE_DIR
+		os.makedirs(cache_dir, exist_ok=True)
+		self.db_path = os.path.join(cache_dir, "symbols.sqlite")
+		self._lock = threading.Lock()
+		self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+		self._init_db()
+
+	def _init_db(self):
+		with self._lock, self._conn:
+			self._conn.execute("PRAGMA journal_mode=WAL")
+			self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+			self._conn.execute(
+				"CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, hash TEXT)"
+			)
+			self._conn.execute(
+				"CREATE TABLE IF NOT EXISTS symbols (hash TEXT PRIMARY KEY, data TEXT, size INTEGER, last_used REAL)"
+			)
+			row = self._conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+			if row is None or row[0] != self.version:
+				# Extractor or key format changed: every stored entry is stale
+				self._conn.execute("DELETE FROM files")
+				self._conn.execute("DELETE FROM symbols")
+				self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (self.version,))
+
+	def lookup_stats(self, stats: List[Tuple[str, int, int]]) -> Dict[str, str]:
+		"""Return {path: symbol key} for the paths whose size and mtime are unchanged"""
+		found = {}
+		with self._lock:
+			for path, size, mtime_ns in stats:
+				row = self._conn.execute(
+					"SELECT hash FROM files WHERE path = ? AND size = ? AND mtime_ns = ?", (path, size, mtime_ns)
+				).fetchone()
+				if row:
+					found[path] = row[0]
+		return found
+
+	def get_many(self, digests: List[str]) -> Dict[str, Dict[str, Any]]:
+		"""Return {key: symbols (without the 'file' key)} for the cached symbol keys"""
+		found = {}
+		with self._lock, self._conn:
+			for digest in set(digests):
+				row = self._conn.execute("SELECT data FROM symbols WHERE hash = ?", (digest,)).fetchone()
+				if row is not None:
+					found[digest] = json.loads(row[0])
+			now = time.time()
+			self._conn.executemany("UPDATE symbols SET last_used = ? WHERE hash = ?", [(now, d) for d in found])
+		return found
+
+	def put_many(self, entries: List[Tuple[str, int, int, str, Optional[Dict[str, Any]]]]):
+		"""Record (path, size, mtime_ns, symbol key, symbols) rows; symbols may be None when only the stat changed"""
+		now = time.time()
+		with self._lock, self._conn:
+			for path, size, mtime_ns, digest, symbols in entries:
+				self._conn.execute(
+					"INSERT OR REPLACE INTO files (path, size, mtime_ns, hash) VALUES (?, ?, ?, ?)",
+					(path, size, mtime_ns, digest)
+				)
+				if symbols is not None:
+					data = json.dumps({k: v for k, v in symbols.items() if k != "file"}, separators=(",", ":"))
+					self._conn.execute(
+						"INSERT OR REPLACE INTO symbols (hash, data, size, last_used) VALUES (?, ?, ?, ?)",
+						(digest, data, len(data), now)
+					)
+
+	def evict(self):
+		"""Drop least recently used symbols until the cache fits in max_bytes"""
+		with self._lock, self._conn:
+			total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM symbols").fetchone()[0]
+			if total <= self.max_bytes:
+				return
+			target = int(self.max_bytes * 0.9)
+			for digest, size in self._conn.execute("SELECT hash, size FROM symbols ORDER BY last_used").fetchall():
+				if total <= target:
+					break
+				self._conn.execute("DELETE FROM symbols WHERE hash = ?", (digest,))
+				total -= size
+			self._conn.execute("DELETE FROM files WHERE hash NOT IN (SELECT hash FROM symbols)")
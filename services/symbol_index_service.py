@@ -0,0 +1,239 @@
+import difflib
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from operator import itemgetter
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+# Fields a query can target; None searches all of them
+SEARCH_FIELDS = ("class", "extends", "method", "property", "type", "path")
+
+# Keys scored with difflib per fuzzy query, picked by shared trigrams
+FUZZY_CANDIDATES = 200
+# Share of the query's trigrams a key needs to be a fuzzy candidate at all
+FUZZY_MIN_SHARED = 0.3
+
+
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_$][A-Za-z0-9_$]*")
+_WORD_RE = re.compile(r"[A-Za-z][a-z]+|[A-Z]+(?![a-z])|\d+")
+
+
+def split_terms(text: str) -> List[str]:
+	"""Split identifiers, paths and prose into lowercase terms: whole identifiers plus their camelCase/snake_case parts"""
+	terms = []
+	for identifier in _IDENTIFIER_RE.findall(text or ""):
+		parts = [w.lower() for w in _WORD_RE.findall(identifier) if len(w) >= 3]
+		whole = identifier.lower()
+		if len(whole) >= 3 and parts != [whole]:
+			terms.append(whole)
+		terms.extend(parts)
+	return terms
+
+
+def symbol_fields(file_data: Dict[str, Any]) -> Iterator[Tuple[str, str, Optional[str], str]]:
+	"""(field, name, class name, kind) of every searchable name of a file: path parts, classes, parents, members, types"""
+	for part in file_data.get("file", "").split("/"):
+		yield "path", part, None, "path"
+	for cls in file_data.get("classes", []):
+		class_name = cls.get("class_name") or cls.get("class")
+		kind = cls.get("type", "class")
+		yield "class", class_name, class_name, kind
+		if cls.get("extends"):
+			yield "extends", cls["extends"], class_name, kind
+		for prop in cls.get("properties", []):
+			name, _, prop_type = prop.partition(":")
+			yield "property", name.strip(), class_name, "property"
+			if prop_type.strip():
+				yield "type", prop_type.strip(), class_name, "property"
+		for method in cls.get("methods", []):
+			yield "method", method.get("name"), class_name, "method"
+			return_type = method.get("return_type") or method.get("return")
+			if return_type:
+				yield "type", return_type, class_name, "method"
+
+
+def _trigrams(key: str) -> List[str]:
+	# Padding lets short names and swapped letters still share their leading grams
+	padded = f"  {key} "
+	return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+class SymbolIndex:
+	"""In-memory inverted index over extracted symbols: names, extends, methods, property types and paths.
+
+	update() and remove() patch the entries of one file, so the index follows project updates.
+	"""
+
+	def __init__(self, all_symbols: List[Dict[str, Any]]):
+		self.entries = []  # [{"field", "name", "file", "class", "kind"}], None for the slots of removed files
+		self._free = []  # entry ids of removed files, reused by the next ones
+		self._file_entries = {}  # {file path: [entry ids]}
+		self._exact = {field: defaultdict(list) for field in SEARCH_FIELDS}  # {field: {lower name: [entry ids]}}
+		self._key_fields = Counter()  # {lower name: number of fields holding it}
+		self._trigrams = defaultdict(dict)  # {trigram: {name length: {lower names}}}
+		self._sorted = None
+		for file_data in all_symbols:
+			self._add_file(file_data)
+		# Sorted keys per field make prefix queries a binary search
+		self._sorted = {field: sorted(names) for field, names in self._exact.items()}
+
+	def __len__(self) -> int:
+		return len(self.entries) - len(self._free)
+
+	def update(self, file_data: Dict[str, Any]):
+		"""Add or replace the entries of one file"""
+		self.remove(file_data.get("file", ""))
+		self._add_file(file_data)
+
+	def remove(self, file_path: str):
+		for entry_id in self._file_entries.pop(file_path, ()):
+			entry = self.entries[entry_id]
+			field, key = entry["field"], entry["name"].lower()
+			ids = self._exact[field][key]
+			ids.remove(entry_id)
+			if not ids:
+				self._drop_key(field, key)
+			self.entries[entry_id] = None
+			self._free.append(entry_id)
+
+	def _add(self, field: str, name: str, file_path: str, class_name: Optional[str], kind: str, entry_ids: List[int]):
+		if not name:
+			return
+		entry = {"field": field, "name": name, "file": file_path, "class": class_name, "kind": kind}
+		if self._free:
+			entry_id = self._free.pop()
+			self.entries[entry_id] = entry
+		else:
+			entry_id = len(self.entries)
+			self.entries.append(entry)
+		entry_ids.append(entry_id)
+		key = name.lower()
+		ids = self._exact[field].get(key)
+		if ids is None:
+			ids = self._exact[field][key] = []
+			self._key_fields[key] += 1
+			if self._key_fields[key] == 1:
+				for gram in _trigrams(key):
+					self._trigrams[gram].setdefault(len(key), set()).add(key)
+			if self._sorted is not None:
+				insort(self._sorted[field], key)
+		ids.append(entry_id)
+
+	def _drop_key(self, field: str, key: str):
+		del self._exact[field][key]
+		keys = self._sorted[field]
+		del keys[bisect_left(keys, key)]
+		self._key_fields[key] -= 1
+		if not self._key_fields[key]:
+			del self._key_fields[key]
+			for gram in set(_trigrams(key)):
+				by_length = self._trigrams[gram]
+				keys_with_gram = by_length[len(key)]
+				keys_with_gram.discard(key)
+				if not keys_with_gram:
+					del by_length[len(key)]
+					if not by_length:
+						del self._trigrams[gram]
+
+	def _add_file(self, file_data: Dict[str, Any]):
+		file_path = file_data.get("file", "")
+		entry_ids = self._file_entries.setdefault(file_path, [])
+		for field, name, class_name, kind in symbol_fields(file_data):
+			self._add(field, name, file_path, class_name, kind, entry_ids)
+
+	def _fields(self, field: Optional[str]):
+		if field is None:
+			return SEARCH_FIELDS
+		if field not in SEARCH_FIELDS:
+			raise ValueError(f"Unknown field {field}, expected one of {', '.join(SEARCH_FIELDS)}")
+		return (field,)
+
+	def _prefix_keys(self, field: str, prefix: str) -> List[str]:
+		keys = self._sorted[field]
+		start = bisect_left(keys, prefix)
+		end = start
+		while end < len(keys) and keys[end].startswith(prefix):
+			end += 1
+		return keys[start:end]
+
+	def _fuzzy_keys(self, query: str, cutoff: float) -> Iterator[str]:
+		# difflib's ratio is at most 2 * min(len) / (sum of lens), so names of other lengths can't reach the cutoff
+		shortest = math.ceil(len(query) * cutoff / (2 - cutoff))
+		longest = math.floor(len(query) * (2 - cutoff) / cutoff)
+		grams = set(_trigrams(query))
+		postings = []  # per query trigram, the sets of names of a usable length holding it
+		for gram in grams:
+			by_length = self._trigrams.get(gram, {})
+			sets = [keys for length, keys in by_length.items() if shortest <= length <= longest]
+			if sets:
+				postings.append((sum(len(keys) for keys in sets), sets))
+		needed = max(1, math.ceil(len(grams) * FUZZY_MIN_SHARED))
+		if len(postings) < needed:
+			return
+		# A name sharing `needed` grams is in one of the rarest len - needed + 1 lists; the common grams
+		# (Controller's "con", "ler"...) would cost the most to count and tell names apart the least
+		postings.sort(key=itemgetter(0))
+		counts = Counter()
+		for _, sets in postings[:len(postings) - needed + 1]:
+			for keys in sets:
+				counts.update(keys)
+		# Only the names sharing the most trigrams get the (slower) similarity check. Their heap holds
+		# (-upper bound of the ratio, stage, name): the length bound, then quick_ratio, are tightened only
+		# for the names at the top, and ratio() runs only until the caller has enough of them
+		matcher = difflib.SequenceMatcher()
+		# difflib caches its analysis of the second sequence, so the query goes there
+		matcher.set_seq2(query)
+		bounds = []
+		for key, _ in heapq.nlargest(FUZZY_CANDIDATES, counts.items(), key=itemgetter(1)):
+			bounds.append((-2 * min(len(key), len(query)) / (len(key) + len(query)), 0, key))
+		heapq.heapify(bounds)
+		scored = []  # (-ratio, name)
+		while bounds or scored:
+			if scored and (not bounds or scored[0][0] <= bounds[0][0]):
+				yield heapq.heappop(scored)[1]
+				continue
+			_, stage, key = heapq.heappop(bounds)
+			matcher.set_seq1(key)
+			if stage == 0:
+				bound = matcher.quick_ratio()
+				if bound >= cutoff:
+					heapq.heappush(bounds, (-bound, 1, key))
+			else:
+				ratio = matcher.ratio()
+				if ratio >= cutoff:
+					heapq.heappush(scored, (-ratio, key))
+
+	def search(self, query: str, field: str = None, mode: str = "prefix", limit: int = 50, cutoff: float = 0.6) -> List[Dict[str, Any]]:
+		"""Find symbols by exact, prefix or fuzzy name match; a trailing '*' forces a prefix match"""
+		fields = self._fields(field)
+		query = query.strip().lower()
+		if query.endswith("*"):
+			query, mode = query.rstrip("*"), "prefix"
+		if not query:
+			return []
+
+		results = []
+		if mode == "fuzzy":
+			# Closest names first, whatever their field
+			for key in self._fuzzy_keys(query, cutoff):
+				for f in fields:
+					for entry_id in self._exact[f].get(key, ()):
+						results.append(self.entries[entry_id])
+						if len(results) >= limit:
+							return results
+			return results
+		for f in fields:
+			if mode == "exact":
+				matched = [query] if query in self._exact[f] else []
+			elif mode == "prefix":
+				matched = self._prefix_keys(f, query)
+			else:
+				raise ValueError(f"Unknown mode {mode}, expected exact, prefix or fuzzy")
+			for key in matched:
+				for entry_id in self._exact[f][key]:
+					results.append(self.entries[entry_id])
+					if len(results) >= limit:
+						return results
+		return results
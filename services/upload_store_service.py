@@ -0,0 +1,246 @@
+import asyncio
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from services.project_session_service import PROJECTS_ROOT, project_path_for, project_sessions
+
+UPLOAD_STORE_DIR = os.environ.get("UPLOAD_STORE_DIR", os.path.join(PROJECTS_ROOT, ".upload_store"))
+UPLOAD_STORE_MAX_BYTES = int(os.environ.get("UPLOAD_STORE_MAX_BYTES", 5 * 1024 * 1024 * 1024))
+# Projects and blobs unused for this long (seconds) are collected
+UPLOAD_MAX_AGE = float(os.environ.get("UPLOAD_MAX_AGE", 24 * 3600))
+UPLOAD_GC_INTERVAL = float(os.environ.get("UPLOAD_GC_INTERVAL", 10 * 60))
+
+BLOB = "blob"
+TREE = "tree"
+
+
+class UploadStoreService:
+	"""Content-addressed store of uploaded archives (blobs) and their extracted sources (trees), keyed by SHA-256.
+
+	A project folder <PROJECTS_ROOT>/<project_id> is a symlink to its blob or tree, so projects uploaded
+	with the same archive share one copy on disk, and one parsed session since sessions key on the resolved path.
+	"""
+
+	def __init__(self, store_dir: str = None, max_bytes: int = None, max_age: float = None):
+		self.store_dir = os.path.realpath(store_dir or UPLOAD_STORE_DIR)
+		self.max_bytes = max_bytes if max_bytes is not None else UPLOAD_STORE_MAX_BYTES
+		self.max_age = max_age if max_age is not None else UPLOAD_MAX_AGE
+		for sub in ("blobs", "trees", "tmp"):
+			os.makedirs(os.path.join(self.store_dir, sub), exist_ok=True)
+		self._lock = threading.Lock()
+		self._hash_locks: Dict[str, list] = {}  # {digest: [lock, holders and waiters]}, dropped once unused
+		self._conn = sqlite3.connect(os.path.join(self.store_dir, "uploads.sqlite"), check_same_thread=False)
+		with self._lock, self._conn:
+			self._conn.execute("PRAGMA journal_mode=WAL")
+			self._conn.execute(
+				"CREATE TABLE IF NOT EXISTS entries (hash TEXT, kind TEXT, size INTEGER, last_used REAL, PRIMARY KEY (hash, kind))"
+			)
+			self._conn.execute(
+				"CREATE TABLE IF NOT EXISTS refs (project_id TEXT PRIMARY KEY, hash TEXT, kind TEXT, last_used REAL)"
+			)
+
+	def blob_path(self, digest: str) -> str:
+		return os.path.join(self.store_dir, "blobs", digest[:2], digest + ".zip")
+
+	def tree_path(self, digest: str) -> str:
+		return os.path.join(self.store_dir, "trees", digest)
+
+	def new_upload_path(self) -> str:
+		"""Temporary path for an incoming upload, on the store's filesystem so it can be moved in atomically"""
+		return os.path.join(self.store_dir, "tmp", uuid.uuid4().hex + ".part")
+
+	def add_blob(self, tmp_path: str, digest: str) -> Tuple[str, bool]:
+		"""Move a finished upload into the store; returns (blob path, whether it was already stored)"""
+		path = self.blob_path(digest)
+		with self._lock, self._conn:
+			known = os.path.isfile(path) and self._has(digest, BLOB)
+			if known:
+				os.unlink(tmp_path)
+			else:
+				os.makedirs(os.path.dirname(path), exist_ok=True)
+				os.replace(tmp_path, path)
+			self._conn.execute(
+				"INSERT OR REPLACE INTO entries (hash, kind, size, last_used) VALUES (?, ?, ?, ?)",
+				(digest, BLOB, os.path.getsize(path), time.time())
+			)
+		return path, known
+
+	def has_tree(self, digest: str) -> bool:
+		with self._lock:
+			return os.path.isdir(self.tree_path(digest)) and self._has(digest, TREE)
+
+	def add_tree(self, digest: str, size: int):
+		"""Record a fully extracted tree; until then it is treated as incomplete"""
+		with self._lock, self._conn:
+			self._conn.execute(
+				"INSERT OR REPLACE INTO entries (hash, kind, size, last_used) VALUES (?, ?, ?, ?)",
+				(digest, TREE, size, time.time())
+			)
+
+	def contains(self, path: str) -> bool:
+		"""True if the path resolves into the store, whose blobs and trees never change once added"""
+		return os.path.realpath(path).startswith(self.store_dir + os.sep)
+
+	@contextmanager
+	def hash_lock(self, digest: str) -> Iterator[None]:
+		"""Serialises extraction of one archive, so concurrent imports of it extract it once"""
+		with self._lock:
+			entry = self._hash_locks.setdefault(digest, [threading.Lock(), 0])
+			entry[1] += 1
+		try:
+			with entry[0]:
+				yield
+		finally:
+			with self._lock:
+				entry[1] -= 1
+				if not entry[1]:
+					del self._hash_locks[digest]
+
+	def link(self, project_id: str, digest: str, kind: str) -> str:
+		"""Point the project folder at a stored blob or tree and return the folder path"""
+		project_path = project_path_for(project_id)
+		if os.path.exists(project_path) and not os.path.islink(project_path):
+			raise ValueError(f"Project {project_id} already exists outside the upload store")
+		target = self.blob_path(digest) if kind == BLOB else self.tree_path(digest)
+		# Replace any previous link atomically, readers never see the folder missing
+		tmp_link = f"{project_path}.{uuid.uuid4().hex}.link"
+		os.symlink(target, tmp_link)
+		os.replace(tmp_link, project_path)
+		now = time.time()
+		with self._lock, self._conn:
+			self._conn.execute(
+				"INSERT OR REPLACE INTO refs (project_id, hash, kind, last_used) VALUES (?, ?, ?, ?)",
+				(project_id, digest, kind, now)
+			)
+			self._conn.execute("UPDATE entries SET last_used = ? WHERE hash = ? AND kind = ?", (now, digest, kind))
+		return project_path
+
+	def touch(self, project_id: str):
+		"""Mark a project as in use, so age-based collection keeps it"""
+		now = time.time()
+		with self._lock, self._conn:
+			row = self._conn.execute("SELECT hash, kind FROM refs WHERE project_id = ?", (project_id,)).fetchone()
+			if row is None:
+				return
+			self._conn.execute("UPDATE refs SET last_used = ? WHERE project_id = ?", (now, project_id))
+			self._conn.execute("UPDATE entries SET last_used = ? WHERE hash = ? AND kind = ?", (now, row[0], row[1]))
+
+	def size(self) -> int:
+		with self._lock:
+			return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+	def collect(self) -> Dict[str, int]:
+		"""Drop projects and entries unused for max_age, then least recently used entries until under max_bytes.
+
+		Victims are moved aside under the lock and deleted after it is released, so imports aren't held up by rmtree.
+		"""
+		now = time.time()
+		removed = {"projects": 0, "entries": 0, "bytes": 0}
+		trash = []
+		with self._lock, self._conn:
+			expired = self._conn.execute("SELECT project_id FROM refs WHERE last_used < ?", (now - self.max_age,)).fetchall()
+			for (project_id,) in expired:
+				self._unlink_project(project_id)
+				removed["projects"] += 1
+
+			# Unreferenced entries go first, then the oldest
+			rows = self._conn.execute(
+				"SELECT e.hash, e.kind, e.size, e.last_used, EXISTS (SELECT 1 FROM refs r WHERE r.hash = e.hash AND r.kind = e.kind) "
+				"FROM entries e ORDER BY 5, e.last_used"
+			).fetchall()
+			total = sum(row[2] for row in rows)
+			for digest, kind, size, last_used, referenced in rows:
+				if last_used >= now - self.max_age and total <= self.max_bytes:
+					continue
+				if referenced:
+					for (project_id,) in self._conn.execute(
+						"SELECT project_id FROM refs WHERE hash = ? AND kind = ?", (digest, kind)
+					).fetchall():
+						self._unlink_project(project_id)
+						removed["projects"] += 1
+				self._remove_entry(digest, kind, trash)
+				total -= size
+				removed["entries"] += 1
+				removed["bytes"] += size
+
+			self._remove_stale_files(now, trash)
+		for path in trash:
+			shutil.rmtree(path, ignore_errors=True)
+		return removed
+
+	async def run_gc(self, interval: float = None):
+		"""Collect periodically on the event loop's thread pool; meant to run as a background task"""
+		interval = interval if interval is not None else UPLOAD_GC_INTERVAL
+		while True:
+			try:
+				removed = await asyncio.to_thread(self.collect)
+				if removed["entries"] or removed["projects"]:
+					print(f"Upload store GC: removed {removed['projects']} projects, {removed['entries']} entries ({removed['bytes']} bytes)")
+			except Exception as e:
+				print(f"Upload store GC failed: {str(e)}")
+			await asyncio.sleep(interval)
+
+	def _has(self, digest: str, kind: str) -> bool:
+		return self._conn.execute("SELECT 1 FROM entries WHERE hash = ? AND kind = ?", (digest, kind)).fetchone() is not None
+
+	def _unlink_project(self, project_id: str):
+		project_path = project_path_for(project_id)
+		# The parsed session belongs to the blob or tree, which other projects may share
+		if os.path.islink(project_path):
+			os.unlink(project_path)
+		self._conn.execute("DELETE FROM refs WHERE project_id = ?", (project_id,))
+
+	def _remove_entry(self, digest: str, kind: str, trash: List[str]):
+		path = self.blob_path(digest) if kind == BLOB else self.tree_path(digest)
+		project_sessions.drop(path)
+		if kind == BLOB:
+			if os.path.isfile(path):
+				os.unlink(path)
+		else:
+			self._move_to_trash(path, trash)
+		self._conn.execute("DELETE FROM entries WHERE hash = ? AND kind = ?", (digest, kind))
+
+	def _move_to_trash(self, path: str, trash: List[str]):
+		"""Rename a tree out of the store, freeing its path at once; the caller deletes it outside the lock"""
+		if not os.path.isdir(path):
+			return
+		target = os.path.join(self.store_dir, "tmp", uuid.uuid4().hex + ".trash")
+		os.rename(path, target)
+		trash.append(target)
+
+	def _remove_stale_files(self, now: float, trash: List[str]):
+		"""Uploads and extractions left behind by a crash: temp files and trees never recorded as complete"""
+		tmp_dir = os.path.join(self.store_dir, "tmp")
+		for name in os.listdir(tmp_dir):
+			path = os.path.join(tmp_dir, name)
+			if name.endswith(".trash"):
+				# Left over by a collection that was interrupted while deleting
+				if path not in trash:
+					trash.append(path)
+			elif now - os.path.getmtime(path) > self.max_age:
+				os.unlink(path)
+		trees_dir = os.path.join(self.store_dir, "trees")
+		recorded = {row[0] for row in self._conn.execute("SELECT hash FROM entries WHERE kind = ?", (TREE,))}
+		for digest in os.listdir(trees_dir):
+			path = os.path.join(trees_dir, digest)
+			if digest not in recorded and now - os.path.getmtime(path) > self.max_age:
+				self._move_to_trash(path, trash)
+
+
+_upload_store: Optional[UploadStoreService] = None
+_upload_store_lock = threading.Lock()
+
+
+def get_upload_store() -> UploadStoreService:
+	"""Shared store, created on first use so importing this module touches nothing on disk"""
+	global _upload_store
+	with _upload_store_lock:
+		if _upload_store is None:
+			_upload_store = UploadStoreService()
+		return _upload_store
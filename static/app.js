@@ -6,6 +6,11 @@ const state = {
     results: null
 };
 
+let renderScheduled = false;
+const JOB_POLL_INTERVAL_MS = 500;
+// Files listed per page in the parse preview; the full summary is built server-side for the prompt
+const PREVIEW_PAGE_SIZE = 20;
+
 // DOM Elements
 const projectFileInput = document.getElementById('project-file');
 const transcriptFileInput = document.getElementById('transcript-file');
@@ -35,8 +40,8 @@ transcriptFileInput.addEventListener('change', (e) => {
     const file = e.target.files[0];
     if (file) {
         const fileName = file.name.toLowerCase();
-        if (!fileName.endsWith('.txt') && !fileName.endsWith('.docx')) {
-            showError('Veuillez sélectionner un fichier .txt ou .docx pour la transcription');
+        if (!['.txt', '.docx', '.vtt', '.srt'].some(ext => fileName.endsWith(ext))) {
+            showError('Veuillez sélectionner un fichier .txt, .docx, .vtt ou .srt pour la transcription');
             transcriptFileInput.value = '';
             return;
         }
@@ -64,9 +69,10 @@ generateBtn.addEventListener('click', async () => {
         
         const transcriptContent = await uploadTranscript();
         
-        const parsedProject = await parseProject();
+        // The parsed project stays on the server; only its stats come back
+        await parseProject();
         
-        await generateTodoList(parsedProject, transcriptContent);
+        await generateTodoList(transcriptContent);
         
         showLoading(false);
         showResults();
@@ -131,15 +137,16 @@ async function uploadTranscript() {
 }
 
 async function parseProject() {
-    const projectPath = `/tmp/${state.folderId}`;
-    
-    const response = await fetch('/api/parse-project', {
+    // Parsing runs as a background job so big projects don't hit request timeouts
+    const response = await fetch('/api/jobs/parse', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json'
         },
         body: JSON.stringify({
-            project_path: projectPath
+            project_id: state.folderId,
+            include_summary: false,
+            page_size: PREVIEW_PAGE_SIZE
         })
     });
     
@@ -154,24 +161,55 @@ async function parseProject() {
         throw new Error(errorMessage);
     }
     
-    const result = await response.json();
-    return result.parsed_project;
+    const job = await response.json();
+    const result = await waitForJob(job.id, 'Échec de l\'analyse du projet. Assurez-vous que le zip contient des fichiers PHP ou JavaScript.');
+    console.log('Parsed project:', {
+        fileCount: result.file_count,
+        filesWithSymbols: result.files_with_symbols,
+        pages: result.pages
+    });
+    return result;
 }
 
-// Generate todo list via API
-async function generateTodoList(parsedProject, transcript) {
+// Poll a background job until it finishes and return its result
+async function waitForJob(jobId, failureMessage) {
+    while (true) {
+        const response = await fetch(`/api/jobs/${jobId}`);
+        if (!response.ok) {
+            throw new Error(`${failureMessage} (Statut : ${response.status})`);
+        }
+        
+        const job = await response.json();
+        if (job.status === 'succeeded') {
+            break;
+        }
+        if (job.status === 'failed' || job.status === 'cancelled') {
+            throw new Error(job.error || failureMessage);
+        }
+        await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    }
+    
+    const resultResponse = await fetch(`/api/jobs/${jobId}/result`);
+    if (!resultResponse.ok) {
+        throw new Error(`${failureMessage} (Statut : ${resultResponse.status})`);
+    }
+    return await resultResponse.json();
+}
+
+// Generate todo list via the streaming API, rendering each section as it fills in
+async function generateTodoList(transcript) {
     console.log('Generating todo list with:', {
-        parsedProjectLength: parsedProject?.length,
+        projectId: state.folderId,
         transcriptLength: transcript?.length
     });
     
-    const response = await fetch('/api/generate-todolist', {
+    const response = await fetch('/api/generate-todolist/stream', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json'
         },
         body: JSON.stringify({
-            parsed_project: parsedProject,
+            project_id: state.folderId,
             transcript: transcript
         })
     });
@@ -189,7 +227,47 @@ async function generateTodoList(parsedProject, transcript) {
         throw new Error(errorMessage);
     }
     
-    state.results = await response.json();
+    state.results = { context: '', technical_todolist: '', clarifications: '' };
+    let completed = false;
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        
+        for (const line of lines) {
+            if (!line.trim()) continue;
+            const event = JSON.parse(line);
+            
+            if (event.event === 'error') {
+                throw new Error(event.detail || 'Échec de la génération de la liste de todos');
+            } else if (event.event === 'delta') {
+                state.results[event.field] += event.text;
+            } else if (event.event === 'done') {
+                state.results[event.field] = event.value;
+            } else if (event.event === 'complete') {
+                state.results = {
+                    context: event.context,
+                    technical_todolist: event.technical_todolist,
+                    clarifications: event.clarifications
+                };
+                completed = true;
+            }
+        }
+        
+        // Show the results as soon as the first content arrives
+        showLoading(false);
+        showResults();
+    }
+    
+    if (!completed) {
+        throw new Error('La génération a été interrompue avant la fin');
+    }
     
     await buildOutput();
 }
@@ -226,12 +304,18 @@ function showResults() {
     uploadSection.style.display = 'none';
     resultsSection.style.display = 'block';
     
-    document.getElementById('context-content').innerHTML =
-        formatContent(state.results.context);
-    document.getElementById('todo-content').innerHTML = 
-        formatContent(state.results.technical_todolist);
-    document.getElementById('clarifications-content').innerHTML = 
-        formatContent(state.results.clarifications);
+    // Streaming calls this for every chunk; render at most once per frame
+    if (renderScheduled) return;
+    renderScheduled = true;
+    requestAnimationFrame(() => {
+        renderScheduled = false;
+        document.getElementById('context-content').innerHTML =
+            formatContent(state.results.context);
+        document.getElementById('todo-content').innerHTML = 
+            formatContent(state.results.technical_todolist);
+        document.getElementById('clarifications-content').innerHTML = 
+            formatContent(state.results.clarifications);
+    });
 }
 
 // Format content for display
@@ -0,0 +1,70 @@
+from pathlib import Path
+import sys
+import pytest
+
+# Ensure project root is importable
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.analysis_artifact_service import AnalysisArtifact, write_artifact
+from services.parser_service import ParserService, EXTRACTOR_VERSION
+
+
+def _project(root: Path) -> Path:
+	(root / "app").mkdir(parents=True)
+	(root / "app" / "User.php").write_text("<?php\nnamespace App;\nuse App\\Post;\nclass User { public $name; public function posts(): array {} }\n")
+	(root / "app" / "Post.php").write_text("<?php\nnamespace App;\nclass Post { public function author(): User {} }\n")
+	(root / "app" / "Comment.php").write_text("<?php\nclass Comment {}\n")
+	(root / "app" / "cart.js").write_text("export class Cart { total() { return 0; } }\n")
+	return root
+
+
+def _parse(path: Path) -> ParserService:
+	parser = ParserService(workers=1)
+	parser.set_ast(str(path))
+	return parser
+
+
+def _build(project: Path, artifact: Path) -> int:
+	return _parse(project).write_artifact(str(artifact))
+
+
+def test_artifact_round_trip(tmp_path):
+	project = _project(tmp_path / "project")
+	artifact = tmp_path / "project.analysis.jsonl"
+	assert _build(project, artifact) == 4
+
+	loaded = _parse(artifact)
+	assert loaded.extract_all_symbol_dicts() == _parse(project).extract_all_symbol_dicts()
+	assert loaded.extract_all_symbols() == _parse(project).extract_all_symbols()
+	assert AnalysisArtifact(str(artifact)).root == str(project)
+
+
+def test_other_extractor_version_is_rejected(tmp_path):
+	artifact = tmp_path / "old.analysis.jsonl"
+	write_artifact(str(artifact), "/p", EXTRACTOR_VERSION + "-old", [("a.php", "x", {"classes": []})])
+	with pytest.raises(ValueError, match="rebuild"):
+		AnalysisArtifact(str(artifact), EXTRACTOR_VERSION)
+	with pytest.raises(ValueError):
+		_parse(artifact)
+	# Without an expected version any extractor is accepted
+	assert list(AnalysisArtifact(str(artifact)).files) == ["a.php"]
+
+
+def test_update_ast_picks_up_a_rebuilt_artifact(tmp_path):
+	project = _project(tmp_path / "project")
+	artifact = tmp_path / "project.analysis.jsonl"
+	_build(project, artifact)
+	parser = _parse(artifact)
+	parser.symbol_index()
+	assert parser.update_ast() == {"added": [], "removed": [], "modified": []}
+
+	(project / "app" / "Comment.php").unlink()
+	(project / "app" / "Post.php").write_text("<?php\nnamespace App;\nclass Post { public function title(): string {} }\n")
+	(project / "app" / "Tag.php").write_text("<?php\nclass Tag {}\n")
+	_build(project, artifact)
+
+	assert parser.update_ast() == {"added": ["app/Tag.php"], "removed": ["app/Comment.php"], "modified": ["app/Post.php"]}
+	assert parser.extract_all_symbol_dicts() == _parse(project).extract_all_symbol_dicts()
+	assert parser.symbol_index().search("title", mode="exact")
+	assert not parser.symbol_index().search("comment", mode="exact")
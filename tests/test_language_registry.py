@@ -0,0 +1,104 @@
+from pathlib import Path
+import sys
+import pytest
+
+# Ensure project root is importable
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from tree_sitter import Parser
+
+from services.language_registry import LanguageRegistry, languages, php_members, ts_members
+
+# The declarations the finders report, written as queries: a language registered with them must extract the same symbols
+PHP_QUERY = """
+(class_declaration name: (_) @name) @class
+(interface_declaration name: (_) @name) @interface
+(trait_declaration name: (_) @name) @trait
+(enum_declaration name: (_) @name) @enum
+(program (function_definition name: (_) @name) @function)
+(namespace_definition body: (compound_statement (function_definition name: (_) @name) @function))
+"""
+TS_QUERY = "".join(f"(program {p})\n(program (export_statement {p}))\n" for p in (
+	"(class_declaration name: (_) @name) @class",
+	"(abstract_class_declaration name: (_) @name) @class",
+	"(interface_declaration name: (_) @name) @interface",
+	"(function_declaration name: (_) @name) @function",
+	"(generator_function_declaration name: (_) @name) @function",
+	"(lexical_declaration (variable_declarator name: (identifier) @name value: [(arrow_function) (function_expression)]) @function)",
+	"(variable_declaration (variable_declarator name: (identifier) @name value: [(arrow_function) (function_expression)]) @function)",
+)) + "(export_statement value: (class name: (_) @name) @class)\n"
+
+PHP_CODE = """<?php
+namespace App\\One {
+	function in_namespace(): int { return 1; }
+	class Scoped extends \\Base\\Model { public function __construct(private int $id, $plain) {} }
+}
+namespace App\\Two {
+	interface Shape extends Countable, \\JsonSerializable { public function area(): float; }
+	trait Greets { protected $greeting = 'hi'; public function greet(): string { return ''; } }
+	enum Suit: string { case Hearts = 'H'; public function color(): string { return 'Red'; } }
+}
+"""
+PHP_FLAT_CODE = """<?php
+if (!class_exists('Polyfill')) {
+	class Polyfill { public $a, $b; public function run(): void {} }
+	function helper_in_if() {}
+}
+function outer() {
+	class InFunction { private $x; }
+	function inner() {}
+}
+try { class InTry {} } catch (\\Exception $e) {}
+abstract class Top extends Base { abstract protected function thing(); }
+"""
+TS_CODE = """
+let x = 1, y = () => 2, { z } = { z: () => 3 };
+export const handler = async function () {};
+function* gen() {}
+export default class extends Base { anon() {} }
+export interface Props extends Base, Other<T> { id: number; label?: string; onChange(value: number): void; }
+export abstract class Store<T> extends BaseStore<T> implements I {
+	private items: T[] = [];
+	abstract load(id: number): Promise<T>;
+	get size(): number { return 0; }
+}
+if (true) { class Hidden {} }
+"""
+
+
+@pytest.mark.parametrize("name,code,query,members", [
+	("php", PHP_CODE, PHP_QUERY, php_members),
+	("php", PHP_FLAT_CODE, PHP_QUERY, php_members),
+	("tsx", TS_CODE, TS_QUERY, ts_members),
+])
+def test_declaration_finders_match_their_queries(name, code, query, members):
+	spec = languages[name]
+	root = Parser(spec.language).parse(code.encode("utf8")).root_node
+	registry = LanguageRegistry()
+	query_spec = registry.register(name, [], spec.module, spec.function, symbol_query=query, members=members)
+	symbols = spec.extract(root)
+	assert symbols == query_spec.extract(root)
+	assert len(symbols) >= 5
+
+
+def test_extracted_symbols():
+	spec = languages["php"]
+	symbols = {s["class"]: s for s in spec.extract(Parser(spec.language).parse(PHP_CODE.encode("utf8")).root_node)}
+	assert list(symbols) == ["in_namespace", "Scoped", "Shape", "Greets", "Suit"]
+	assert symbols["Scoped"]["extends"] == "\\Base\\Model"
+	assert symbols["Scoped"]["properties"] == ["$id"]
+	assert symbols["Shape"] == {"class": "Shape", "extends": "\\JsonSerializable", "properties": [],
+		"methods": [{"name": "area", "return": "float"}], "type": "interface"}
+	assert symbols["Suit"]["type"] == "enum" and symbols["Suit"]["methods"] == [{"name": "color", "return": "string"}]
+	# Classes in blocks within three levels of the file are found, functions only at the top or in a namespace block
+	symbols = spec.extract(Parser(spec.language).parse(PHP_FLAT_CODE.encode("utf8")).root_node)
+	assert [s["class"] for s in symbols] == ["Polyfill", "outer", "InFunction", "InTry", "Top"]
+	assert symbols[0]["properties"] == ["$a", "$b"]
+
+	spec = languages["ts"]
+	symbols = {s["class"]: s for s in spec.extract(Parser(spec.language).parse(("const é = 'ü';\n" + TS_CODE).encode("utf8")).root_node)}
+	assert list(symbols) == ["y", "handler", "gen", "Props", "Store"]
+	assert symbols["Props"]["properties"] == ["id: number", "label: string"]
+	assert symbols["Store"]["extends"] == "BaseStore"
+	assert symbols["Store"]["methods"] == [{"name": "load", "return": "Promise<T>"}, {"name": "size", "return": "number"}]
@@ -1,4 +1,5 @@
 from pathlib import Path
+import os
 import sys
 import pytest
 
@@ -6,29 +7,31 @@ import pytest
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from parser.parser import CustomParser, EXCLUDED_DIRS, EXCLUDED_EXTENSIONS
+from benchmarks.synthetic_project import generate_project
+from services.parser_service import ParserService, EXCLUDED_DIRS, EXCLUDED_EXTENSIONS, EXTRACTOR_VERSION, file_language
+from services.symbol_cache_service import SymbolCacheService
 
-EXAMPLE_PATH = "../php_js_project_example/pomopensource"
 LANG_SUFFIXES = {'.php', '.js', '.jsx', '.ts', '.tsx'}
-project_test = (Path(__file__).resolve().parent / EXAMPLE_PATH).resolve()
 
 
-def test_parse_file():
-	if not project_test.exists():
-		print(f"Test project path does not exist: {project_test}")
-		return
-	parser = CustomParser(str(project_test))
-	ast = parser.set_ast()  # no argument needed
+@pytest.fixture(scope="module")
+def project_test(tmp_path_factory):
+	"""Small generated Laravel/React-style project, with vendor/node_modules bulk and blade views"""
+	root = tmp_path_factory.mktemp("project")
+	generate_project(str(root), files=40, excluded_files=20)
+	return root
+
+
+def test_parse_file(project_test):
+	parser = ParserService(workers=1)
+	ast = parser.set_ast(str(project_test))
 	print("AST object type:", type(ast))
 	assert isinstance(ast, dict)
 
-def test_extract_symbols():
+def test_extract_symbols(project_test):
 	"""Test extraction of classes, properties, and methods from PHP files."""
-	if not project_test.exists():
-		print(f"Test project path does not exist: {project_test}")
-		return
-	parser = CustomParser(str(project_test))
-	parser.set_ast()
+	parser = ParserService(workers=1)
+	parser.set_ast(str(project_test))
 	for file_name in parser._parsed_folder_tree.keys():
 		if not file_name.endswith(".php"):
 			continue
@@ -63,13 +66,13 @@ def _is_excluded_file(file: Path) -> bool:
 	return False
 
 
-@pytest.mark.parametrize("project_rel", ["../php_js_project_example/pomopensource"])
-def test_parse_folder_includes_all_non_ignored_files(project_rel):
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_folder_includes_all_non_ignored_files(project_test, workers):
 	project_root = project_test
 	assert project_root.exists(), f"Project path not found: {project_root}"
 
-	parser = CustomParser(str(project_root))
-	ast = parser.set_ast()
+	parser = ParserService(workers=workers, chunk_size=8)
+	ast = parser.set_ast(str(project_root))
 	actual = set(ast.keys())
 
 	expected = set()
@@ -93,3 +96,115 @@ def test_parse_folder_includes_all_non_ignored_files(project_rel):
 		f"Missing (should have been parsed): {missing[:50]}{' …' if len(missing) > 50 else ''}\n"
 		f"Unexpected (should NOT have been parsed): {unexpected[:50]}{' …' if len(unexpected) > 50 else ''}"
 	)
+
+
+def test_dependency_graph(tmp_path):
+	"""PHP use/extends and JS/TS imports become edges, patched when files change"""
+	files = {
+		"app/Models/Model.php": "<?php\nnamespace App\\Models;\nabstract class Model {}\n",
+		"app/Models/User.php": "<?php\nnamespace App\\Models;\nclass User extends Model {}\n",
+		"app/Http/UserController.php": "<?php\nnamespace App\\Http;\nuse App\\Models\\{User as Customer};\nclass UserController { }\n",
+		"resources/js/api/index.ts": "export * from './users';\n",
+		"resources/js/api/users.ts": "export function fetchUsers() {}\n",
+		"resources/js/UserList.tsx": "import React from 'react';\nimport { fetchUsers } from '@/api';\n",
+	}
+	for rel, code in files.items():
+		(tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+		(tmp_path / rel).write_text(code)
+
+	parser = ParserService(workers=1)
+	parser.set_ast(str(tmp_path))
+	graph = parser.dependency_graph()
+	assert graph.dependencies("app/Models/User.php") == ["app/Models/Model.php"]
+	assert graph.dependencies("app/Http/UserController.php") == ["app/Models/User.php"]
+	assert graph.dependencies("resources/js/UserList.tsx") == ["resources/js/api/index.ts"]
+	assert graph.neighborhood(["app/Models/Model.php"], hops=2, direction="in") == {
+		"app/Models/Model.php": 0, "app/Models/User.php": 1, "app/Http/UserController.php": 2,
+	}
+	assert graph.seeds("le user controller plante") == ["app/Http/UserController.php"]
+
+	(tmp_path / "app/Models/Model.php").unlink()
+	parser.update_ast()
+	assert graph.dependencies("app/Models/User.php") == []
+	assert "app/Models/Model.php" not in graph
+
+
+def test_symbol_index_follows_updates(tmp_path):
+	"""The index patched by update_ast answers like one built from a fresh parse"""
+	generate_project(str(tmp_path), files=30, excluded_files=0)
+	parser = ParserService(workers=1)
+	parser.set_ast(str(tmp_path))
+	index = parser.symbol_index()
+
+	php_files = sorted(p for p in tmp_path.rglob("*.php") if not p.name.endswith(".blade.php"))
+	php_files[0].unlink()
+	php_files[1].write_text("<?php\nclass RenamedInvoiceExporter { public function exportPdf(): string {} }\n")
+	(tmp_path / "app" / "ShipmentTracker.php").write_text("<?php\nclass ShipmentTracker { public function trackParcel(): void {} }\n")
+	parser.update_ast()
+	assert parser.symbol_index() is index
+
+	fresh = ParserService(workers=1)
+	fresh.set_ast(str(tmp_path))
+	for query, mode in (("renamedinvoiceexporter", "exact"), ("track", "prefix"), ("shipmnttracker", "fuzzy"), ("get", "prefix")):
+		found = index.search(query, mode=mode, limit=1000)
+		expected = fresh.symbol_index().search(query, mode=mode, limit=1000)
+		key = lambda e: (e["field"], e["name"], e["file"], e["class"] or "")
+		assert sorted(map(key, found)) == sorted(map(key, expected))
+	assert not index.search(php_files[0].name, field="path", mode="exact")
+
+
+def test_update_ast_matches_a_fresh_parse(tmp_path):
+	"""Edited, added and removed files give the symbols a fresh parse of the project gives"""
+	generate_project(str(tmp_path), files=30, excluded_files=5)
+	parser = ParserService(workers=1)
+	parser.set_ast(str(tmp_path))
+	parser.extract_all_symbol_dicts()
+
+	php_files = sorted(p for p in tmp_path.rglob("*.php") if not p.name.endswith(".blade.php"))
+	ts_files = sorted(tmp_path.rglob("*.ts*"))
+	# Edits in the middle of a file go through tree-sitter's incremental re-parse of the edited old tree
+	code = php_files[0].read_text()
+	middle = code.index("public function")
+	php_files[0].write_text(code[:middle] + "public function addedInTheMiddle(): ?int { return null; }\n\t" + code[middle:])
+	code = php_files[1].read_text()
+	php_files[1].write_text(code.replace("class ", "final class Renamed", 1))
+	code = ts_files[0].read_text()
+	ts_files[0].write_text("export interface Inserted { id: number; label?: string }\n" + code[:len(code) // 2])
+	php_files[2].unlink()
+	ts_files[1].unlink()
+	(tmp_path / "app" / "Added.php").write_text("<?php\nnamespace App;\nclass Added extends Base { private $x; public function go(): void {} }\n")
+	(tmp_path / "resources" / "js" / "added.ts").write_text("export class Added extends Base { name: string; run(): void {} }\n")
+	# Only the mtime moves: not a change
+	os.utime(php_files[3], ns=(php_files[3].stat().st_atime_ns, php_files[3].stat().st_mtime_ns + 10 ** 9))
+
+	changes = parser.update_ast()
+	rel = lambda p: p.relative_to(tmp_path).as_posix()
+	assert sorted(changes["modified"]) == sorted(map(rel, (php_files[0], php_files[1], ts_files[0])))
+	assert sorted(changes["removed"]) == sorted(map(rel, (php_files[2], ts_files[1])))
+	assert sorted(changes["added"]) == ["app/Added.php", "resources/js/added.ts"]
+
+	fresh = ParserService(workers=1)
+	fresh.set_ast(str(tmp_path))
+	assert parser.extract_all_symbol_dicts() == fresh.extract_all_symbol_dicts()
+	assert parser.extract_all_symbols() == fresh.extract_all_symbols()
+	assert parser.update_ast() == {"added": [], "removed": [], "modified": []}
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_parallel_parse_matches_serial(project_test, tmp_path, cached):
+	"""Workers give exactly the serial output, also when part of the files come from the symbol cache"""
+	serial = ParserService(workers=1)
+	serial.set_ast(str(project_test))
+	cache = SymbolCacheService(EXTRACTOR_VERSION, cache_dir=str(tmp_path)) if cached else None
+	if cache is not None:
+		# Half the files cached by an earlier parse, the rest parsed by the workers
+		files = sorted(serial._parsed_folder_tree.items())
+		ParserService(workers=1, cache=cache).set_ast(str(project_test), files=[
+			(path, file_language(path.rsplit("/", 1)[-1])) for path, _ in files[::2]
+		])
+	parallel = ParserService(workers=2, chunk_size=8, cache=cache)
+	parallel.set_ast(str(project_test))
+	# Trees stay in the workers (or were never built for cached files)
+	assert all(tree is None for tree in parallel._parsed_folder_tree.values())
+	assert parallel.extract_all_symbol_dicts() == serial.extract_all_symbol_dicts()
+	assert parallel.extract_all_symbols() == serial.extract_all_symbols()
@@ -0,0 +1,82 @@
+from pathlib import Path
+import json
+import sys
+import pytest
+
+# Ensure project root is importable
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from utils.partial_json import JsonFieldStreamer
+
+
+def _feed(chunks):
+	"""Events of a stream fed chunk by chunk, with the streamer holding the parsed values"""
+	streamer = JsonFieldStreamer()
+	events = []
+	for chunk in chunks:
+		events.extend(streamer.feed(chunk))
+	return streamer, events
+
+
+def _split_everywhere(text):
+	"""The text cut in two at every position, then one character per chunk"""
+	for i in range(len(text) + 1):
+		yield [text[:i], text[i:]]
+	yield list(text)
+
+
+def _deltas(events, key):
+	return "".join(value for event, k, value in events if event == "delta" and k == key)
+
+
+DOCUMENT = {
+	"contexte": "Ligne 1\nLigne \"2\"\t\\ fin / ok",
+	"technical_todolist": "Émoji 😀 puis é et  ",
+	"estimation": 3.5,
+	"urgent": False,
+	"assignee": None,
+	"sous_taches": [{"titre": "a}b", "tags": ["x", "[y]"]}, {"titre": "quote \" and \\"}],
+	"meta": {"depth": {"deeper": [1, 2, {"x": "}"}]}},
+	"clarifications_requises": "",
+}
+
+
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_any_chunking_yields_the_json_values(ensure_ascii):
+	"""Escapes (\\uXXXX surrogate pairs included) and nested values survive being cut anywhere"""
+	text = json.dumps(DOCUMENT, ensure_ascii=ensure_ascii)
+	for chunks in _split_everywhere(text):
+		streamer, events = _feed(chunks)
+		assert streamer.values == DOCUMENT, chunks
+		for key, value in DOCUMENT.items():
+			assert ("done", key, value) in events
+			if isinstance(value, str):
+				assert _deltas(events, key) == value
+
+
+def test_split_escape_yields_no_partial_text():
+	streamer, events = _feed(['{"contexte": "a\\', 'nb\\u00', 'e9\\ud83d', '\\ude00"}'])
+	assert events == [
+		("delta", "contexte", "a"),
+		("delta", "contexte", "\nb"),
+		("delta", "contexte", "é"),
+		("delta", "contexte", "😀"),
+		("done", "contexte", "a\nbé😀"),
+	]
+
+
+def test_non_string_values_only_yield_done():
+	_, events = _feed(['{"n": 1', '2, "ok": tr', 'ue, "none": null, "list": [1, ', '"a"], "obj": {"k": {}}}'])
+	assert events == [
+		("done", "n", 12),
+		("done", "ok", True),
+		("done", "none", None),
+		("done", "list", [1, "a"]),
+		("done", "obj", {"k": {}}),
+	]
+
+
+def test_malformed_stream_raises():
+	with pytest.raises(ValueError):
+		_feed(['{"contexte" "oops"}'])
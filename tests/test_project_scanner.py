@@ -0,0 +1,124 @@
+from pathlib import Path
+import sys
+import pytest
+
+# Ensure project root is importable
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.parser_service import EXCLUDED, ParserService, file_language
+from utils.project_scanner import ExcludedDirs, GitIgnore, ProjectScanner
+
+
+def _write(root: Path, files):
+	for rel, content in files.items():
+		(root / rel).parent.mkdir(parents=True, exist_ok=True)
+		(root / rel).write_text(content)
+
+
+def _scan(root: Path, respect_gitignore: bool = False):
+	scanner = ProjectScanner(EXCLUDED, file_language, respect_gitignore=respect_gitignore)
+	return sorted(path for path, _ in scanner.scan(str(root))), scanner.stats
+
+
+def test_excluded_dirs_match_whole_components():
+	excluded = ExcludedDirs(["vendor", "bootstrap/cache", "public\\build/"])
+	assert excluded.is_excluded_dir(("vendor",))
+	assert excluded.is_excluded_dir(("packages", "bootstrap", "cache"))
+	assert excluded.is_excluded_dir(("public", "build"))
+	assert not excluded.is_excluded_dir(("vendors",))
+	assert not excluded.is_excluded_dir(("cache",))
+	assert not excluded.is_excluded_dir(("build",))
+	assert excluded.contains("app/vendor/x.php")
+	assert excluded.contains("bootstrap/cache/services.php")
+	assert not excluded.contains("app/vendor.php")
+	assert not excluded.contains("bootstrap/app.php")
+
+
+def test_scanner_prunes_excluded_dirs_and_files(tmp_path):
+	_write(tmp_path, {
+		"app/User.php": "<?php class User {}",
+		"app/vendor/Inner.php": "<?php class Inner {}",
+		"vendor/laravel/Framework.php": "<?php class Framework {}",
+		"node_modules/react/index.js": "module.exports = {}",
+		"bootstrap/cache/services.php": "<?php return [];",
+		"public/build/app.js": "var a;",
+		"public/app.js": "var a;",
+		"resources/views/home.blade.php": "<div></div>",
+		"resources/js/App.tsx": "export const App = () => null;",
+		"README.md": "# readme",
+	})
+	(tmp_path / "linked").symlink_to(tmp_path / "vendor", target_is_directory=True)
+
+	paths, stats = _scan(tmp_path)
+	assert paths == ["app/User.php", "public/app.js", "resources/js/App.tsx"]
+	# vendor twice (top level and under app), node_modules, bootstrap and public/build
+	assert stats.dirs_pruned == 5
+	assert stats.files_matched == 3
+	assert stats.files_considered == 5
+
+
+GITIGNORE_CASES = [
+	# (pattern, ignored paths, kept paths); paths ending with "/" are directories
+	("*.log", ["debug.log", "app/deep/x.log"], ["log.txt", "app/x.log.php"]),
+	("/Legacy.php", ["Legacy.php"], ["app/Legacy.php"]),
+	("app/Generated", ["app/Generated", "app/Generated/"], ["src/app/Generated"]),
+	("tmp/", ["tmp/", "app/tmp/"], ["tmp"]),
+	("**/fixtures", ["fixtures/", "a/b/fixtures/", "fixtures"], ["fixtures2/"]),
+	("docs/**/*.md", ["docs/a.md", "docs/x/y/a.md"], ["a/docs/a.md"]),
+	("build/**", ["build/x.js", "build/a/b.js"], ["build/"]),
+	("Test?.php", ["Test1.php", "app/TestA.php"], ["Test10.php", "Test/.php"]),
+	("[Bb]ackup*", ["backup.php", "Backup_old/"], ["xbackup.php"]),
+	("cache[!s]", ["cache1", "cachex/"], ["caches", "cache"]),
+	("\\#notes", ["#notes"], ["notes"]),
+]
+
+
+@pytest.mark.parametrize("pattern,ignored,kept", GITIGNORE_CASES)
+def test_gitignore_patterns(tmp_path, pattern, ignored, kept):
+	(tmp_path / ".gitignore").write_text(f"# comment\n\n{pattern}\n")
+	gitignore = GitIgnore()
+	gitignore.add_file(str(tmp_path / ".gitignore"), ())
+	for path in ignored:
+		assert gitignore.ignored(tuple(path.rstrip("/").split("/")), path.endswith("/")), path
+	for path in kept:
+		assert not gitignore.ignored(tuple(path.rstrip("/").split("/")), path.endswith("/")), path
+
+
+def test_gitignore_negation_and_nested_files(tmp_path):
+	_write(tmp_path, {
+		".gitignore": "*.generated.ts\n!keep.generated.ts\nlegacy/\n",
+		"resources/js/.gitignore": "/local.ts\n!*.generated.ts\n",
+		"resources/js/api.generated.ts": "export {};",
+		"resources/js/local.ts": "export {};",
+		"resources/js/deep/local.ts": "export {};",
+		"app/model.generated.ts": "export {};",
+		"app/keep.generated.ts": "export {};",
+		"app/legacy/Old.php": "<?php class Old {}",
+		"app/User.php": "<?php class User {}",
+	})
+	paths, stats = _scan(tmp_path, respect_gitignore=True)
+	assert paths == [
+		"app/User.php",
+		"app/keep.generated.ts",
+		# The nested .gitignore negates the root rule below it and anchors /local.ts to its own folder
+		"resources/js/api.generated.ts",
+		"resources/js/deep/local.ts",
+	]
+	assert stats.files_ignored == 2
+	assert stats.dirs_pruned == 1
+
+	all_paths, _ = _scan(tmp_path)
+	assert len(all_paths) == 7
+
+
+def test_parser_respects_gitignore_when_asked(tmp_path):
+	_write(tmp_path, {
+		".gitignore": "generated/\n",
+		"app/User.php": "<?php class User {}",
+		"app/generated/Proxy.php": "<?php class Proxy {}",
+	})
+	assert sorted(ParserService(workers=1, respect_gitignore=True).set_ast(str(tmp_path))) == ["app/User.php"]
+	assert sorted(ParserService(workers=1, respect_gitignore=False).set_ast(str(tmp_path))) == [
+		"app/User.php", "app/generated/Proxy.php",
+	]
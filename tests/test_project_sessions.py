@@ -0,0 +1,84 @@
+from pathlib import Path
+import sys
+import threading
+import time
+
+# Ensure project root is importable
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.parser_service import ParserService
+from services.project_session_service import ProjectSessionRegistry
+
+
+class _Registry(ProjectSessionRegistry):
+	"""Registry without the on-disk symbol cache"""
+
+	def new_service(self) -> ParserService:
+		return ParserService(workers=1)
+
+
+def _project(root: Path, name: str, size: int = 1) -> str:
+	path = root / name
+	(path / "app").mkdir(parents=True)
+	(path / "app" / "User.php").write_text("<?php\nclass User { public function name(): string {} }\n" * size)
+	return str(path)
+
+
+def test_sessions_are_reused_and_refreshed(tmp_path):
+	registry = _Registry()
+	project = _project(tmp_path, "a")
+	service = registry.get(project)
+	assert registry.get(project + "/app/..") is service
+
+	Path(project, "app", "Post.php").write_text("<?php\nclass Post {}\n")
+	assert not registry.get(project, refresh=False).has_file("app/Post.php")
+	assert registry.get(project).has_file("app/Post.php")
+
+
+def test_idle_sessions_expire(tmp_path):
+	registry = _Registry(idle_ttl=0.05)
+	first = registry.get(_project(tmp_path, "a"))
+	time.sleep(0.1)
+	registry.get(_project(tmp_path, "b"))
+	assert registry.get(str(tmp_path / "a")) is not first
+
+
+def test_least_recently_used_sessions_go_over_budget(tmp_path):
+	a, b, c = (_project(tmp_path, name, size=20) for name in "abc")
+	service_a = _Registry().get(a)
+	# Room for two of the three projects
+	registry = _Registry(max_bytes=int(service_a.estimated_size() * 2.5))
+	service_a = registry.get(a)
+	service_b = registry.get(b)
+	registry.get(a)
+	registry.get(c)
+	assert registry.get(a, refresh=False) is service_a
+	assert registry.get(b, refresh=False) is not service_b
+
+	# The project just asked for is kept even when it alone is over budget
+	tiny = _Registry(max_bytes=1)
+	service_c = tiny.get(c)
+	assert tiny.get(c) is service_c
+
+
+def test_use_holds_refreshes_until_the_read_is_done(tmp_path):
+	registry = _Registry()
+	project = _project(tmp_path, "a")
+	registry.get(project)
+	refreshed = threading.Event()
+
+	def refresh():
+		registry.get(project)
+		refreshed.set()
+
+	with registry.use(project) as service:
+		index = service.symbol_index()
+		Path(project, "app", "Post.php").write_text("<?php\nclass Post {}\n")
+		thread = threading.Thread(target=refresh)
+		thread.start()
+		assert not refreshed.wait(0.2)
+		assert not index.search("post", mode="exact")
+	thread.join()
+	assert refreshed.is_set()
+	assert index.search("post", mode="exact")
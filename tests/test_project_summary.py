@@ -0,0 +1,62 @@
+from pathlib import Path
+import sys
+
+# Ensure project root is importable
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.parser_service import ParserService
+
+DOMAINS = ("Invoice", "User", "Order", "Payment", "Customer", "Product", "Shipment")
+
+
+def _controller(domain: str) -> str:
+	methods = "\n".join(
+		f"\tpublic function {verb}{domain}(int $id): array {{ return []; }}"
+		for verb in ("index", "show", "store", "update", "destroy", "search")
+	)
+	return (
+		"<?php\nnamespace App\\Http\\Controllers;\n\nuse App\\Models\\Invoice;\n\n"
+		f"class {domain}Controller extends Controller\n{{\n{methods}\n}}\n"
+	)
+
+
+def _write_project(root: Path):
+	files = {
+		"app/Http/Controllers/Controller.php": "<?php\nnamespace App\\Http\\Controllers;\nabstract class Controller {}\n",
+		"app/Models/Invoice.php": "<?php\nnamespace App\\Models;\nclass Invoice { protected int $total; }\n",
+		"app/Services/Billing/InvoicePdfExporter.php": (
+			"<?php\nnamespace App\\Services\\Billing;\n"
+			"class InvoicePdfExporter { public function exportPdf(int $invoiceId): string { return ''; } }\n"
+		),
+	}
+	for domain in DOMAINS:
+		files[f"app/Http/Controllers/{domain}Controller.php"] = _controller(domain)
+	for rel, code in files.items():
+		(root / rel).parent.mkdir(parents=True, exist_ok=True)
+		(root / rel).write_text(code)
+
+
+def test_relevant_file_outside_the_neighborhood_is_kept(tmp_path):
+	"""The graph lifts the files around the named controller without pushing out the exporter the transcript is about"""
+	_write_project(tmp_path)
+	parser = ParserService(workers=1)
+	parser.set_ast(str(tmp_path))
+
+	transcript = "Le invoice controller renvoie une erreur, et l'export pdf de l'invoice sort vide."
+	summary = parser.project_summary().build(transcript, token_budget=600)
+	assert "InvoiceController.php" in summary
+	assert "InvoicePdfExporter.php" in summary
+	# Every other controller is two hops away, through the base Controller, and not all of them fit
+	assert "fichiers omis" in summary
+
+
+def test_generic_names_seed_nothing(tmp_path):
+	"""A word of many file names, like Controller, does not seed the base class every controller extends"""
+	_write_project(tmp_path)
+	parser = ParserService(workers=1)
+	parser.set_ast(str(tmp_path))
+	graph = parser.dependency_graph()
+
+	assert graph.seeds("le controller plante") == []
+	assert graph.seeds("le payment controller plante") == ["app/Http/Controllers/PaymentController.php"]
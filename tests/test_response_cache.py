@@ -0,0 +1,77 @@
+from pathlib import Path
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+
+# Ensure project root is importable
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.openai_service import OpenAiService
+from services.response_cache_service import ResponseCacheService
+
+
+def _age(cache: ResponseCacheService, key: str, seconds: float):
+	"""Pretend an entry was created and last used seconds ago"""
+	then = time.time() - seconds
+	with cache._conn:
+		cache._conn.execute("UPDATE responses SET created = ?, last_used = ? WHERE key = ?", (then, then, key))
+
+
+class _CountingCache(ResponseCacheService):
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.gets = 0
+
+	def get(self, key: str):
+		self.gets += 1
+		return super().get(key)
+
+
+class _Completions:
+	def __init__(self):
+		self.calls = 0
+
+	async def create(self, **args):
+		self.calls += 1
+		message = SimpleNamespace(content=f"réponse {self.calls}")
+		return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def test_expired_entries_are_not_served(tmp_path):
+	cache = ResponseCacheService(cache_dir=str(tmp_path), ttl=60)
+	cache.put("a", "contenu")
+	assert cache.get("a") == "contenu"
+	_age(cache, "a", 120)
+	assert cache.get("a") is None
+	# The expired row was deleted on the way
+	assert cache._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 0
+
+
+def test_least_recently_used_entries_go_over_budget(tmp_path):
+	cache = ResponseCacheService(cache_dir=str(tmp_path), ttl=3600, max_bytes=10)
+	cache.put("a", "aaaa")
+	cache.put("b", "bbbb")
+	_age(cache, "a", 20)
+	_age(cache, "b", 10)
+	# Reading a makes b the least recently used
+	assert cache.get("a") == "aaaa"
+	cache.put("c", "cccc")
+	assert cache.get("b") is None
+	assert cache.get("a") == "aaaa" and cache.get("c") == "cccc"
+
+
+def test_bypass_cache_skips_the_lookup_but_stores_the_result(tmp_path):
+	cache = _CountingCache(cache_dir=str(tmp_path))
+	completions = _Completions()
+	service = OpenAiService(client=SimpleNamespace(chat=SimpleNamespace(completions=completions)), cache=cache)
+	args = {"model": "m", "messages": [{"role": "user", "content": "x"}]}
+
+	assert asyncio.run(service._complete(args)) == "réponse 1"
+	assert asyncio.run(service._complete(args)) == "réponse 1"
+	assert completions.calls == 1 and cache.gets == 2
+
+	assert asyncio.run(service._complete(args, bypass_cache=True)) == "réponse 2"
+	assert completions.calls == 2 and cache.gets == 2
+	assert cache.get(ResponseCacheService.key(args)) == "réponse 2"
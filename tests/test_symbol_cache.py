@@ -0,0 +1,97 @@
+from pathlib import Path
+import os
+import sys
+
+# Ensure project root is importable
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.parser_service import ParserService, EXTRACTOR_VERSION
+from services.symbol_cache_service import SymbolCacheService, symbol_key
+
+SYMBOLS = {"file": "a.php", "classes": [{"class": "A", "methods": []}], "namespace": None, "imports": []}
+
+
+def _parse(root: Path, cache: SymbolCacheService) -> ParserService:
+	parser = ParserService(workers=1, cache=cache)
+	parser.set_ast(str(root))
+	return parser
+
+
+def _from_cache(parser: ParserService):
+	"""Files whose symbols came from the cache: they were not parsed, so have no tree"""
+	return sorted(path for path, tree in parser._parsed_folder_tree.items() if tree is None)
+
+
+def test_version_change_clears_the_cache(tmp_path):
+	cache = SymbolCacheService("1", cache_dir=str(tmp_path))
+	cache.put_many([("/p/a.php", 10, 1, "php:abc", SYMBOLS)])
+	assert SymbolCacheService("1", cache_dir=str(tmp_path)).get_many(["php:abc"]) == {"php:abc": {k: v for k, v in SYMBOLS.items() if k != "file"}}
+
+	bumped = SymbolCacheService("2", cache_dir=str(tmp_path))
+	assert bumped.lookup_stats([("/p/a.php", 10, 1)]) == {}
+	assert bumped.get_many(["php:abc"]) == {}
+
+
+def test_key_includes_the_language():
+	assert symbol_key(b"class A {}", "js") != symbol_key(b"class A {}", "ts")
+	assert symbol_key(b"class A {}", "ts") == symbol_key(b"class A {}", "ts")
+
+
+def test_same_content_under_two_grammars(tmp_path):
+	"""A .js and a .ts file with the same bytes are cached apart, each with its own grammar's symbols"""
+	project = tmp_path / "project"
+	project.mkdir()
+	code = "export class Box { size: number; open(): void {} }\n"
+	(project / "box.ts").write_text(code)
+	cache = SymbolCacheService(EXTRACTOR_VERSION, cache_dir=str(tmp_path / "cache"))
+	ts_symbols = _parse(project, cache).extract_symbols("box.ts")
+	(project / "box.js").write_text(code)
+
+	parser = _parse(project, cache)
+	assert _from_cache(parser) == ["box.ts"]
+	assert parser.extract_symbols("box.ts") == ts_symbols
+	uncached = ParserService(workers=1)
+	uncached.set_ast(str(project))
+	assert parser.extract_symbols("box.js") == uncached.extract_symbols("box.js")
+	assert parser.extract_symbols("box.js")["classes"] != ts_symbols["classes"]
+
+	# Served from the cache, each file still gets its own grammar's symbols
+	parser = _parse(project, cache)
+	assert _from_cache(parser) == ["box.js", "box.ts"]
+	assert parser.extract_symbols("box.js") == uncached.extract_symbols("box.js")
+	assert parser.extract_symbols("box.ts") == ts_symbols
+
+
+def test_changed_and_touched_files(tmp_path):
+	project = tmp_path / "project"
+	(project / "app").mkdir(parents=True)
+	(project / "app/User.php").write_text("<?php\nclass User { public function name(): string {} }\n")
+	(project / "app/Post.php").write_text("<?php\nclass Post {}\n")
+	cache = SymbolCacheService(EXTRACTOR_VERSION, cache_dir=str(tmp_path / "cache"))
+	assert _from_cache(_parse(project, cache)) == []
+	assert _from_cache(_parse(project, cache)) == ["app/Post.php", "app/User.php"]
+
+	# Same size, new content and mtime: parsed again, never served the old symbols
+	post = project / "app/Post.php"
+	post.write_text("<?php\nclass Pst2 {}\n")
+	os.utime(post, ns=(post.stat().st_atime_ns, post.stat().st_mtime_ns + 10 ** 9))
+	# Only the mtime moved: the content hash still finds the symbols
+	user = project / "app/User.php"
+	os.utime(user, ns=(user.stat().st_atime_ns, user.stat().st_mtime_ns + 10 ** 9))
+	parser = _parse(project, cache)
+	assert _from_cache(parser) == ["app/User.php"]
+	assert [c["class"] for c in parser.extract_symbols("app/Post.php")["classes"]] == ["Pst2"]
+	assert parser.extract_symbols("app/User.php")["classes"][0]["methods"] == [{"name": "name", "return": "string"}]
+
+	# Both stats were recorded: nothing needs hashing or parsing now
+	assert len(cache.lookup_stats([parser._source_stat(p) for p in ("app/Post.php", "app/User.php")])) == 2
+	assert _from_cache(_parse(project, cache)) == ["app/Post.php", "app/User.php"]
+
+
+def test_eviction_drops_stale_stat_rows(tmp_path):
+	cache = SymbolCacheService("1", cache_dir=str(tmp_path), max_bytes=1)
+	cache.put_many([("/p/a.php", 10, 1, "php:abc", SYMBOLS)])
+	cache.evict()
+	assert cache.get_many(["php:abc"]) == {}
+	assert cache.lookup_stats([("/p/a.php", 10, 1)]) == {}
@@ -0,0 +1,140 @@
+from pathlib import Path
+import io
+import sys
+import zipfile
+import pytest
+
+# Ensure project root is importable
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from utils.transcript_reader import read_transcript
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def _docx(body: str) -> io.BytesIO:
+	"""A minimal .docx holding the given w:body content"""
+	data = io.BytesIO()
+	with zipfile.ZipFile(data, "w") as archive:
+		archive.writestr("word/document.xml", f'<?xml version="1.0" encoding="UTF-8"?><w:document {W}><w:body>{body}</w:body></w:document>')
+	data.seek(0)
+	return data
+
+
+def _read(text: str, filename: str, encoding: str = "utf-8") -> str:
+	return read_transcript(io.BytesIO(text.encode(encoding)), filename)
+
+
+def test_docx_paragraphs_runs_and_breaks():
+	body = (
+		'<w:p><w:r><w:t>Alice: on </w:t></w:r><w:r><w:t>commence</w:t><w:tab/><w:t>?</w:t></w:r></w:p>'
+		'<w:p></w:p>'
+		'<w:p><w:r><w:t xml:space="preserve">   </w:t></w:r></w:p>'
+		'<w:p><w:hyperlink><w:r><w:t>lien</w:t></w:r></w:hyperlink><w:r><w:br/><w:t>e</w:t><w:noBreakHyphen/><w:t>mail</w:t></w:r></w:p>'
+		'<w:p><w:r><w:t>page</w:t><w:br w:type="page"/><w:t>suite</w:t></w:r></w:p>'
+		'<w:tbl><w:tr><w:tc><w:p><w:r><w:t>dans un tableau</w:t></w:r></w:p></w:tc></w:tr></w:tbl>'
+		'<w:p><w:r><w:t>Bob: fin</w:t></w:r></w:p>'
+		'<w:sectPr/>'
+	)
+	assert read_transcript(_docx(body), "Reunion.DOCX") == "Alice: on commence\t?\nlien\ne-mail\npagesuite\nBob: fin"
+
+
+def test_docx_matches_python_docx(tmp_path):
+	docx = pytest.importorskip("docx")
+	document = docx.Document()
+	document.add_paragraph("Alice: bonjour à tous")
+	paragraph = document.add_paragraph("Bob: ")
+	paragraph.add_run("on migre").bold = True
+	paragraph.add_run("\tla facturation\nvers le nouveau module")
+	document.add_paragraph("")
+	document.add_table(rows=1, cols=1).cell(0, 0).text = "ignoré"
+	document.add_paragraph("Alice: ok")
+	path = tmp_path / "reunion.docx"
+	document.save(str(path))
+
+	expected = "\n".join(p.text for p in docx.Document(str(path)).paragraphs if p.text.strip())
+	with open(path, "rb") as f:
+		assert read_transcript(f, path.name) == expected
+
+
+def test_invalid_docx():
+	with pytest.raises(ValueError):
+		read_transcript(io.BytesIO(b"not a zip"), "a.docx")
+	without_document = io.BytesIO()
+	with zipfile.ZipFile(without_document, "w") as archive:
+		archive.writestr("word/styles.xml", "<x/>")
+	without_document.seek(0)
+	with pytest.raises(ValueError):
+		read_transcript(without_document, "a.docx")
+
+
+def test_vtt_voices_tags_and_blocks():
+	vtt = """WEBVTT - réunion
+
+NOTE exported by the meeting tool
+
+STYLE
+::cue { color: red }
+
+1
+00:00:01.000 --> 00:00:03.000 align:start
+<v Alice>Bonjour, on parle de la <i>facturation</i>.</v>
+
+00:00:03.000 --> 00:00:05.000
+<v.loud Alice>Il faut l&apos;export PDF.
+
+00:00:05.000 --> 00:00:07.000
+<v Bob>D&#39;accord &amp; <00:00:06.000>merci</v>
+"""
+	assert _read(vtt, "a.vtt") == (
+		"Alice: Bonjour, on parle de la facturation. Il faut l'export PDF.\n"
+		"Bob: D'accord & merci"
+	)
+
+
+def test_srt_speakers_and_unattributed_cues():
+	srt = """1
+00:00:01,000 --> 00:00:02,000
+Alice: On doit corriger
+
+2
+00:00:02,000 --> 00:00:04,000
+Alice: le calcul de la TVA.
+
+3
+00:00:04,000 --> 00:00:05,000
+Ensuite il faudra
+tester
+
+4
+00:00:05,000 --> 00:00:06,000
+les remises.
+
+5
+00:00:06,000 --> 00:00:07,000
+Nouvelle phrase.
+
+6
+00:00:07,000 --> 00:00:08,000
+Bob: Vu.
+"""
+	assert _read(srt, "a.srt") == (
+		"Alice: On doit corriger le calcul de la TVA.\n"
+		"Ensuite il faudra tester les remises.\n"
+		"Nouvelle phrase.\n"
+		"Bob: Vu."
+	)
+
+
+def test_subtitle_encodings():
+	srt = "1\r\n00:00:01,000 --> 00:00:02,000\r\nÉric: déjà vu\r\n"
+	assert _read(srt, "a.srt", "utf-8-sig") == "Éric: déjà vu"
+	assert _read(srt, "a.srt", "latin-1") == "Éric: déjà vu"
+
+
+def test_txt_and_unsupported():
+	assert _read("réunion", "a.txt") == "réunion"
+	assert _read("réunion", "a.txt", "latin-1") == "réunion"
+	with pytest.raises(ValueError):
+		_read("x", "a.pdf")
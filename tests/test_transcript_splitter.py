@@ -0,0 +1,72 @@
+from pathlib import Path
+import sys
+
+# Ensure project root is importable
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.openai_service import OpenAiService
+from utils.transcript_splitter import split_transcript
+
+
+def test_chunks_cut_on_speaker_turns():
+	text = "Alice: on commence\npar la facturation\nBob: d'accord\n[00:01:02] Carole : et l'export ?"
+	assert split_transcript(text, 50) == [
+		"Alice: on commence\npar la facturation",
+		"Bob: d'accord\n[00:01:02] Carole : et l'export ?",
+	]
+	# Everything fits: turns are kept together, line breaks included
+	assert split_transcript(text, 1000) == [text]
+
+
+def test_chunks_cut_on_paragraphs():
+	text = "premier paragraphe\nsur deux lignes\n\n\nsecond paragraphe\n\ntroisième"
+	assert split_transcript(text, 40) == ["premier paragraphe\nsur deux lignes", "second paragraphe\ntroisième"]
+
+
+def test_oversized_turns_are_split_on_sentences_then_cut():
+	turn = "Alice: Première phrase. Deuxième phrase ! Troisième ?"
+	assert split_transcript(turn, 25) == ["Alice: Première phrase.", "Deuxième phrase !", "Troisième ?"]
+
+	chunks = split_transcript("Bob: " + "x" * 50 + ". Fin.", 20)
+	assert all(len(chunk) <= 20 for chunk in chunks)
+	assert "".join(chunks).replace("\n", "") == "Bob: " + "x" * 50 + ".Fin."
+
+
+def test_every_chunk_fits():
+	text = "\n".join(f"Orateur {i % 3}: " + "mot " * (i * 7 % 40) for i in range(60))
+	chunks = split_transcript(text, 200)
+	assert len(chunks) > 1
+	assert all(len(chunk) <= 200 for chunk in chunks)
+	assert "".join(chunks).split() == text.split()
+
+
+def test_merge_deduplicates_similar_task_titles():
+	results = [
+		{
+			"resume": "Facturation.",
+			"taches": [
+				{"titre": "Corriger le calcul de la TVA", "details": "arrondi faux", "fichiers": ["app/Invoice.php"]},
+				{"titre": "Ajouter l'export PDF", "details": "", "fichiers": []},
+			],
+			"questions": ["Quel taux pour la Belgique ?"],
+		},
+		{
+			"resume": "Suite.",
+			"taches": [
+				{"titre": "Corriger calcul TVA", "details": "aussi sur les avoirs", "fichiers": ["app/Invoice.php", "app/Credit.php"]},
+				{"titre": "Ajouter l'export CSV", "details": "pour la compta", "fichiers": []},
+			],
+			"questions": ["Quel taux pour la Belgique ?", "Qui valide ?"],
+		},
+	]
+	notes = OpenAiService._merge_chunk_results(results)
+	assert "## Résumé de la partie 2/2\nSuite." in notes
+	tasks = [line for line in notes.splitlines() if line.startswith("- ")]
+	assert tasks == [
+		"- Corriger le calcul de la TVA (fichiers : app/Invoice.php, app/Credit.php) — arrondi faux / aussi sur les avoirs",
+		"- Ajouter l'export PDF — ",
+		"- Ajouter l'export CSV — pour la compta",
+		"- Quel taux pour la Belgique ?",
+		"- Qui valide ?",
+	]
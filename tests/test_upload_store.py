@@ -0,0 +1,159 @@
+from pathlib import Path
+import os
+import sys
+import threading
+import time
+import pytest
+
+# Ensure project root is importable
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import services.project_session_service as project_session_service
+import services.upload_store_service as upload_store_service
+from services.upload_store_service import BLOB, TREE, UploadStoreService
+
+DAY = 24 * 3600
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+	monkeypatch.setattr(project_session_service, "PROJECTS_ROOT", str(tmp_path / "projects"))
+	(tmp_path / "projects").mkdir()
+	return UploadStoreService(store_dir=str(tmp_path / "store"), max_bytes=10 ** 6, max_age=DAY)
+
+
+def _add_tree(store: UploadStoreService, digest: str, size: int = 100) -> str:
+	path = store.tree_path(digest)
+	os.makedirs(os.path.join(path, "app"))
+	with open(os.path.join(path, "app", "User.php"), "w") as f:
+		f.write("<?php class User {}")
+	store.add_tree(digest, size)
+	return path
+
+
+def _add_blob(store: UploadStoreService, digest: str, data: bytes = b"zip") -> str:
+	tmp = store.new_upload_path()
+	with open(tmp, "wb") as f:
+		f.write(data)
+	return store.add_blob(tmp, digest)[0]
+
+
+def _age(store: UploadStoreService, digest: str, seconds: float):
+	"""Pretend an entry and the projects using it were last used seconds ago"""
+	then = time.time() - seconds
+	with store._conn:
+		store._conn.execute("UPDATE entries SET last_used = ? WHERE hash = ?", (then, digest))
+		store._conn.execute("UPDATE refs SET last_used = ? WHERE hash = ?", (then, digest))
+
+
+def _tmp_names(store: UploadStoreService):
+	return sorted(os.listdir(os.path.join(store.store_dir, "tmp")))
+
+
+def test_expired_projects_and_entries_are_collected(store):
+	old_tree = _add_tree(store, "a" * 64)
+	new_tree = _add_tree(store, "b" * 64)
+	old_project = store.link("old", "a" * 64, TREE)
+	new_project = store.link("new", "b" * 64, TREE)
+	shared = store.link("shared", "b" * 64, TREE)
+	_age(store, "a" * 64, 2 * DAY)
+
+	assert store.collect() == {"projects": 1, "entries": 1, "bytes": 100}
+	assert not os.path.lexists(old_project) and not os.path.exists(old_tree)
+	assert os.path.isdir(new_tree) and os.path.realpath(new_project) == os.path.realpath(shared) == new_tree
+	assert not store.has_tree("a" * 64) and store.has_tree("b" * 64)
+	assert store.size() == 100
+	# The collected tree was moved aside and deleted, not left in tmp
+	assert _tmp_names(store) == []
+
+
+def test_size_budget_evicts_least_recently_used(store):
+	store.max_bytes = 250
+	for i, digest in enumerate(("a" * 64, "b" * 64, "c" * 64)):
+		_add_tree(store, digest)
+		store.link(f"p{i}", digest, TREE)
+		_age(store, digest, 300 - i * 100)
+	store.touch("p0")
+
+	removed = store.collect()
+	assert removed == {"projects": 1, "entries": 1, "bytes": 100}
+	# p1 was the least recently used once p0 got touched
+	assert not os.path.lexists(project_session_service.project_path_for("p1"))
+	assert store.has_tree("a" * 64) and not store.has_tree("b" * 64) and store.has_tree("c" * 64)
+	assert store.size() == 200
+
+
+def test_unreferenced_blobs_go_before_referenced_ones(store):
+	store.max_bytes = 4
+	referenced = _add_blob(store, "a" * 64, b"used")
+	store.link("p", "a" * 64, BLOB)
+	unreferenced = _add_blob(store, "b" * 64, b"free")
+	assert store.collect() == {"projects": 0, "entries": 1, "bytes": 4}
+	assert os.path.isfile(referenced) and not os.path.exists(unreferenced)
+
+
+def test_stale_leftovers_are_removed(store):
+	old = time.time() - 2 * DAY
+	part = store.new_upload_path()
+	open(part, "wb").close()
+	os.utime(part, (old, old))
+	recent = store.new_upload_path()
+	open(recent, "wb").close()
+	incomplete = store.tree_path("d" * 64)
+	os.makedirs(incomplete)
+	os.utime(incomplete, (old, old))
+	# A tree moved aside by a collection interrupted before deleting it
+	trash = os.path.join(store.store_dir, "tmp", "x.trash")
+	os.makedirs(os.path.join(trash, "app"))
+
+	store.collect()
+	assert _tmp_names(store) == [os.path.basename(recent)]
+	assert not os.path.exists(incomplete)
+
+
+def test_trees_are_deleted_outside_the_lock(store, monkeypatch):
+	_add_tree(store, "a" * 64)
+	_age(store, "a" * 64, 2 * DAY)
+	held = []
+	rmtree = upload_store_service.shutil.rmtree
+
+	def checking_rmtree(path, *args, **kwargs):
+		held.append(store._lock.locked())
+		return rmtree(path, *args, **kwargs)
+
+	monkeypatch.setattr(upload_store_service.shutil, "rmtree", checking_rmtree)
+	assert store.collect()["entries"] == 1
+	assert held == [False]
+
+
+def test_hash_locks_serialise_and_are_dropped(store):
+	inside = []
+	overlap = []
+
+	def extract():
+		with store.hash_lock("a" * 64):
+			overlap.append(bool(inside))
+			inside.append(1)
+			time.sleep(0.01)
+			inside.pop()
+
+	threads = [threading.Thread(target=extract) for _ in range(4)]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+	assert overlap == [False] * 4
+	assert store._hash_locks == {}
+
+	with pytest.raises(RuntimeError):
+		with store.hash_lock("b" * 64):
+			raise RuntimeError
+	assert store._hash_locks == {}
+
+
+def test_contains(store, tmp_path):
+	tree = _add_tree(store, "a" * 64)
+	project = store.link("p", "a" * 64, TREE)
+	assert store.contains(project) and store.contains(tree)
+	assert not store.contains(str(tmp_path)) and not store.contains(store.store_dir + "-other")
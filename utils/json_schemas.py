@@ -26,3 +26,39 @@ class JsonSchema:
 				"required": ["contexte", "technical_todolist", "clarifications_requises"]
 			}
 		}
+
+	@staticmethod
+	def chunk_tasks_schema():
+		return {
+			"name": "transcript_chunk_tasks",
+			"strict": True,
+			"schema": {
+				"type": "object",
+				"additionalProperties": False,
+				"properties": {
+					"resume": {
+						"type": "string",
+						"description": "Résumé non technique de cette partie du transcript."
+					},
+					"taches": {
+						"type": "array",
+						"items": {
+							"type": "object",
+							"additionalProperties": False,
+							"properties": {
+								"titre": {"type": "string"},
+								"details": {"type": "string"},
+								"fichiers": {"type": "array", "items": {"type": "string"}}
+							},
+							"required": ["titre", "details", "fichiers"]
+						}
+					},
+					"questions": {
+						"type": "array",
+						"items": {"type": "string"}
+					}
+				},
+				"required": ["resume", "taches", "questions"]
+			}
+		}
+
@@ -0,0 +1,142 @@
+import json
+from typing import Any, List, Tuple
+
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+class JsonFieldStreamer:
+	"""Incremental parser for a flat JSON object whose values are mostly strings.
+
+	feed() takes raw chunks as they arrive and returns events:
+	("delta", key, text) while a string value fills in, then ("done", key, value) once it is complete.
+	Non-string values (null, numbers, booleans, nested objects and arrays) only produce a "done" event.
+	"""
+
+	def __init__(self):
+		self.values = {}
+		self._state = "start"
+		self._key = None
+		self._buffer = []
+		self._escape = None  # pending escape sequence, starting after the backslash
+		self._high_surrogate = None
+		self._depth = 0  # open brackets of a nested value
+		self._in_nested_string = False
+
+	def feed(self, chunk: str) -> List[Tuple[str, str, Any]]:
+		events = []
+		delta = []
+		for char in chunk:
+			state = self._state
+			if state == "value_string":
+				text = self._string_char(char)
+				if text is None:
+					if delta:
+						events.append(("delta", self._key, "".join(delta)))
+						delta = []
+					value = "".join(self._buffer)
+					self.values[self._key] = value
+					events.append(("done", self._key, value))
+					self._state = "after_value"
+				elif text:
+					self._buffer.append(text)
+					delta.append(text)
+			elif state == "key_string":
+				text = self._string_char(char)
+				if text is None:
+					self._key = "".join(self._buffer)
+					self._state = "colon"
+				else:
+					self._buffer.append(text)
+			elif state == "value_literal":
+				if char in ",}" or char.isspace():
+					value = json.loads("".join(self._buffer))
+					self.values[self._key] = value
+					events.append(("done", self._key, value))
+					self._state = "key" if char == "," else "after_value"
+					if char == "}":
+						self._state = "end"
+				else:
+					self._buffer.append(char)
+			elif state == "value_nested":
+				self._buffer.append(char)
+				if self._nested_char(char):
+					value = json.loads("".join(self._buffer))
+					self.values[self._key] = value
+					events.append(("done", self._key, value))
+					self._state = "after_value"
+			elif char.isspace():
+				continue
+			elif state == "start" and char == "{":
+				self._state = "key"
+			elif state == "key" and char == '"':
+				self._buffer = []
+				self._state = "key_string"
+			elif state in ("key", "after_value") and char == "}":
+				self._state = "end"
+			elif state == "after_value" and char == ",":
+				self._state = "key"
+			elif state == "colon" and char == ":":
+				self._state = "value"
+			elif state == "value":
+				self._buffer = []
+				if char == '"':
+					self._state = "value_string"
+				elif char in "{[":
+					self._buffer.append(char)
+					self._depth = 1
+					self._in_nested_string = False
+					self._state = "value_nested"
+				else:
+					self._buffer.append(char)
+					self._state = "value_literal"
+			elif state == "end":
+				continue
+			else:
+				raise ValueError(f"Unexpected {char!r} in streamed JSON (state {state})")
+		if delta:
+			events.append(("delta", self._key, "".join(delta)))
+		return events
+
+	def _nested_char(self, char: str) -> bool:
+		"""Track brackets inside a nested value, skipping those in its strings; True once it closes"""
+		if self._in_nested_string:
+			if self._escape is not None:
+				self._escape = None
+			elif char == "\\":
+				self._escape = ""
+			elif char == '"':
+				self._in_nested_string = False
+		elif char == '"':
+			self._in_nested_string = True
+		elif char in "{[":
+			self._depth += 1
+		elif char in "}]":
+			self._depth -= 1
+			return self._depth == 0
+		return False
+
+	def _string_char(self, char: str):
+		"""Consume one character inside a string; return decoded text, "" if buffered, None at the closing quote"""
+		if self._escape is not None:
+			self._escape += char
+			if self._escape[0] != "u":
+				text = _ESCAPES.get(self._escape, self._escape)
+				self._escape = None
+				return text
+			if len(self._escape) < 5:
+				return ""
+			code = int(self._escape[1:], 16)
+			self._escape = None
+			if 0xD800 <= code < 0xDC00:
+				self._high_surrogate = code
+				return ""
+			if 0xDC00 <= code < 0xE000 and self._high_surrogate is not None:
+				code = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+				self._high_surrogate = None
+			return chr(code)
+		if char == "\\":
+			self._escape = ""
+			return ""
+		if char == '"':
+			return None
+		return char
@@ -0,0 +1,183 @@
+import os
+import re
+import time
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+
+class ExcludedDirs:
+	"""Precomputed path-component matcher for excluded directories like 'vendor' or 'bootstrap/cache'"""
+
+	def __init__(self, excluded_dirs: Iterable[str]):
+		self.names = set()
+		self.sequences = []
+		for entry in excluded_dirs:
+			parts = tuple(p for p in entry.replace("\\", "/").split("/") if p)
+			if len(parts) == 1:
+				self.names.add(parts[0])
+			elif parts:
+				self.sequences.append(parts)
+
+	def is_excluded_dir(self, parts: Tuple[str, ...]) -> bool:
+		"""True if the directory whose last component ends parts must be pruned"""
+		if parts[-1] in self.names:
+			return True
+		for seq in self.sequences:
+			if len(parts) >= len(seq) and parts[-len(seq):] == seq:
+				return True
+		return False
+
+	def contains(self, rel_posix: str) -> bool:
+		"""True if any directory of a project-relative file path is excluded"""
+		parts = rel_posix.split("/")[:-1]
+		for i in range(len(parts)):
+			if self.is_excluded_dir(tuple(parts[:i + 1])):
+				return True
+		return False
+
+
+class GitIgnore:
+	"""Minimal .gitignore matcher: globs, character classes, '**', anchored and directory-only patterns, negation"""
+
+	def __init__(self):
+		self._rules = []  # (base dir parts, regex, negated, dir_only), in file order
+
+	def add_file(self, path: str, base: Tuple[str, ...]):
+		try:
+			with open(path, encoding="utf-8", errors="ignore") as f:
+				lines = f.read().splitlines()
+		except OSError:
+			return
+		for line in lines:
+			line = line.rstrip()
+			if not line or line.startswith("#"):
+				continue
+			negated = line.startswith("!")
+			if negated:
+				line = line[1:]
+			dir_only = line.endswith("/")
+			line = line.rstrip("/")
+			anchored = "/" in line
+			line = line.lstrip("/")
+			regex = self._translate(line, anchored)
+			self._rules.append((base, regex, negated, dir_only))
+
+	@staticmethod
+	def _translate(pattern: str, anchored: bool):
+		out = []
+		i = 0
+		while i < len(pattern):
+			if pattern.startswith("**/", i):
+				out.append("(?:.*/)?")
+				i += 3
+				continue
+			if pattern.startswith("**", i):
+				out.append(".*")
+				i += 2
+				continue
+			c = pattern[i]
+			if c == "*":
+				out.append("[^/]*")
+			elif c == "?":
+				out.append("[^/]")
+			elif c == "\\" and i + 1 < len(pattern):
+				# "\#", "\!", "\*": the next character is literal
+				i += 1
+				out.append(re.escape(pattern[i]))
+			elif c == "[" and "]" in pattern[i + 2:]:
+				# Character class like [Bb]uild or [!._]*; a "]" right after the opening is part of the class
+				end = pattern.index("]", i + 2)
+				members = pattern[i + 1:end]
+				negated = members[:1] in ("!", "^")
+				if negated:
+					members = members[1:]
+				out.append(("[^/" if negated else "[") + members.replace("\\", "\\\\").replace("[", "\\[") + "]")
+				i = end
+			else:
+				out.append(re.escape(c))
+			i += 1
+		prefix = "" if anchored else "(?:.*/)?"
+		return re.compile(prefix + "".join(out) + r"\Z")
+
+	def ignored(self, parts: Tuple[str, ...], is_dir: bool) -> bool:
+		result = False
+		for base, regex, negated, dir_only in self._rules:
+			if dir_only and not is_dir:
+				continue
+			if parts[:len(base)] != base:
+				continue
+			if regex.match("/".join(parts[len(base):])):
+				result = not negated
+		return result
+
+
+class ScanStats:
+	"""Counters collected during a project scan"""
+
+	def __init__(self):
+		self.dirs_scanned = 0
+		self.dirs_pruned = 0
+		self.files_considered = 0
+		self.files_matched = 0
+		self.files_ignored = 0
+		self.seconds = 0.0
+
+	def to_dict(self) -> dict:
+		return {
+			"dirs_scanned": self.dirs_scanned,
+			"dirs_pruned": self.dirs_pruned,
+			"files_considered": self.files_considered,
+			"files_matched": self.files_matched,
+			"files_ignored": self.files_ignored,
+			"seconds": round(self.seconds, 4),
+		}
+
+
+class ProjectScanner:
+	"""os.scandir walker that prunes excluded directories before descending into them"""
+
+	def __init__(self, excluded: ExcludedDirs, classify: Callable[[str], Optional[str]], respect_gitignore: bool = False):
+		self.excluded = excluded
+		self.classify = classify  # file name -> language name, or None to skip
+		self.respect_gitignore = respect_gitignore
+		self.stats = ScanStats()
+
+	def scan(self, root: str) -> Iterator[Tuple[str, str]]:
+		"""Yield (relative posix path, language) for each source file under root"""
+		self.stats = ScanStats()
+		started = time.perf_counter()
+		gitignore = GitIgnore() if self.respect_gitignore else None
+		stack: List[Tuple[str, Tuple[str, ...]]] = [(root, ())]
+		while stack:
+			path, parts = stack.pop()
+			self.stats.dirs_scanned += 1
+			if gitignore is not None:
+				gitignore.add_file(os.path.join(path, ".gitignore"), parts)
+			subdirs = []
+			try:
+				entries = sorted(os.scandir(path), key=lambda e: e.name)
+			except OSError:
+				continue
+			for entry in entries:
+				child = parts + (entry.name,)
+				if entry.is_dir(follow_symlinks=False):
+					if self.excluded.is_excluded_dir(child) or (gitignore is not None and gitignore.ignored(child, True)):
+						self.stats.dirs_pruned += 1
+					else:
+						subdirs.append((entry.path, child))
+					continue
+				if not entry.is_file():
+					continue
+				self.stats.files_considered += 1
+				lang_name = self.classify(entry.name)
+				if lang_name is None:
+					continue
+				if gitignore is not None and gitignore.ignored(child, False):
+					self.stats.files_ignored += 1
+					continue
+				self.stats.files_matched += 1
+				# Only count the scanner's own time, not the consumer's work between yields
+				self.stats.seconds += time.perf_counter() - started
+				yield "/".join(child), lang_name
+				started = time.perf_counter()
+			stack.extend(reversed(subdirs))
+		self.stats.seconds += time.perf_counter() - started
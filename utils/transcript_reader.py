@@ -0,0 +1,173 @@
+import html
+import io
+import re
+import zipfile
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import iterparse
+
+TRANSCRIPT_EXTENSIONS = (".txt", ".docx", ".vtt", ".srt")
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_BODY = _W + "body"
+_P = _W + "p"
+_R = _W + "r"
+_HYPERLINK = _W + "hyperlink"
+_BR_TYPE = _W + "type"
+# Run children and their text, as python-docx renders them (w:br depends on its type)
+_RUN_TEXT = {_W + "tab": "\t", _W + "ptab": "\t", _W + "cr": "\n", _W + "noBreakHyphen": "-"}
+
+# "<v Alice>" / "<v.loud Alice>" WebVTT voice spans, other cue tags (<i>, <c.red>, <00:01.000>) are dropped
+_VOICE_RE = re.compile(r"<v(?:\.[^\s>]*)?\s+([^>]+)>")
+_TAG_RE = re.compile(r"<[^>]*>")
+# "Alice: ..." speaker prefix, as written by most .srt exports
+_SPEAKER_RE = re.compile(r"^([\w .'-]{1,40}?)\s?:\s+(.*)$")
+_SENTENCE_END = (".", "!", "?", "…", '"', "»")
+
+
+def read_transcript(file: BinaryIO, filename: str) -> str:
+	"""Text of an uploaded transcript, read from the (seekable) file object without writing it to disk"""
+	name = filename.lower()
+	if name.endswith(".txt"):
+		content = file.read()
+		try:
+			return content.decode("utf-8")
+		except UnicodeDecodeError:
+			return content.decode("latin-1")
+	if name.endswith(".docx"):
+		return read_docx(file)
+	if name.endswith((".vtt", ".srt")):
+		return read_subtitles(file)
+	raise ValueError(f"Only {', '.join(TRANSCRIPT_EXTENSIONS)} files are supported")
+
+
+def read_transcript_file(path: str) -> str:
+	with open(path, "rb") as f:
+		return read_transcript(f, path)
+
+
+def read_docx(file: BinaryIO) -> str:
+	"""Non-empty paragraphs of a .docx, one per line; same text as joining python-docx's Document.paragraphs"""
+	try:
+		with zipfile.ZipFile(file) as archive, archive.open("word/document.xml") as document:
+			return "\n".join(p for p in _docx_paragraphs(document) if p.strip())
+	except (zipfile.BadZipFile, KeyError):
+		raise ValueError("The transcript is not a valid .docx file")
+
+
+def _docx_paragraphs(document: BinaryIO) -> Iterator[str]:
+	"""Stream the body-level paragraphs; each one is dropped once read, so memory stays flat on long documents"""
+	depth = 0
+	body = None
+	body_depth = None
+	for event, elem in iterparse(document, events=("start", "end")):
+		if event == "start":
+			depth += 1
+			if elem.tag == _BODY and body is None:
+				body, body_depth = elem, depth
+			continue
+		if body is not None and depth == body_depth + 1:
+			# Like Document.paragraphs: tables, content controls and revisions at body level are skipped
+			if elem.tag == _P:
+				yield _paragraph_text(elem)
+			body.clear()
+		depth -= 1
+
+
+def _paragraph_text(paragraph) -> str:
+	parts = []
+	for child in paragraph:
+		if child.tag == _R:
+			_run_text(child, parts)
+		elif child.tag == _HYPERLINK:
+			for run in child:
+				if run.tag == _R:
+					_run_text(run, parts)
+	return "".join(parts)
+
+
+def _run_text(run, parts: List[str]):
+	for child in run:
+		tag = child.tag
+		if tag == _W + "t":
+			if child.text:
+				parts.append(child.text)
+		elif tag == _W + "br":
+			# Page and column breaks have no text, only line breaks do
+			if child.get(_BR_TYPE, "textWrapping") == "textWrapping":
+				parts.append("\n")
+		elif tag in _RUN_TEXT:
+			parts.append(_RUN_TEXT[tag])
+
+
+def read_subtitles(file: BinaryIO) -> str:
+	"""Spoken text of a .vtt or .srt file: timestamps and cue numbers dropped, consecutive cues of a speaker merged"""
+	try:
+		return _format_turns(_cues(_text_lines(file, "utf-8-sig")))
+	except UnicodeDecodeError:
+		file.seek(0)
+		return _format_turns(_cues(_text_lines(file, "latin-1")))
+
+
+def _text_lines(file: BinaryIO, encoding: str) -> Iterator[str]:
+	lines = io.TextIOWrapper(file, encoding=encoding)
+	try:
+		for line in lines:
+			yield line.strip()
+	finally:
+		# Leave the caller's file open
+		lines.detach()
+
+
+def _cues(lines: Iterable[str]) -> Iterator[Tuple[Optional[str], str]]:
+	"""(speaker, text) of each cue; blocks without a timing line (WEBVTT header, NOTE, STYLE, REGION) are skipped"""
+	block = []
+	for line in lines:
+		if line:
+			block.append(line)
+			continue
+		if block:
+			cue = _parse_cue(block)
+			if cue:
+				yield cue
+			block = []
+	if block:
+		cue = _parse_cue(block)
+		if cue:
+			yield cue
+
+
+def _parse_cue(block: List[str]) -> Optional[Tuple[Optional[str], str]]:
+	timing = next((i for i, line in enumerate(block) if "-->" in line), None)
+	if timing is None:
+		return None
+	payload = " ".join(block[timing + 1:])
+	voice = _VOICE_RE.search(payload)
+	speaker = voice.group(1).strip() if voice else None
+	text = html.unescape(_TAG_RE.sub("", payload)).strip()
+	if speaker is None:
+		match = _SPEAKER_RE.match(text)
+		if match:
+			speaker, text = match.group(1).strip(), match.group(2)
+	return (speaker, text) if text else None
+
+
+def _format_turns(cues: Iterable[Tuple[Optional[str], str]]) -> str:
+	"""One line per speaker turn; unattributed cues are joined until a sentence ends"""
+	lines = []
+	speaker = None
+	texts = []
+	for cue_speaker, text in cues:
+		same_turn = texts and cue_speaker == speaker and (speaker is not None or not texts[-1].endswith(_SENTENCE_END))
+		if not same_turn:
+			if texts:
+				lines.append(_turn_line(speaker, texts))
+			speaker, texts = cue_speaker, []
+		texts.append(text)
+	if texts:
+		lines.append(_turn_line(speaker, texts))
+	return "\n".join(lines)
+
+
+def _turn_line(speaker: Optional[str], texts: List[str]) -> str:
+	text = " ".join(texts)
+	return f"{speaker}: {text}" if speaker else text
@@ -0,0 +1,57 @@
+import re
+from typing import List
+
+# "Alice:", "[00:12:03] Bob :", "Speaker 2 -" style turn openers
+_SPEAKER_RE = re.compile(r"^\s*(\[[\d:.,]+\]\s*)?[\w .'-]{1,40}\s?[:\-–]\s")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?…])\s+")
+
+
+def split_transcript(text: str, max_chars: int) -> List[str]:
+	"""Split a transcript into chunks of at most max_chars, cutting on speaker turns or paragraphs"""
+	blocks = []
+	current = []
+	for line in text.splitlines():
+		if not line.strip() or _SPEAKER_RE.match(line):
+			if current:
+				blocks.append("\n".join(current))
+				current = []
+		if line.strip():
+			current.append(line)
+	if current:
+		blocks.append("\n".join(current))
+
+	chunks = []
+	chunk = []
+	size = 0
+	for block in blocks:
+		for piece in _split_long(block, max_chars):
+			if chunk and size + len(piece) + 1 > max_chars:
+				chunks.append("\n".join(chunk))
+				chunk, size = [], 0
+			chunk.append(piece)
+			size += len(piece) + 1
+	if chunk:
+		chunks.append("\n".join(chunk))
+	return chunks
+
+
+def _split_long(block: str, max_chars: int) -> List[str]:
+	"""Break a single oversized turn on sentence ends, falling back to a hard cut"""
+	if len(block) <= max_chars:
+		return [block]
+	pieces = []
+	current = ""
+	for sentence in _SENTENCE_END_RE.split(block):
+		while len(sentence) > max_chars:
+			if current:
+				pieces.append(current)
+				current = ""
+			pieces.append(sentence[:max_chars])
+			sentence = sentence[max_chars:]
+		if current and len(current) + len(sentence) + 1 > max_chars:
+			pieces.append(current)
+			current = ""
+		current = f"{current} {sentence}" if current else sentence
+	if current:
+		pieces.append(current)
+	return pieces